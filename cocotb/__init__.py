@@ -45,7 +45,7 @@ from cocotb.regression import RegressionManager
 
 
 # Things we want in the cocotb namespace
-from cocotb.decorators import test, coroutine, hook, function, external  # noqa: F401
+from cocotb.decorators import test, coroutine, hook, function, external, external_process  # noqa: F401
 
 # Singleton scheduler instance
 # NB this cheekily ensures a singleton since we're replacing the reference
@@ -160,6 +160,7 @@ def _initialise_testbench(root_name):
     module_str = os.getenv('MODULE')
     test_str = os.getenv('TESTCASE')
     hooks_str = os.getenv('COCOTB_HOOKS', '')
+    shard_count = int(os.getenv('COCOTB_SHARD_COUNT', '0'))
 
     if not module_str:
         raise ImportError("Environment variables defining the module(s) to " +
@@ -168,9 +169,18 @@ def _initialise_testbench(root_name):
     modules = module_str.split(',')
     hooks = hooks_str.split(',') if hooks_str else []
 
+    shard = None
+    test_times = None
+    if shard_count:
+        shard = (int(os.getenv('COCOTB_SHARD_INDEX', '0')), shard_count)
+        times_file = os.getenv('COCOTB_TEST_TIMES')
+        if times_file:
+            test_times = cocotb.regression._load_test_times(times_file)
+
     global regression_manager
 
-    regression_manager = RegressionManager(root_name, modules, tests=test_str, seed=RANDOM_SEED, hooks=hooks)
+    regression_manager = RegressionManager(root_name, modules, tests=test_str, seed=RANDOM_SEED, hooks=hooks,
+                                           shard=shard, test_times=test_times)
     regression_manager.initialise()
     regression_manager.execute()
 
@@ -137,3 +137,48 @@ class nullcontext(object):
 # https://stackoverflow.com/a/38668373
 # Backport of abc.ABC, compatible with Python 2 and 3
 abc_ABC = abc.ABCMeta('ABC', (object,), {'__slots__': ()})
+
+
+# Backport of Python 3's int.to_bytes and int.from_bytes
+if sys.version_info.major >= 3:
+    def int_to_bytes(value, length, byteorder):
+        return value.to_bytes(length, byteorder)
+
+    def int_from_bytes(data, byteorder):
+        return int.from_bytes(data, byteorder)
+else:
+    import binascii
+
+    def int_to_bytes(value, length, byteorder):
+        if not length:
+            return b""
+        data = binascii.unhexlify("%0*x" % (2 * length, value))
+        if byteorder == "little":
+            data = data[::-1]
+        return data
+
+    def int_from_bytes(data, byteorder):
+        # bytes() of a memoryview or array is its repr on Python 2
+        data = bytes(bytearray(data))
+        if not data:
+            return 0
+        if byteorder == "little":
+            data = data[::-1]
+        return int(binascii.hexlify(data), 16)
+
+
+# Byte buffers such as BinaryValue.buff are a str with a character per byte
+if sys.version_info.major >= 3:
+    def bytes_to_buff(data):
+        return bytes(data).decode("latin-1")
+
+    def buff_to_bytes(buff):
+        if isinstance(buff, str):
+            return buff.encode("latin-1")
+        return buff
+else:
+    def bytes_to_buff(data):
+        return bytes(bytearray(data))
+
+    def buff_to_bytes(buff):
+        return buff
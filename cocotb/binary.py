@@ -36,6 +36,9 @@ import warnings
 
 resolve_x_to = os.getenv('COCOTB_RESOLVE_X', "VALUE_ERROR")
 
+# Characters of a fully resolved bit string
+_resolved_chars = frozenset("01")
+
 def resolve(string):
     for char in BinaryValue._resolve_to_0:
         string = string.replace(char, "0")
@@ -95,6 +98,7 @@ class BinaryValue(object):
     _resolve_to_1     = "hH"  # noqa
     _resolve_to_error = "xXzZuUwW"  # Resolve to a ValueError() since these usually mean something is wrong
     _permitted_chars  = _resolve_to_0 +_resolve_to_1 + _resolve_to_error + "01"  # noqa
+    _permitted_set    = frozenset(_permitted_chars)  # noqa
 
     def __init__(self, value=None, n_bits=None, bigEndian=True,
                  binaryRepresentation=BinaryRepresentation.UNSIGNED,
@@ -112,6 +116,15 @@ class BinaryValue(object):
                 Defaults to unsigned representation.
             bits (int, optional): Deprecated: Compatibility wrapper for :attr:`n_bits`.
         """
+        # The value is held as two integers of self._len bits, with the most
+        # significant bit corresponding to the first character of binstr:
+        # self._int has a bit set for each "1", self._xz has a bit set for
+        # each character other than "0" and "1". The string itself is only
+        # built when asked for, and is always kept when self._xz is non-zero
+        # since the integers don't record which of "xXzZuUwWlLhH-" it was.
+        self._int = 0
+        self._xz = 0
+        self._len = 0
         self._str = ""
         self.big_endian = bigEndian
         self.binaryRepresentation = binaryRepresentation
@@ -194,8 +207,8 @@ class BinaryValue(object):
         return int(resolve(x), 2)
 
     def _convert_from_signed_mag(self, x):
-        rv = int(resolve(self._str[1:]), 2)
-        if self._str[0] == '1':
+        rv = int(resolve(x[1:]), 2)
+        if x[0] == '1':
             rv = rv * -1
         return rv
 
@@ -211,15 +224,8 @@ class BinaryValue(object):
         return rv
 
     def _invert(self, x):
-        inverted = ''
-        for bit in x:
-            if bit == '0':
-                inverted = inverted + '1'
-            elif bit == '1':
-                inverted = inverted + '0'
-            else:
-                inverted = inverted + bit
-        return inverted
+        # "2" is never part of a bit string, so can be used as a placeholder
+        return x.replace('0', '2').replace('1', '0').replace('2', '1')
 
     def _adjust_unsigned(self, x):
         if self._n_bits is None:
@@ -282,26 +288,80 @@ class BinaryValue(object):
             rv = x
         return rv
 
+    def _set_str(self, string):
+        """Store the bit string *string*, which must only hold permitted characters."""
+        self._str = string
+        self._len = len(string)
+        if _resolved_chars.issuperset(string):
+            self._int = int(string, 2) if string else 0
+            self._xz = 0
+        else:
+            value = xz = string
+            for char in BinaryValue._resolve_to_0 + BinaryValue._resolve_to_1 + BinaryValue._resolve_to_error:
+                value = value.replace(char, "0")
+                xz = xz.replace(char, "2")
+            self._int = int(value, 2)
+            self._xz = int(xz.replace("1", "0").replace("2", "1"), 2)
+
+    def _set_int(self, value, length):
+        """Store the fully resolved *length* bit integer *value*."""
+        self._int = value
+        self._xz = 0
+        self._len = length
+        self._str = None
+
+    def _adjust_int(self, value, length):
+        """Pad/truncate the *length* bit integer *value* and store it.
+
+        This is the integer equivalent of :meth:`_adjust`.
+        """
+        n_bits = self._n_bits
+        if n_bits is None or length == n_bits:
+            self._set_int(value, length)
+        elif length < n_bits:
+            if self.big_endian:
+                value <<= n_bits - length
+            self._set_int(value, n_bits)
+        else:
+            print("WARNING: truncating value to match requested number of bits "
+                  "(%d -> %d)" % (length, n_bits))
+            self._set_int(value & ((1 << n_bits) - 1), n_bits)
+
     def get_value(self):
         """Return the integer representation of the underlying vector."""
-        return self._convert_from[self.binaryRepresentation](self._str)
+        if not self._xz and self._len:
+            if self.binaryRepresentation == BinaryRepresentation.UNSIGNED:
+                return self._int
+            if self.binaryRepresentation == BinaryRepresentation.TWOS_COMPLEMENT and self._len > 1:
+                return self.get_value_signed()
+        return self._convert_from[self.binaryRepresentation](self.binstr)
 
     def get_value_signed(self):
         """Return the signed integer representation of the underlying vector."""
-        ival = int(resolve(self._str), 2)
-        bits = len(self._str)
-        signbit = (1 << (bits - 1))
+        if not self._xz and self._len:
+            ival = self._int
+        else:
+            ival = int(resolve(self.binstr), 2)
+        signbit = (1 << (self._len - 1))
         if (ival & signbit) == 0:
             return ival
         else:
-            return -1 * (1 + (int(~ival) & (signbit - 1)))
+            return ival - (signbit << 1)
 
     def set_value(self, integer):
-        self._str = self._convert_to[self.binaryRepresentation](integer)
+        if (self.binaryRepresentation == BinaryRepresentation.UNSIGNED and
+                isinstance(integer, _py_compat.integer_types) and integer >= 0):
+            length = max(integer.bit_length(), 1)
+            if self._n_bits is None or length <= self._n_bits:
+                self._adjust_int(integer, length)
+                return
+        self._set_str(self._convert_to[self.binaryRepresentation](integer))
 
     @property
     def is_resolvable(self):
         """Does the value contain any ``X``'s?  Inquiring minds want to know."""
+        if not self._xz:
+            return True
         return not any(char in self._str for char in BinaryValue._resolve_to_error)
 
     value = property(get_value, set_value, None,
@@ -317,21 +377,7 @@ class BinaryValue(object):
         >>> "0100000100101111".buff == "\x41\x2F"
         True
         """
-        bits = resolve(self._str)
-
-        if len(bits) % 8:
-            bits = "0" * (8 - len(bits) % 8) + bits
-
-        buff = ""
-        while bits:
-            byte = bits[:8]
-            bits = bits[8:]
-            val = int(byte, 2)
-            if self.big_endian:
-                buff += chr(val)
-            else:
-                buff = chr(val) + buff
-        return buff
+        return _py_compat.bytes_to_buff(self.to_bytes())
 
     def get_hex_buff(self):
         bstr = self.get_buff()
@@ -339,28 +385,52 @@ class BinaryValue(object):
         return hstr
 
     def set_buff(self, buff):
-        self._str = ""
-        for char in buff:
-            if self.big_endian:
-                self._str += "{0:08b}".format(ord(char))
-            else:
-                self._str = "{0:08b}".format(ord(char)) + self._str
-        self._adjust()
+        self.from_bytes(_py_compat.buff_to_bytes(buff))
+
+    def to_bytes(self):
+        """Return the value as :class:`bytes`.
+
+        The first byte is the most significant one if :attr:`big_endian`,
+        the least significant one otherwise. The value is padded with zeros
+        to a whole number of bytes.
+
+        Raises:
+            ValueError: If the value can't be resolved, see :func:`resolve`.
+        """
+        if self._xz:
+            value = int(resolve(self._str), 2)
+        else:
+            value = self._int
+        return _py_compat.int_to_bytes(value, (self._len + 7) // 8,
+                                       "big" if self.big_endian else "little")
 
-    def _adjust(self):
+    def from_bytes(self, data):
+        """Set the value from a bytes-like object.
+
+        Args:
+            data (bytes or bytearray or memoryview or array.array):
+                The bytes to assign, in the byte order given by
+                :attr:`big_endian` (see :meth:`to_bytes`). Slices of a
+                :class:`memoryview` avoid copying the underlying data.
+        """
+        value = _py_compat.int_from_bytes(data, "big" if self.big_endian else "little")
+        self._adjust_int(value, 8 * len(data))
+
+    def _adjust(self, string):
         """Pad/truncate the bit string to the correct length."""
         if self._n_bits is None:
-            return
-        l = len(self._str)
+            return string
+        l = len(string)
         if l < self._n_bits:
             if self.big_endian:
-                self._str = self._str + "0" * (self._n_bits - l)
+                string = string + "0" * (self._n_bits - l)
             else:
-                self._str = "0" * (self._n_bits - l) + self._str
+                string = "0" * (self._n_bits - l) + string
         elif l > self._n_bits:
             print("WARNING: truncating value to match requested number of bits "
                   "(%d -> %d)" % (l, self._n_bits))
-            self._str = self._str[l - self._n_bits:]
+            string = string[l - self._n_bits:]
+        return string
 
     buff = property(get_buff, set_buff, None,
                     "Access to the value as a buffer.")
@@ -368,15 +438,17 @@ class BinaryValue(object):
     def get_binstr(self):
         """Attribute :attr:`binstr` is the binary representation stored as
         a string of ``1`` and ``0``."""
+        if self._str is None:
+            self._str = "{0:0{1}b}".format(self._int, self._len) if self._len else ""
         return self._str
 
     def set_binstr(self, string):
-        for char in string:
-            if char not in BinaryValue._permitted_chars:
-                raise ValueError("Attempting to assign character %s to a %s" %
-                                 (char, self.__class__.__name__))
-        self._str = string
-        self._adjust()
+        if not BinaryValue._permitted_set.issuperset(string):
+            for char in string:
+                if char not in BinaryValue._permitted_chars:
+                    raise ValueError("Attempting to assign character %s to a %s" %
+                                     (char, self.__class__.__name__))
+        self._set_str(self._adjust(string))
 
     binstr = property(get_binstr, set_binstr, None,
                       "Access to the binary string.")
@@ -419,10 +491,7 @@ class BinaryValue(object):
         True
 
         """
-        for char in self._str:
-            if char == "1":
-                return True
-        return False
+        return self._int != 0
 
     def __eq__(self, other):
         if isinstance(other, BinaryValue):
@@ -597,7 +666,7 @@ class BinaryValue(object):
         return self.integer
 
     def __len__(self):
-        return len(self.binstr)
+        return self._len
 
     def __getitem__(self, key):
         """BinaryValue uses Verilog/VHDL style slices as opposed to Python
@@ -30,7 +30,7 @@
 """Common bus related functionality.
 A bus is simply defined as a collection of signals.
 """
-from cocotb.handle import _AssignmentResult
+from cocotb.handle import _AssignmentResult, read_many
 
 def _build_sig_attr_dict(signals):
     if isinstance(signals, dict):
@@ -155,11 +155,7 @@ class Bus(object):
             def __delattr__(self, name):
                 raise RuntimeError('Modifying a bus capture is not supported')
 
-        _capture = _Capture()
-        for attr_name, hdl in self._signals.items():
-            _capture[attr_name] = hdl.value
-
-        return _capture
+        return _Capture(zip(self._signals.keys(), read_many(self._signals.values())))
 
     def sample(self, obj, strict=False):
         """Sample the values from the bus, assigning them to *obj*.
@@ -172,7 +168,8 @@ class Bus(object):
         Raises:
             AttributeError: If attribute is missing in *obj* when ``strict=True``.
         """
-        for attr_name, hdl in self._signals.items():
+        values = read_many(self._signals.values())
+        for attr_name, value in zip(self._signals.keys(), values):
             if not hasattr(obj, attr_name):
                 if strict:
                     msg = ("Unable to sample from {0}.{1} because {2} is missing "
@@ -185,11 +182,11 @@ class Bus(object):
                     continue
             # Try to use the get/set_binstr methods because they will not clobber the properties
             # of obj.attr_name on assignment.  Otherwise use setattr() to crush whatever type of
-            # object was in obj.attr_name with hdl.value:
+            # object was in obj.attr_name with the value:
             try:
-                getattr(obj, attr_name).set_binstr(hdl.value.get_binstr())
+                getattr(obj, attr_name).set_binstr(value.get_binstr())
             except AttributeError:
-                setattr(obj, attr_name, hdl.value)
+                setattr(obj, attr_name, value)
 
     def __le__(self, value):
         """Overload the less than or equal to operator for value assignment"""
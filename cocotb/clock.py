@@ -28,10 +28,16 @@
 """A clock class."""
 
 import itertools
+import os
+
+if "COCOTB_SIM" in os.environ:
+    import simulator
+else:
+    simulator = None
 
 import cocotb
 from cocotb.log import SimLog
-from cocotb.triggers import Timer
+from cocotb.triggers import Timer, Trigger, GPITrigger, TriggerException
 from cocotb.utils import get_sim_steps, get_time_from_sim_steps, lazy_property
 
 
@@ -69,6 +75,11 @@ class Clock(BaseClock):
             ``None``, ``'fs'``, ``'ps'``, ``'ns'``, ``'us'``, ``'ms'``, ``'sec'``.
             When no *units* is given (``None``) the timestep is determined by
             the simulator.
+        impl (str, optional): One of ``'py'`` or ``'gpi'``.
+            ``'py'`` (the default) drives the signal from a Python coroutine.
+            ``'gpi'`` drives it from within the simulator, so that no Python
+            code runs on every clock edge. The edges then happen directly in
+            the timestep rather than in the ReadWrite phase of its scheduler.
 
 
     If you need more features like a phase shift and an asymmetric duty cycle,
@@ -110,8 +121,11 @@ class Clock(BaseClock):
         yield Timer(1000, units="ns")
     """
 
-    def __init__(self, signal, period, units=None):
+    def __init__(self, signal, period, units=None, impl="py"):
         BaseClock.__init__(self, signal)
+        if impl not in ("py", "gpi"):
+            raise ValueError("Clock impl must be 'py' or 'gpi', not %r" % (impl,))
+        self.impl = impl
         self.period = get_sim_steps(period, units)
         self.half_period = get_sim_steps(period / 2.0, units)
         self.frequency = 1.0 / get_time_from_sim_steps(self.period, units='us')
@@ -133,6 +147,11 @@ class Clock(BaseClock):
                 for the first half of the period.
                 Default is ``True``.
         """
+        if self.impl == "gpi":
+            if cycles != 0:
+                yield _GPIClockRun(self, cycles or 0, start_high)
+            return
+
         t = Timer(self.half_period)
         if cycles is None:
             it = itertools.count()
@@ -155,3 +174,38 @@ class Clock(BaseClock):
 
     def __str__(self):
         return self.__class__.__name__ + "(%3.1f MHz)" % self.frequency
+
+
+class _GPIClockRun(GPITrigger):
+    """Runs a clock within the simulator for as long as it is primed.
+
+    Fires once *cycles* cycles have been driven, never if *cycles* is 0.
+    Unpriming it, for example when the coroutine waiting on it is killed,
+    stops the clock.
+    """
+    def __init__(self, clock, cycles, start_high):
+        GPITrigger.__init__(self)
+        self.clock = clock
+        self.cycles = cycles
+        self.start_high = start_high
+
+    def prime(self, callback):
+        if self.cbhdl == 0:
+            clock = self.clock
+            self.cbhdl = simulator.create_clock(clock.signal._handle,
+                                                2 * clock.half_period,
+                                                clock.half_period,
+                                                self.start_high, self.cycles,
+                                                callback, self)
+            if self.cbhdl == 0:
+                raise TriggerException("Unable set up %s Trigger" % (str(self)))
+        GPITrigger.prime(self, callback)
+
+    def unprime(self):
+        if self.cbhdl != 0:
+            simulator.stop_clock(self.cbhdl)
+        self.cbhdl = 0
+        Trigger.unprime(self)
+
+    def __str__(self):
+        return self.__class__.__name__ + "(%s)" % self.clock
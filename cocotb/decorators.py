@@ -30,6 +30,7 @@ import sys
 import time
 import logging
 import functools
+import importlib
 import inspect
 import textwrap
 import os
@@ -48,6 +49,8 @@ if "COCOTB_SCHEDULER_DEBUG" in os.environ:
 else:
     _debug = False
 
+_native_coroutines = sys.version_info[:2] >= (3, 5)
+
 
 def public(f):
     """Use a decorator to avoid retyping function/class names.
@@ -76,6 +79,18 @@ class CoroutineComplete(Exception):
         Exception.__init__(self, text)
 
 
+class _CoroutineKilled(BaseException):
+    """Thrown into a coroutine running within the coroutine that awaits it,
+    to unwind it when it is killed.
+
+    This derives from :exc:`BaseException` so that it is not caught by
+    ``except Exception``.
+    """
+    def __init__(self, coro):
+        BaseException.__init__(self, "{} was killed".format(coro))
+        self.coro = coro
+
+
 class RunningCoroutine(object):
     """Per instance wrapper around an function to turn it into a coroutine.
 
@@ -87,23 +102,27 @@ class RunningCoroutine(object):
         coro.kill() will destroy a coroutine instance (and cause any Join
         triggers to fire.
     """
-    def __init__(self, inst, parent):
-        if hasattr(inst, "__name__"):
-            self.__name__ = "%s" % inst.__name__
 
-        if sys.version_info[:2] >= (3, 5) and inspect.iscoroutine(inst):
-            self._natively_awaitable = True
+    # A coroutine is created for every call of a decorated function, so only
+    # the state is kept per instance. The name and module are looked up on
+    # the decorated function when they are needed.
+    # __dict__ is needed for the `.log` lazy_property below, it is only
+    # created once something is logged.
+    __slots__ = ('_coro', '_started', '_parent', '_outcome', '_host', '_inline',
+                 '__dict__')
+
+    def __init__(self, inst, parent):
+        if _native_coroutines and inspect.iscoroutine(inst):
             self._coro = inst.__await__()
         else:
-            self._natively_awaitable = False
             self._coro = inst
         self._started = False
-        self._callbacks = []
         self._parent = parent
-        self.__doc__ = parent._func.__doc__
-        self.module = parent._func.__module__
-        self.funcname = parent._func.__name__
         self._outcome = None
+        # The scheduled coroutine this one is running within, see __await__
+        self._host = None
+        # The outermost coroutine running within this one
+        self._inline = None
 
         if not hasattr(self._coro, "send"):
             raise TypeError(
@@ -111,14 +130,23 @@ class RunningCoroutine(object):
                 "keyword?" % self.funcname
             )
 
+    @property
+    def __name__(self):
+        return self._parent._func.__name__
+
+    @property
+    def funcname(self):
+        return self._parent._func.__name__
+
+    @property
+    def module(self):
+        return self._parent._func.__module__
+
     @lazy_property
     def log(self):
         # Creating a logger is expensive, only do it if we actually plan to
         # log anything
-        if hasattr(self, "__name__"):
-            return SimLog("cocotb.coroutine.%s" % self.__name__, id(self))
-        else:
-            return SimLog("cocotb.coroutine.fail")
+        return SimLog("cocotb.coroutine.%s" % self.__name__, id(self))
 
     @property
     def retval(self):
@@ -201,15 +229,48 @@ class RunningCoroutine(object):
     if sys.version_info >= (3, 3):
         _py_compat.exec_(textwrap.dedent("""
         def __await__(self):
-            # It's tempting to use `return (yield from self._coro)` here,
-            # which bypasses the scheduler. Unfortunately, this means that
-            # we can't keep track of the result or state of the coroutine,
-            # things which we expose in our public API. If you want the
-            # efficiency of bypassing the scheduler, remove the `@coroutine`
-            # decorator from your `async` functions.
-
-            # Hand the coroutine back to the scheduler trampoline.
-            return (yield self)
+            if self._started:
+                # Already running, hand the coroutine back to the scheduler
+                # trampoline to wait for it to finish.
+                return (yield self)
+
+            # Run the coroutine within the one awaiting it, rather than
+            # scheduling it separately. Its triggers are passed through to
+            # the scheduler by `yield from`, and its result is recorded here
+            # so that `join()`, `retval` and `kill()` work as usual.
+            self._started = True
+            self._host = host = cocotb.scheduler._current_coro
+            if host is not None and host._inline is None:
+                host._inline = self
+            try:
+                ret = yield from self._coro
+            except ReturnValue as e:
+                ret = e.retval
+            except _CoroutineKilled as e:
+                if e.coro is self:
+                    # the outcome was set by kill()
+                    return None
+                # killed along with the coroutine awaiting this one
+                if self._outcome is None:
+                    self._outcome = outcomes.Value(None)
+                    cocotb.scheduler._inline_completed(self)
+                raise
+            except BaseException as e:
+                if self._outcome is None:
+                    self._outcome = outcomes.Error(e)
+                    cocotb.scheduler._inline_completed(self)
+                raise
+            finally:
+                self._host = None
+                if host is not None and host._inline is self:
+                    host._inline = None
+
+            if self._outcome is not None:
+                # killed from within, keep the outcome set by kill()
+                return self._outcome.get()
+            self._outcome = outcomes.Value(ret)
+            cocotb.scheduler._inline_completed(self)
+            return ret
         """))
 
     __bool__ = __nonzero__
@@ -250,7 +311,7 @@ class RunningTest(RunningCoroutine):
         if not self.started:
             self.error_messages = []
             self.log.info("Starting test: \"%s\"\nDescription: %s" %
-                          (self.funcname, self.__doc__))
+                          (self.funcname, self._parent._func.__doc__))
             self.start_time = time.time()
             self.start_sim_time = get_sim_time('ns')
             self.started = True
@@ -345,12 +406,16 @@ class function(object):
 @public
 class external(object):
     """Decorator to apply to an external function to enable calling from cocotb.
-    This currently creates a new execution context for each function that is
-    called. Scope for this to be streamlined to a queue in future.
+    The function is run on one of a pool of worker threads, which are kept
+    for the next call. Up to :envvar:`COCOTB_EXTERNAL_THREADS` idle threads
+    are kept, 4 by default.
     """
     def __init__(self, func):
         self._func = func
-        self._log = SimLog("cocotb.external.%s" % self._func.__name__, id(self))
+
+    @lazy_property
+    def _log(self):
+        return SimLog("cocotb.external.%s" % self._func.__name__, id(self))
 
     def __call__(self, *args, **kwargs):
         return cocotb.scheduler.run_in_executor(self._func, *args, **kwargs)
@@ -361,6 +426,71 @@ class external(object):
         return self.__class__(self._func.__get__(obj, type))
 
 
+def _import_object(module, qualname):
+    """Look up the object named *qualname* in *module*, importing it if needed."""
+    obj = importlib.import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _run_external_process(decorated, args, kwargs):
+    """Call the function of an :class:`external_process`, in a worker process."""
+    return decorated._func(*args, **kwargs)
+
+
+@public
+class external_process(object):
+    """Decorator to apply to a function to call it from cocotb in a separate
+    process, which lets CPU-heavy Python models use more than one core.
+
+    The calls are run by a :class:`concurrent.futures.ProcessPoolExecutor`
+    with up to :envvar:`COCOTB_EXTERNAL_PROCESSES` processes. The function and
+    its arguments and return value have to be picklable, so it must be
+    defined at the top level of a module. It can't access the design, or call
+    a :class:`function`.
+
+    Unlike :class:`external`, the simulation keeps running while the call is
+    in progress. The calling coroutine is resumed the next time the scheduler
+    runs in a writable phase after the call completed, for example on the
+    next clock edge. Something else, like a running :class:`~cocotb.clock.Clock`,
+    has to keep the simulation going in the meantime.
+
+    As the call runs alongside the simulation, the simulation time at which the
+    caller is resumed depends on how long the call takes in wall-clock time.
+    The results of a test using it can differ from run to run, even with the
+    same :envvar:`RANDOM_SEED`.
+
+    The worker processes are forked from the simulator process, so this is
+    only supported on platforms with :func:`os.fork`, such as Linux, and
+    raises :exc:`RuntimeError` elsewhere. They are forked when they are first
+    needed, which can be while functions decorated with :class:`external` run
+    in other threads. As after any fork of a multi-threaded process, the
+    function must not rely on locks those threads might hold.
+    """
+    def __init__(self, func):
+        self._func = func
+
+    def __call__(self, *args, **kwargs):
+        return cocotb.scheduler.run_in_process(_run_external_process,
+                                               self, args, kwargs)
+
+    def __get__(self, obj, type=None):
+        """Permit the decorator to be used on class methods
+            and standalone functions"""
+        return self.__class__(self._func.__get__(obj, type))
+
+    def __reduce__(self):
+        # The decorated function can't be pickled by name, as the name now
+        # refers to this object. Pickle this object by name instead, or the
+        # bound method if used on a method.
+        if inspect.ismethod(self._func):
+            return getattr, (self._func.__self__, self._func.__name__)
+        return _import_object, (
+            self._func.__module__,
+            getattr(self._func, "__qualname__", self._func.__name__))
+
+
 class _decorator_helper(type):
     """
     Metaclass that allows a type to be constructed using decorator syntax,
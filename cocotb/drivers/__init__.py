@@ -34,7 +34,7 @@ from collections import deque
 import cocotb
 from cocotb.decorators import coroutine
 from cocotb.triggers import (Event, RisingEdge, ReadOnly, NextTimeStep,
-                             Edge)
+                             ValueMatch)
 from cocotb.bus import Bus
 from cocotb.log import SimLog
 
@@ -264,7 +264,7 @@ class BusDriver(Driver):
         """
         yield ReadOnly()
         while signal.value.integer != 1:
-            yield RisingEdge(signal)
+            yield ValueMatch(signal, 1)
             yield ReadOnly()
         yield NextTimeStep()
 
@@ -278,7 +278,7 @@ class BusDriver(Driver):
         """
         yield ReadOnly()
         while signal.value.integer != 0:
-            yield Edge(signal)
+            yield ValueMatch(signal, 0)
             yield ReadOnly()
         yield NextTimeStep()
 
@@ -304,7 +304,7 @@ class AXI4Slave(BusDriver):
                     _burst_diff = burst_length - burst_count
                     _st = _awaddr + (_burst_diff * bytes_in_beat)  # start
                     _end = _awaddr + ((_burst_diff + 1) * bytes_in_beat)  # end
-                    self._memory[_st:_end] = array.array('B', word.get_buff())
+                    self._memory[_st:_end] = array.array('B', word.to_bytes())
                     burst_count -= 1
                     if burst_count == 0:
                         break
@@ -353,7 +353,7 @@ class AXI4Slave(BusDriver):
                     _burst_diff = burst_length - burst_count
                     _st = _araddr + (_burst_diff * bytes_in_beat)
                     _end = _araddr + ((_burst_diff + 1) * bytes_in_beat)
-                    word.buff = self._memory[_st:_end].tostring()
+                    word.from_bytes(self._memory[_st:_end])
                     self.bus.RDATA <= word
                     if burst_count == 1:
                         self.bus.RLAST <= 1
@@ -41,6 +41,7 @@ from cocotb.drivers import BusDriver, ValidatedBusDriver
 from cocotb.utils import hexdump
 from cocotb.binary import BinaryValue
 from cocotb.result import ReturnValue, TestError
+from cocotb import _py_compat
 
 
 class AvalonMM(BusDriver):
@@ -677,7 +678,7 @@ class AvalonSTPkts(ValidatedBusDriver):
     @coroutine
     def _send_string(self, string, sync=True, channel=None):
         """Args:
-            string (str): A string of bytes to send over the bus.
+            string (str or bytes): A string of bytes to send over the bus.
             channel (int): Channel to send the data on.
         """
         # Avoid spurious object creation by recycling
@@ -708,7 +709,10 @@ class AvalonSTPkts(ValidatedBusDriver):
         elif channel is not None:
             raise TestError("%s does not have a channel signal" % self.name)
 
-        while string:
+        # Slices of a memoryview don't copy the packet data
+        data = memoryview(_py_compat.buff_to_bytes(string))
+
+        while data:
             if not firstword or (firstword and sync):
                 yield clkedge
 
@@ -741,17 +745,16 @@ class AvalonSTPkts(ValidatedBusDriver):
             else:
                 self.bus.startofpacket <= 0
 
-            nbytes = min(len(string), bus_width)
-            data = string[:nbytes]
-            word.buff = data
+            nbytes = min(len(data), bus_width)
+            word.from_bytes(data[:nbytes])
 
-            if len(string) <= bus_width:
+            if len(data) <= bus_width:
                 self.bus.endofpacket <= 1
                 if self.use_empty:
-                    self.bus.empty <= bus_width - len(string)
-                string = ""
+                    self.bus.empty <= bus_width - len(data)
+                data = data[:0]
             else:
-                string = string[bus_width:]
+                data = data[bus_width:]
 
             self.bus.data <= word
 
@@ -98,8 +98,6 @@ class _XGMIIBus(object):
             self._integer |= (byte << (index * 8))
             self._integer |= (int(ctrl) << (self._nbytes*8 + index))
 
-        self._value.integer = self._integer
-
     @property
     def value(self):
         """Get the integer representation of this data word suitable for driving
@@ -30,6 +30,7 @@
 # -*- coding: utf-8 -*-
 
 import ctypes
+import re
 import warnings
 import sys
 if sys.version_info.major < 3:
@@ -48,11 +49,23 @@ import cocotb
 from cocotb.binary import BinaryValue
 from cocotb.log import SimLog
 from cocotb.result import TestError
+from cocotb.utils import lazy_property
 from cocotb import _py_compat
 
 # Only issue a warning for each deprecated attribute access
 _deprecation_warned = {}
 
+# The cocotb.hierarchy_index.HierarchyIndex in use, if any
+_hierarchy_index = None
+
+# Objects found by HierarchyObject._lookup below scopes that don't have a
+# SimHandle yet, by path. The SimHandle of the object looked up, or the GPI
+# handle and info of a scope on the way to it.
+_lookup_handles = {}
+
+# A name or an index in the path of HierarchyObject._lookup
+_path_part = re.compile(r"(?:^|\.)([^.\[\]]+)|\[(-?\d+)\]")
+
 
 class SimHandleBase(object):
     """Base class for all simulation objects.
@@ -60,6 +73,13 @@ class SimHandleBase(object):
     We maintain a handle which we can use for GPI calls.
     """
 
+    # Designs can have millions of handles, so only what every handle needs
+    # is kept in slots and the rest is looked up on first use. __dict__ is
+    # needed for the lazy_property members below, and lets testbenches keep
+    # adding their own attributes to handles.
+    __slots__ = ('_handle', '_len', '_sub_handles', '_invalid_sub_handles',
+                 '_name', '_path', '__weakref__', '__dict__')
+
     # For backwards compatibility we support a mapping of old member names
     # which may alias with the simulator hierarchy.  In these cases the
     # simulator result takes priority, only falling back to the python member
@@ -70,27 +90,46 @@ class SimHandleBase(object):
         "name"              :       "_name",
         }
 
-    def __init__(self, handle, path):
+    def __init__(self, handle, path, name=None):
         """
         .. Constructor. This RST comment works around sphinx-doc/sphinx#6885
 
         Args:
-            handle (int): The GPI handle to the simulator object.
+            handle (int): The GPI handle to the simulator object,
+                ``None`` for a handle created from the hierarchy index.
             path (str): Path to this handle, ``None`` if root.
+            name (str): The name of the simulator object, if already known.
         """
-        self._handle = handle
+        if handle is not None:
+            self._handle = handle
         self._len = None
         self._sub_handles = {}  # Dictionary of children
         self._invalid_sub_handles = {}  # Dictionary of invalid queries
 
-        self._name = simulator.get_name_string(self._handle)
-        self._type = simulator.get_type_string(self._handle)
-        self._fullname = self._name + "(%s)" % self._type
+        if name is None:
+            name = simulator.get_name_string(self._handle)
+        self._name = name
         self._path = self._name if path is None else path
-        self._log = SimLog("cocotb.%s" % self._name)
-        self._log.debug("Created")
-        self._def_name = simulator.get_definition_name(self._handle)
-        self._def_file = simulator.get_definition_file(self._handle)
+
+    @lazy_property
+    def _type(self):
+        return simulator.get_type_string(self._handle)
+
+    @lazy_property
+    def _fullname(self):
+        return self._name + "(%s)" % self._type
+
+    @lazy_property
+    def _log(self):
+        return SimLog("cocotb.%s" % self._name)
+
+    @lazy_property
+    def _def_name(self):
+        return simulator.get_definition_name(self._handle)
+
+    @lazy_property
+    def _def_file(self):
+        return simulator.get_definition_file(self._handle)
 
     def get_definition_name(self):
         return object.__getattribute__(self, "_def_name")
@@ -144,6 +183,8 @@ class SimHandleBase(object):
             return object.__setattr__(self, name, value)
 
     def __getattr__(self, name):
+        if name == "_handle":
+            return self._resolve_handle()
         if name in self._compat_mapping:
             if name not in _deprecation_warned:
                 warnings.warn("Use of attribute %r is deprecated, use %r instead" % (name, self._compat_mapping[name]))
@@ -153,13 +194,51 @@ class SimHandleBase(object):
             return object.__getattribute__(self, name)
 
 
+    def _key_path(self, key):
+        """Returns the path of the child *key*."""
+        return self._path + "[" + str(key) + "]"
+
+    def _known_child(self, key):
+        """Return the child *key* if it was found by
+        :meth:`HierarchyObject._lookup`, or ``None``."""
+        if not _lookup_handles:
+            return None
+        path = self._key_path(key)
+        found = _lookup_handles.pop(path, None)
+        if found is None:
+            return None
+        if not isinstance(found, SimHandleBase):
+            handle, info = found
+            found = _handle2obj.get(handle)
+            if found is None:
+                found = _new_handle(handle, path, info)
+        self._sub_handles[key] = found
+        return found
+
+    def _resolve_handle(self):
+        """Get the GPI handle of a handle created from the hierarchy index."""
+        try:
+            parent, name = self.__dict__.pop("_index_parent")
+        except KeyError:
+            raise AttributeError("_handle")
+        handle = parent._get_child_handle(name)
+        if not handle:
+            raise TestError("%s is in the hierarchy index %s but not in the design" %
+                            (self._path, _hierarchy_index.filename))
+        self._handle = handle
+        _handle2obj.setdefault(handle, self)
+        return handle
+
+
 class RegionObject(SimHandleBase):
     """A region object, such as a scope or namespace.
 
     Region objects don't have values, they are effectively scopes or namespaces.
     """
-    def __init__(self, handle, path):
-        SimHandleBase.__init__(self, handle, path)
+    __slots__ = ('_discovered',)
+
+    def __init__(self, handle, path, name=None):
+        SimHandleBase.__init__(self, handle, path, name)
         self._discovered = False
 
     def __iter__(self):
@@ -188,6 +267,18 @@ class RegionObject(SimHandleBase):
         """
         if self._discovered:
             return
+
+        if _hierarchy_index is not None:
+            children = _hierarchy_index.children(self._path)
+            if children is not None:
+                for info in children:
+                    key = self._sub_handle_key(info[0])
+                    if key is not None and key not in self._sub_handles:
+                        self._index_child(key, info)
+                self._discovered = True
+                return
+            found = []
+
         self._log.debug("Discovering all on %s", self._name)
         iterator = simulator.iterate(self._handle, simulator.OBJECTS)
         while True:
@@ -196,14 +287,16 @@ class RegionObject(SimHandleBase):
             except StopIteration:
                 # Iterator is cleaned up internally in GPI
                 break
-            name = simulator.get_name_string(thing)
+            info = simulator.get_handle_info(thing)
             try:
-                hdl = SimHandle(thing, self._child_path(name))
+                hdl = _handle2obj.get(thing)
+                if hdl is None:
+                    hdl = _new_handle(thing, self._child_path(info[0]), info)
             except TestError as e:
                 self._log.debug("%s", e)
                 continue
 
-            key = self._sub_handle_key(name)
+            key = self._sub_handle_key(info[0])
 
             if key is not None:
                 self._sub_handles[key] = hdl
@@ -211,8 +304,47 @@ class RegionObject(SimHandleBase):
                 self._log.debug("Unable to translate handle >%s< to a valid _sub_handle key", hdl._name)
                 continue
 
+            if _hierarchy_index is not None:
+                found.append(info)
+
+        if _hierarchy_index is not None:
+            _hierarchy_index.record_children(self._path, found)
         self._discovered = True
 
+    def _known_child(self, key):
+        """Return the child *key* if it was found by
+        :meth:`HierarchyObject._lookup` or is known to the hierarchy index,
+        or ``None``."""
+        found = SimHandleBase._known_child(self, key)
+        if found is None:
+            found = self._index_child(key)
+        return found
+
+    def _index_child(self, key, info=None):
+        """Return the child *key* known to the hierarchy index, or ``None``.
+
+        Its GPI handle is only looked up when it is first used.
+        """
+        if info is None:
+            if _hierarchy_index is None:
+                return None
+            info = _hierarchy_index.child(self._path, key, self._sub_handle_key)
+            if info is None:
+                return None
+        hdl = _new_handle(None, self._child_path(info[0]), info)
+        hdl._index_parent = (self, key)
+        self._sub_handles[key] = hdl
+        return hdl
+
+    def _record_child(self, key, handle):
+        """Add the child *key* found in the simulator to the hierarchy index."""
+        if _hierarchy_index is not None:
+            _hierarchy_index.record_child(self._path, key, simulator.get_handle_info(handle))
+
+    def _get_child_handle(self, key):
+        """Return the GPI handle of the child *key*."""
+        return simulator.get_handle_by_name(self._handle, key)
+
     def _child_path(self, name):
         """Returns a string of the path of the child :any:`SimHandle` for a given *name*."""
         return self._path + "." + name
@@ -229,6 +361,7 @@ class RegionObject(SimHandleBase):
 
 class HierarchyObject(RegionObject):
     """Hierarchy objects are namespace/scope objects."""
+    __slots__ = ()
 
     def __setattr__(self, name, value):
         """Provide transparent access to signals via the hierarchy.
@@ -271,6 +404,10 @@ class HierarchyObject(RegionObject):
         if name.startswith("_"):
             return SimHandleBase.__getattr__(self, name)
 
+        sub_handle = self._known_child(name)
+        if sub_handle is not None:
+            return sub_handle
+
         new_handle = simulator.get_handle_by_name(self._handle, name)
 
         if not new_handle:
@@ -280,6 +417,7 @@ class HierarchyObject(RegionObject):
 
         sub_handle = SimHandle(new_handle, self._child_path(name))
         self._sub_handles[name] = sub_handle
+        self._record_child(name, new_handle)
         return sub_handle
 
     def __hasattr__(self, name):
@@ -296,13 +434,85 @@ class HierarchyObject(RegionObject):
         if name in self._invalid_sub_handles:
             return None
 
+        sub_handle = self._known_child(name)
+        if sub_handle is not None:
+            return sub_handle
+
         new_handle = simulator.get_handle_by_name(self._handle, name)
         if new_handle:
             self._sub_handles[name] = SimHandle(new_handle, self._child_path(name))
+            self._record_child(name, new_handle)
         else:
             self._invalid_sub_handles[name] = None
         return new_handle
 
+    def _key_path(self, key):
+        return self._child_path(key)
+
+    def _lookup(self, path):
+        """Return the object at *path* below this one.
+
+        The *path* is made of names and indices, such as
+        ``"sub1.sub2.sig[3]"``, and is walked by the simulator in a single
+        call. Only the object at the end of the path gets a handle straight
+        away, the scopes on the way get theirs when they are first accessed.
+
+        Raises:
+            ValueError: If *path* is not a valid path.
+            AttributeError: If there is no object at *path*.
+        """
+        parts = []
+        end = 0
+        for match in _path_part.finditer(path):
+            if match.start() != end:
+                break
+            name, index = match.groups()
+            parts.append(name if index is None else int(index))
+            end = match.end()
+        if not parts or end != len(path):
+            raise ValueError("Invalid path %r" % (path,))
+
+        paths = []
+        for part in parts:
+            parent = paths[-1] if paths else self._path
+            if isinstance(part, int):
+                paths.append(parent + "[" + str(part) + "]")
+            else:
+                paths.append(parent + "." + part)
+
+        # An earlier lookup may have found it already
+        found = _lookup_handles.get(paths[-1])
+        if isinstance(found, SimHandleBase):
+            return found
+
+        # Walk down the scopes that already have a SimHandle
+        hdl = self
+        start = 0
+        while start < len(parts) and parts[start] in hdl._sub_handles:
+            hdl = hdl._sub_handles[parts[start]]
+            start += 1
+        if start == len(parts):
+            return hdl
+
+        found = simulator.get_handle_by_path(hdl._handle, parts[start:])
+        if len(found) < len(parts) - start:
+            missing = start + len(found)
+            raise AttributeError("%s contains no object %s" % (
+                paths[missing - 1] if missing else self._path, parts[missing]))
+
+        for path, info in zip(paths[start:-1], found[:-1]):
+            _lookup_handles.setdefault(path, (info[0], info[1:]))
+
+        info = found[-1]
+        leaf = _handle2obj.get(info[0])
+        if leaf is None:
+            leaf = _new_handle(info[0], paths[-1], info[1:])
+        if start == len(parts) - 1:
+            hdl._sub_handles[parts[-1]] = leaf
+        else:
+            _lookup_handles[paths[-1]] = leaf
+        return leaf
+
     def _id(self, name, extended=True):
         """Query the simulator for a object with the specified name,
         including extended identifiers,
@@ -317,6 +527,7 @@ class HierarchyObject(RegionObject):
 
 class HierarchyArrayObject(RegionObject):
     """Hierarchy Arrays are containers of Hierarchy Objects."""
+    __slots__ = ()
 
     def _sub_handle_key(self, name):
         """Translates the handle name to a key to use in ``_sub_handles`` dictionary."""
@@ -325,18 +536,16 @@ class HierarchyArrayObject(RegionObject):
         # FLI and VHPI(IUS):  _name(X) where X is the index
         # VHPI(ALDEC):        _name__X where X is the index
         # VPI:                _name[X] where X is the index
-        import re
-        result = re.match(r"{0}__(?P<index>\d+)$".format(self._name), name)
-        if not result:
-            result = re.match(r"{0}\((?P<index>\d+)\)$".format(self._name), name)
-        if not result:
-            result = re.match(r"{0}\[(?P<index>\d+)\]$".format(self._name), name)
-
-        if result:
-            return int(result.group("index"))
-        else:
-            self._log.error("Unable to match an index pattern: %s", name)
-            return None
+        if name.startswith(self._name):
+            suffix = name[len(self._name):]
+            for start, end in (("__", ""), ("(", ")"), ("[", "]")):
+                if suffix.startswith(start) and suffix.endswith(end):
+                    index = suffix[len(start):len(suffix) - len(end)]
+                    if index.isdigit():
+                        return int(index)
+
+        self._log.error("Unable to match an index pattern: %s", name)
+        return None
 
     def __len__(self):
         """Returns the 'length' of the generate block."""
@@ -352,13 +561,21 @@ class HierarchyArrayObject(RegionObject):
             raise IndexError("Slice indexing is not supported")
         if index in self._sub_handles:
             return self._sub_handles[index]
+        sub_handle = self._known_child(index)
+        if sub_handle is not None:
+            return sub_handle
         new_handle = simulator.get_handle_by_index(self._handle, index)
         if not new_handle:
             raise IndexError("%s contains no object at index %d" % (self._name, index))
         path = self._path + "[" + str(index) + "]"
         self._sub_handles[index] = SimHandle(new_handle, path)
+        self._record_child(index, new_handle)
         return self._sub_handles[index]
 
+    def _get_child_handle(self, key):
+        """Return the GPI handle of the child at index *key*."""
+        return simulator.get_handle_by_index(self._handle, key)
+
     def _child_path(self, name):
         """Returns a string of the path of the child :any:`SimHandle` for a given name."""
         index = self._sub_handle_key(name)
@@ -391,6 +608,10 @@ class _AssignmentResult(object):
 
 class NonHierarchyObject(SimHandleBase):
     """Common base class for all non-hierarchy objects."""
+    __slots__ = ()
+
+    # Format in which read_many() fetches the value, None if not supported
+    _read_format = None
 
     def __iter__(self):
         return iter(())
@@ -408,6 +629,9 @@ class NonHierarchyObject(SimHandleBase):
     def setimmediatevalue(self, value):
         raise TypeError("Not permissible to set values on object %s of type %s" % (self._name, type(self)))
 
+    def _prepare_write(self, value):
+        raise TypeError("Not permissible to set values on object %s of type %s" % (self._name, type(self)))
+
     def _setcachedvalue(self, value):
         raise TypeError("Not permissible to set values on object %s of type %s" % (self._name, type(self)))
 
@@ -450,7 +674,9 @@ class ConstantObject(NonHierarchyObject):
     We can also cache the value since it is fixed at elaboration time and
     won't change within a simulation.
     """
-    def __init__(self, handle, path, handle_type):
+    __slots__ = ('_handle_type',)
+
+    def __init__(self, handle, path, handle_type, name=None):
         """
         Args:
             handle (int): The GPI handle to the simulator object.
@@ -458,21 +684,27 @@ class ConstantObject(NonHierarchyObject):
             handle_type: The type of the handle
                 (``simulator.INTEGER``, ``simulator.ENUM``,
                 ``simulator.REAL``, ``simulator.STRING``).
+            name (str): The name of the simulator object, if already known.
         """
-        NonHierarchyObject.__init__(self, handle, path)
-        if handle_type in [simulator.INTEGER, simulator.ENUM]:
-            self._value = simulator.get_signal_val_long(self._handle)
-        elif handle_type == simulator.REAL:
-            self._value = simulator.get_signal_val_real(self._handle)
-        elif handle_type == simulator.STRING:
-            self._value = simulator.get_signal_val_str(self._handle)
-        else:
-            val = simulator.get_signal_val_binstr(self._handle)
-            self._value = BinaryValue(n_bits=len(val))
-            try:
-                self._value.binstr = val
-            except Exception:
-                self._value = val
+        NonHierarchyObject.__init__(self, handle, path, name)
+        self._handle_type = handle_type
+
+    @lazy_property
+    def _value(self):
+        if self._handle_type in [simulator.INTEGER, simulator.ENUM]:
+            return simulator.get_signal_val_long(self._handle)
+        elif self._handle_type == simulator.REAL:
+            return simulator.get_signal_val_real(self._handle)
+        elif self._handle_type == simulator.STRING:
+            return simulator.get_signal_val_str(self._handle)
+
+        val = simulator.get_signal_val_binstr(self._handle)
+        value = BinaryValue(n_bits=len(val))
+        try:
+            value.binstr = val
+        except Exception:
+            value = val
+        return value
 
     def __int__(self):
         return int(self.value)
@@ -489,9 +721,11 @@ class ConstantObject(NonHierarchyObject):
 
 class NonHierarchyIndexableObject(NonHierarchyObject):
     """ A non-hierarchy indexable object. """
-    def __init__(self, handle, path):
-        NonHierarchyObject.__init__(self, handle, path)
-        self._range = simulator.get_range(self._handle)
+    __slots__ = ()
+
+    @lazy_property
+    def _range(self):
+        return simulator.get_range(self._handle)
 
     def __setitem__(self, index, value):
         """Provide transparent assignment to indexed array handles."""
@@ -512,6 +746,9 @@ class NonHierarchyIndexableObject(NonHierarchyObject):
             raise IndexError("%s is not indexable.  Unable to get object at index %d" % (self._fullname, index))
         if index in self._sub_handles:
             return self._sub_handles[index]
+        sub_handle = self._known_child(index)
+        if sub_handle is not None:
+            return sub_handle
         new_handle = simulator.get_handle_by_index(self._handle, index)
         if not new_handle:
             raise IndexError("%s contains no object at index %d" % (self._fullname, index))
@@ -559,6 +796,7 @@ class _SimIterator(collections_abc.Iterator):
 class NonConstantObject(NonHierarchyIndexableObject):
     """ A non-constant object"""
     # FIXME: what is the difference to ModifiableObject? Explain in docstring.
+    __slots__ = ()
 
     def drivers(self):
         """An iterator for gathering all drivers for a signal."""
@@ -571,6 +809,9 @@ class NonConstantObject(NonHierarchyIndexableObject):
 
 class ModifiableObject(NonConstantObject):
     """Base class for simulator objects whose values can be modified."""
+    __slots__ = ()
+
+    _read_format = "binstr"
 
     def setimmediatevalue(self, value):
         """Set the value of the underlying simulation object to *value*.
@@ -589,9 +830,22 @@ class ModifiableObject(NonConstantObject):
             TypeError: If target is not wide enough or has an unsupported type
                  for value assignment.
         """
-        if isinstance(value, _py_compat.integer_types) and value < 0x7fffffff and len(self) <= 32:
+        kind, value = self._prepare_write(value)
+        if kind == "long":
             simulator.set_signal_val_long(self._handle, value)
-            return
+        else:
+            simulator.set_signal_val_str(self._handle, value)
+
+    def _prepare_write(self, value):
+        """Convert *value* into the form the simulator is written with.
+
+        Returns:
+            tuple: The kind of write (``"long"``, ``"real"`` or ``"str"``,
+            selecting the ``simulator.set_signal_val_*`` function to use) and
+            the converted value.
+        """
+        if isinstance(value, _py_compat.integer_types) and value < 0x7fffffff and len(self) <= 32:
+            return "long", value
 
         if isinstance(value, ctypes.Structure):
             value = BinaryValue(value=cocotb.utils.pack(value), n_bits=len(self))
@@ -616,7 +870,7 @@ class ModifiableObject(NonConstantObject):
             self._log.critical("Unsupported type for value assignment: %s (%s)", type(value), repr(value))
             raise TypeError("Unable to set simulator value with type %s" % (type(value)))
 
-        simulator.set_signal_val_str(self._handle, value.binstr)
+        return "str", value.binstr
 
     def _getvalue(self):
         binstr = simulator.get_signal_val_binstr(self._handle)
@@ -641,6 +895,9 @@ class ModifiableObject(NonConstantObject):
 
 class RealObject(ModifiableObject):
     """Specific object handle for Real signals and variables."""
+    __slots__ = ()
+
+    _read_format = "real"
 
     def setimmediatevalue(self, value):
         """Set the value of the underlying simulation object to value.
@@ -655,11 +912,14 @@ class RealObject(ModifiableObject):
             TypeError: If target has an unsupported type for
                 real value assignment.
         """
+        simulator.set_signal_val_real(self._handle, self._prepare_write(value)[1])
+
+    def _prepare_write(self, value):
         if not isinstance(value, float):
             self._log.critical("Unsupported type for real value assignment: %s (%s)", type(value), repr(value))
             raise TypeError("Unable to set simulator value with type %s" % (type(value)))
 
-        simulator.set_signal_val_real(self._handle, value)
+        return "real", value
 
     def _getvalue(self):
         return simulator.get_signal_val_real(self._handle)
@@ -670,6 +930,9 @@ class RealObject(ModifiableObject):
 
 class EnumObject(ModifiableObject):
     """Specific object handle for enumeration signals and variables."""
+    __slots__ = ()
+
+    _read_format = "long"
 
     def setimmediatevalue(self, value):
         """Set the value of the underlying simulation object to *value*.
@@ -684,13 +947,16 @@ class EnumObject(ModifiableObject):
             TypeError: If target has an unsupported type for
                  integer value assignment.
         """
+        simulator.set_signal_val_long(self._handle, self._prepare_write(value)[1])
+
+    def _prepare_write(self, value):
         if isinstance(value, BinaryValue):
             value = int(value)
         elif not isinstance(value, _py_compat.integer_types):
             self._log.critical("Unsupported type for integer value assignment: %s (%s)", type(value), repr(value))
             raise TypeError("Unable to set simulator value with type %s" % (type(value)))
 
-        simulator.set_signal_val_long(self._handle, value)
+        return "long", value
 
     def _getvalue(self):
         return simulator.get_signal_val_long(self._handle)
@@ -698,6 +964,9 @@ class EnumObject(ModifiableObject):
 
 class IntegerObject(ModifiableObject):
     """Specific object handle for Integer and Enum signals and variables."""
+    __slots__ = ()
+
+    _read_format = "long"
 
     def setimmediatevalue(self, value):
         """Set the value of the underlying simulation object to *value*.
@@ -712,13 +981,16 @@ class IntegerObject(ModifiableObject):
             TypeError: If target has an unsupported type for
                  integer value assignment.
         """
+        simulator.set_signal_val_long(self._handle, self._prepare_write(value)[1])
+
+    def _prepare_write(self, value):
         if isinstance(value, BinaryValue):
             value = int(value)
         elif not isinstance(value, _py_compat.integer_types):
             self._log.critical("Unsupported type for integer value assignment: %s (%s)", type(value), repr(value))
             raise TypeError("Unable to set simulator value with type %s" % (type(value)))
 
-        simulator.set_signal_val_long(self._handle, value)
+        return "long", value
 
     def _getvalue(self):
         return simulator.get_signal_val_long(self._handle)
@@ -726,6 +998,9 @@ class IntegerObject(ModifiableObject):
 
 class StringObject(ModifiableObject):
     """Specific object handle for String variables."""
+    __slots__ = ()
+
+    _read_format = "str"
 
     def setimmediatevalue(self, value):
         """Set the value of the underlying simulation object to *value*.
@@ -740,17 +1015,59 @@ class StringObject(ModifiableObject):
             TypeError: If target has an unsupported type for
                  string value assignment.
         """
+        simulator.set_signal_val_str(self._handle, self._prepare_write(value)[1])
+
+    def _prepare_write(self, value):
         if not isinstance(value, str):
             self._log.critical("Unsupported type for string value assignment: %s (%s)", type(value), repr(value))
             raise TypeError("Unable to set simulator value with type %s" % (type(value)))
 
-        simulator.set_signal_val_str(self._handle, value)
+        return "str", value
 
     def _getvalue(self):
         return simulator.get_signal_val_str(self._handle)
 
+def read_many(handles):
+    """Read the values of several simulator objects at once.
+
+    Equivalent to ``tuple(handle.value for handle in handles)``, but the
+    values of all objects of the same kind are fetched with a single call
+    into the simulator.
+
+    Args:
+        handles (iterable): The objects to read.
+
+    Returns:
+        tuple: The value of each object, in the same order as *handles*.
+    """
+    handles = tuple(handles)
+    values = [None] * len(handles)
+    batches = {}
+    for i, hdl in enumerate(handles):
+        read_format = hdl._read_format
+        if read_format is None:
+            values[i] = hdl.value
+        else:
+            batches.setdefault(read_format, []).append(i)
+
+    for read_format, indices in batches.items():
+        raw = simulator.get_signal_vals([handles[i]._handle for i in indices],
+                                        read_format)
+        if read_format == "binstr":
+            raw = [BinaryValue(binstr, len(binstr)) for binstr in raw]
+        for i, value in zip(indices, raw):
+            values[i] = value
+
+    return tuple(values)
+
+
 _handle2obj = {}
 
+# Handle classes by GPI type, filled in on first use since the simulator
+# module can only be imported in a simulation
+_type2cls = {}
+
+
 def SimHandle(handle, path=None):
     """Factory function to create the correct type of `SimHandle` object.
 
@@ -764,39 +1081,51 @@ def SimHandle(handle, path=None):
     Raises:
         TestError: If no matching object for GPI type could be found.
     """
-    _type2cls = {
-        simulator.MODULE:      HierarchyObject,
-        simulator.STRUCTURE:   HierarchyObject,
-        simulator.REG:         ModifiableObject,
-        simulator.NETARRAY:    NonHierarchyIndexableObject,
-        simulator.REAL:        RealObject,
-        simulator.INTEGER:     IntegerObject,
-        simulator.ENUM:        EnumObject,
-        simulator.STRING:      StringObject,
-        simulator.GENARRAY:    HierarchyArrayObject,
-    }
-
     # Enforce singletons since it's possible to retrieve handles avoiding
     # the hierarchy by getting driver/load information
-    global _handle2obj
     try:
         return _handle2obj[handle]
     except KeyError:
         pass
 
-    t = simulator.get_type(handle)
+    return _new_handle(handle, path, simulator.get_handle_info(handle))
 
-    # Special case for constants
-    if simulator.get_const(handle) and t not in [simulator.MODULE,
-                                                 simulator.STRUCTURE,
-                                                 simulator.NETARRAY,
-                                                 simulator.GENARRAY]:
-        obj = ConstantObject(handle, path, t)
-        _handle2obj[handle] = obj
-        return obj
 
-    if t not in _type2cls:
+def _new_handle(handle, path, info):
+    """Create the `SimHandle` object of *handle*.
+
+    Args:
+        handle (int): The GPI handle to the simulator object.
+        path (str): Path to this handle, ``None`` if root.
+        info (tuple): The name, GPI type and constant flag of the object,
+            as returned by ``simulator.get_handle_info``.
+    """
+    if not _type2cls:
+        _type2cls.update({
+            simulator.MODULE:      HierarchyObject,
+            simulator.STRUCTURE:   HierarchyObject,
+            simulator.REG:         ModifiableObject,
+            simulator.NETARRAY:    NonHierarchyIndexableObject,
+            simulator.REAL:        RealObject,
+            simulator.INTEGER:     IntegerObject,
+            simulator.ENUM:        EnumObject,
+            simulator.STRING:      StringObject,
+            simulator.GENARRAY:    HierarchyArrayObject,
+        })
+
+    name, t, const = info
+
+    # Special case for constants
+    if const and t not in [simulator.MODULE,
+                           simulator.STRUCTURE,
+                           simulator.NETARRAY,
+                           simulator.GENARRAY]:
+        obj = ConstantObject(handle, path, t, name)
+    elif t not in _type2cls:
         raise TestError("Couldn't find a matching object for GPI type %d (path=%s)" % (t, path))
-    obj = _type2cls[t](handle, path)
-    _handle2obj[handle] = obj
+    else:
+        obj = _type2cls[t](handle, path, name)
+    # Handles from the hierarchy index are registered by _resolve_handle
+    if handle is not None:
+        _handle2obj[handle] = obj
     return obj
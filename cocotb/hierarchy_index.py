@@ -0,0 +1,163 @@
+# Copyright (c) cocotb contributors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL POTENTIAL VENTURES LTD BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+An on-disk index of the elaborated design hierarchy.
+
+The index records the name, GPI type and constant flag of the objects found
+below each scope, so that later simulation runs can list scopes and look up
+objects without asking the simulator. The handles created from the index only
+get their GPI handle when it is first needed.
+
+It is enabled by setting :envvar:`COCOTB_HIERARCHY_INDEX` to the file name of
+the index. The index is only used if it was written for the same simulator,
+toplevel and HDL sources, otherwise it is built again.
+"""
+
+import hashlib
+import json
+import os
+
+
+def _design_hash(sources, compile_args):
+    """Return a hash of the names, sizes and modification times of the
+    *sources*, and of the *compile_args*."""
+    h = hashlib.sha1()
+    h.update(("%s\n" % compile_args).encode())
+    for path in sources:
+        try:
+            st = os.stat(path)
+        except OSError:
+            h.update(("%s missing\n" % path).encode())
+            continue
+        h.update(("%s %d %d\n" % (path, st.st_size, int(st.st_mtime))).encode())
+    return h.hexdigest()
+
+
+class HierarchyIndex(object):
+    """The objects of the design hierarchy known from earlier runs.
+
+    Each scope is recorded under its path, with the objects found below it.
+    A scope is *complete* once all its objects were discovered, until then
+    only the objects looked up by name are recorded.
+
+    Args:
+        filename (str): The file the index is kept in.
+        key (dict): Identifies the design the index was built for.
+    """
+
+    def __init__(self, filename, key):
+        self.filename = filename
+        self.key = key
+        self._scopes = {}  # path: [complete, [[name, type, const], ...]]
+        self._children = {}  # path: {key: info}, built on first lookup
+        self._changed = False
+
+    @classmethod
+    def load(cls, filename, key):
+        """Load the index in *filename*, or start a new one if it doesn't
+        exist or was built for another design."""
+        index = cls(filename, key)
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return index
+        if data.get("key") == key:
+            index._scopes = data["scopes"]
+        return index
+
+    @classmethod
+    def for_design(cls, filename, simulator, version, toplevel):
+        """Load the index for *toplevel* built by *simulator* from the
+        HDL sources the makefiles pass on.
+
+        The index is not reused if the sources aren't known, as it can't be
+        told whether the design changed.
+        """
+        filename = os.path.abspath(filename)
+        key = {
+            "simulator": simulator,
+            "version": version,
+            "toplevel": toplevel,
+        }
+        sources = os.getenv("COCOTB_HDL_SOURCES", "").split()
+        if not sources:
+            return cls(filename, key)
+        key["design"] = _design_hash(sources, os.getenv("COCOTB_HDL_COMPILE_ARGS", ""))
+        return cls.load(filename, key)
+
+    def save(self):
+        """Write the index if anything was added to it."""
+        if not self._changed:
+            return
+        # Other simulations can use the index at the same time, so replace
+        # the file in one step
+        tmp = "%s.%d" % (self.filename, os.getpid())
+        with open(tmp, "w") as f:
+            json.dump({"key": self.key, "scopes": self._scopes}, f)
+        if os.name == "nt" and os.path.exists(self.filename):
+            os.remove(self.filename)
+        os.rename(tmp, self.filename)
+        self._changed = False
+
+    def children(self, path):
+        """Return the ``(name, type, const)`` of all the objects below
+        *path*, or ``None`` if the scope is not complete."""
+        scope = self._scopes.get(path)
+        if scope is None or not scope[0]:
+            return None
+        return scope[1]
+
+    def child(self, path, key, key_func):
+        """Return the ``(name, type, const)`` of the object *key* below
+        *path*, or ``None`` if it is not known.
+
+        *key_func* translates the names of the objects to their keys.
+        """
+        try:
+            children = self._children[path]
+        except KeyError:
+            scope = self._scopes.get(path)
+            if scope is None:
+                return None
+            children = self._children[path] = {key_func(info[0]): info for info in scope[1]}
+        return children.get(key)
+
+    def record_children(self, path, infos):
+        """Record all the objects below *path*, completing the scope."""
+        self._scopes[path] = [True, [list(info) for info in infos]]
+        self._children.pop(path, None)
+        self._changed = True
+
+    def record_child(self, path, key, info):
+        """Record the object *key* found below *path*."""
+        scope = self._scopes.setdefault(path, [False, []])
+        if scope[0]:
+            return
+        scope[1].append(list(info))
+        children = self._children.get(path)
+        if children is not None:
+            children[key] = scope[1][-1]
+        self._changed = True
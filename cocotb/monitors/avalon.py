@@ -39,6 +39,7 @@ from cocotb.decorators import coroutine
 from cocotb.monitors import BusMonitor
 from cocotb.triggers import RisingEdge, ReadOnly
 from cocotb.binary import BinaryValue
+from cocotb import _py_compat
 
 class AvalonProtocolError(Exception):
     pass
@@ -156,7 +157,7 @@ class AvalonSTPkts(BusMonitor):
         # Avoid spurious object creation by recycling
         clkedge = RisingEdge(self.clock)
         rdonly = ReadOnly()
-        pkt = ""
+        pkt = bytearray()
         in_pkt = False
         invalid_cyclecount = 0
         channel = None
@@ -180,7 +181,7 @@ class AvalonSTPkts(BusMonitor):
                     if pkt:
                         raise AvalonProtocolError("Duplicate start-of-packet received on %s" %
                                                   str(self.bus.startofpacket))
-                    pkt = ""
+                    pkt = bytearray()
                     in_pkt = True
 
                 if not in_pkt:
@@ -206,7 +207,7 @@ class AvalonSTPkts(BusMonitor):
                                                                                           self.bus.data.value.get_binstr()))
 
                 vec.big_endian = self.config['firstSymbolInHighOrderBits']
-                pkt += vec.buff
+                pkt += vec.to_bytes()
 
                 if hasattr(self.bus, 'channel'):
                     if channel is None:
@@ -218,14 +219,15 @@ class AvalonSTPkts(BusMonitor):
                         raise AvalonProtocolError("Channel value changed during packet")
 
                 if self.bus.endofpacket.value:
-                    self.log.info("Received a packet of %d bytes", len(pkt))
-                    self.log.debug(hexdump(str((pkt))))
+                    data = _py_compat.bytes_to_buff(pkt)
+                    self.log.info("Received a packet of %d bytes", len(data))
+                    self.log.debug(hexdump(data))
                     self.channel = channel
                     if self.report_channel:
-                        self._recv({"data": pkt, "channel": channel})
+                        self._recv({"data": data, "channel": channel})
                     else:
-                        self._recv(pkt)
-                    pkt = ""
+                        self._recv(data)
+                    pkt = bytearray()
                     in_pkt = False
                     channel = None
             else:
@@ -39,6 +39,7 @@ import cocotb
 from cocotb.utils import hexdump
 from cocotb.monitors import Monitor
 from cocotb.triggers import RisingEdge
+from cocotb import _py_compat
 
 _XGMII_IDLE      = "\x07"  # noqa
 _XGMII_START     = "\xFB"  # noqa
@@ -80,24 +81,27 @@ class XGMII(Monitor):
     def _get_bytes(self):
         """Take a value and extract the individual bytes and control bits.
 
-        Returns a tuple of lists.
+        Returns a tuple of the list of control bits and the string of bytes.
         """
         value = self.signal.value.integer
-        bytes = []
         ctrls = []
-        byte_shift = 8
         ctrl_base = 8 * self.bytes
         ctrl_inc = 1
         if self.interleaved:
-            byte_shift += 1
             ctrl_base = 8
             ctrl_inc = 9
+            data = 0
+            for i in range(self.bytes):
+                data |= ((value >> (i * 9)) & 0xff) << (i * 8)
+        else:
+            data = value & ((1 << ctrl_base) - 1)
 
         for i in range(self.bytes):
-            bytes.append(chr((value >> (i * byte_shift)) & 0xff))
             ctrls.append(bool(value & (1 << ctrl_base)))
             ctrl_base += ctrl_inc
 
+        bytes = _py_compat.bytes_to_buff(
+            _py_compat.int_to_bytes(data, self.bytes, "little"))
         return ctrls, bytes
 
     def _add_payload(self, ctrl, bytes):
@@ -0,0 +1,179 @@
+# Copyright (c) cocotb contributors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL POTENTIAL VENTURES LTD BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Run a regression in parallel, sharded across several simulator processes.
+
+Run it from the directory of the regression Makefile, any arguments after the
+options are passed on to ``make``::
+
+    python -m cocotb.parallel_regression -j 16 SIM=ghdl
+
+Each shard is a ``make sim`` with its own :make:var:`SIM_BUILD` directory,
+cocotb library build directory, results file and log file in the work
+directory, so that the shards don't build into the same files at the same
+time. Every simulator process
+discovers the tests from :envvar:`MODULE` as usual and only runs its share of
+them, chosen from :envvar:`COCOTB_SHARD_INDEX` and :envvar:`COCOTB_SHARD_COUNT`.
+The shares are balanced using the wall-clock times of the tests in earlier
+runs, which are kept in the ``--times`` file.
+
+All shards use the same :envvar:`RANDOM_SEED`, and their results are merged
+into one results file as the shards finish.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from xml.etree import ElementTree as ET
+
+from cocotb.regression import _load_test_times
+
+
+class _Shard(object):
+    """A simulator process running a share of the tests."""
+
+    def __init__(self, index, count, work_dir, make_cmd, env):
+        self.index = index
+        self.directory = os.path.join(work_dir, "shard%d" % index)
+        self.results_file = os.path.join(self.directory, "results.xml")
+        self.log_file = os.path.join(self.directory, "sim.log")
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        if os.path.exists(self.results_file):
+            os.remove(self.results_file)
+
+        env = dict(env,
+                   COCOTB_SHARD_INDEX=str(index),
+                   COCOTB_SHARD_COUNT=str(count),
+                   COCOTB_RESULTS_FILE=self.results_file,
+                   SIM_BUILD=os.path.join(self.directory, "sim_build"))
+        # BUILD_DIR is set by the cocotb makefiles, so it can only be
+        # overridden on the command line
+        make_cmd = make_cmd + ["BUILD_DIR=%s" % os.path.join(self.directory, "build")]
+        with open(self.log_file, "w") as log:
+            self.process = subprocess.Popen(make_cmd, env=env, stdout=log,
+                                            stderr=subprocess.STDOUT)
+
+
+def _merge_results(combined, filename):
+    """Merge the test suites of the results in *filename* into *combined*."""
+    for suite in ET.parse(filename).getroot().iter("testsuite"):
+        for existing in combined:
+            if (existing.get("name") == suite.get("name") and
+                    existing.get("package") == suite.get("package")):
+                # The shards share the test suite properties
+                existing.extend(e for e in suite if e.tag != "property")
+                break
+        else:
+            combined.append(suite)
+
+
+def _test_times(combined):
+    """Return the wall-clock times of the tests that ran in *combined*."""
+    times = {}
+    for testcase in combined.iter("testcase"):
+        if testcase.find("skipped") is None:
+            name = "%s.%s" % (testcase.get("classname"), testcase.get("name"))
+            times[name] = float(testcase.get("time"))
+    return times
+
+
+def get_parser():
+    """Return the cmdline parser"""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-j", "--jobs", type=int, default=multiprocessing.cpu_count(),
+                        help="Number of simulator processes to run (default: %(default)s)")
+    parser.add_argument("--output", default=os.getenv("COCOTB_RESULTS_FILE", "results.xml"),
+                        help="Name of the combined results file (default: %(default)s)")
+    parser.add_argument("--times", default="test_times.json",
+                        help="File keeping the test times used to balance the shards "
+                             "(default: %(default)s)")
+    parser.add_argument("--work-dir", default="sim_build_shards",
+                        help="Directory for the build, results and log of each shard "
+                             "(default: %(default)s)")
+    parser.add_argument("--make", default="make",
+                        help="Make command to run (default: %(default)s)")
+    parser.add_argument("make_args", nargs=argparse.REMAINDER,
+                        help="Arguments passed on to make")
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    jobs = max(args.jobs, 1)
+    work_dir = os.path.abspath(args.work_dir)
+    times_file = os.path.abspath(args.times)
+
+    seed = os.getenv("RANDOM_SEED")
+    if seed is None:
+        seed = str(int(time.time()))
+    print("Running %d shards with RANDOM_SEED=%s" % (jobs, seed))
+
+    env = dict(os.environ, RANDOM_SEED=seed, COCOTB_TEST_TIMES=times_file)
+    make_cmd = [args.make, "sim"] + args.make_args
+    shards = [_Shard(i, jobs, work_dir, make_cmd, env) for i in range(jobs)]
+
+    combined = ET.Element("testsuites", name="results")
+    rc = 0
+    running = list(shards)
+    while running:
+        time.sleep(0.1)
+        for shard in [s for s in running if s.process.poll() is not None]:
+            running.remove(shard)
+            if shard.process.returncode != 0 or not os.path.exists(shard.results_file):
+                print("Shard %d failed, see %s" % (shard.index, shard.log_file))
+                rc = 1
+                continue
+            _merge_results(combined, shard.results_file)
+            ET.ElementTree(combined).write(args.output, encoding="UTF-8")
+            print("Shard %d finished, %d shards running" % (shard.index, len(running)))
+
+    ET.ElementTree(combined).write(args.output, encoding="UTF-8")
+
+    failures = [testcase for testcase in combined.iter("testcase")
+                if testcase.find("failure") is not None]
+    for testcase in failures:
+        print("Failure in %s.%s" % (testcase.get("classname"), testcase.get("name")))
+        rc = 1
+    print("Ran %d tests, %d failed" % (len(combined.findall(".//testcase")), len(failures)))
+
+    test_times = _load_test_times(times_file)
+    test_times.update(_test_times(combined))
+    with open(times_file, "w") as f:
+        json.dump(test_times, f, indent=2, sort_keys=True)
+
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
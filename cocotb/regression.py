@@ -29,6 +29,7 @@
 
 import time
 import inspect
+import json
 from itertools import product
 import sys
 import os
@@ -52,6 +53,7 @@ if "COVERAGE" in os.environ:
 
 import cocotb
 import cocotb.ANSI as ANSI
+from cocotb.hierarchy_index import HierarchyIndex
 from cocotb.log import SimLog
 from cocotb.result import TestSuccess, SimFailure
 from cocotb.utils import get_sim_time, remove_traceback_frames
@@ -67,10 +69,53 @@ def _my_import(name):
     return mod
 
 
+def _load_test_times(filename):
+    """Load the wall-clock times of earlier test runs, see :func:`_shard_tests`.
+
+    Returns an empty dictionary if *filename* doesn't exist.
+    """
+    try:
+        with open(filename) as f:
+            return json.load(f)
+    except IOError:
+        return {}
+
+
+def _shard_tests(tests, index, count, test_times=None):
+    """Return the tests of *tests* that shard *index* of *count* should run.
+
+    The tests are handed out longest first, each to the shard with the least
+    work so far. The duration of a test is its time in *test_times*, a
+    dictionary mapping ``module.test`` names to seconds, or the average time of
+    the known tests if it has none. Every shard computes the same assignment
+    from the same tests and times, so the shards run each test exactly once.
+    """
+    test_times = test_times or {}
+
+    def name(test):
+        return "%s.%s" % (test.module, test.funcname)
+
+    known = [test_times[name(test)] for test in tests if name(test) in test_times]
+    default = sum(known) / len(known) if known else 1.0
+
+    def duration(test):
+        return test_times.get(name(test), default)
+
+    loads = [0.0] * count
+    selected = set()
+    for test in sorted(tests, key=lambda test: (-duration(test), test.sort_name())):
+        shard = min(range(count), key=lambda i: (loads[i], i))
+        loads[shard] += duration(test)
+        if shard == index:
+            selected.add(test)
+    return [test for test in tests if test in selected]
+
+
 class RegressionManager(object):
     """Encapsulates all regression capability into a single place"""
 
-    def __init__(self, root_name, modules, tests=None, seed=None, hooks=[]):
+    def __init__(self, root_name, modules, tests=None, seed=None, hooks=[],
+                 shard=None, test_times=None):
         """
         Args:
             root_name (str): The name of the root handle.
@@ -81,6 +126,11 @@ class RegressionManager(object):
                 Defaults to ``None``.
             hooks (list, optional): A list of hook modules to import.
                 Defaults to the empty list.
+            shard (tuple, optional): The index of this shard and the number
+                of shards, to only run a share of the tests.
+                Defaults to ``None``, meaning all tests will be run.
+            test_times (dict, optional): Wall-clock times of earlier test
+                runs used to balance the shards, see :func:`_shard_tests`.
         """
         self._queue = []
         self._root_name = root_name
@@ -92,6 +142,8 @@ class RegressionManager(object):
         self.log = SimLog("cocotb.regression")
         self._seed = seed
         self._hooks = hooks
+        self._shard = shard
+        self._test_times = test_times
 
     def initialise(self):
 
@@ -127,6 +179,11 @@ class RegressionManager(object):
             raise AttributeError("Can not find Root Handle (%s)" %
                                  self._root_name)
 
+        index_file = os.getenv('COCOTB_HIERARCHY_INDEX')
+        if index_file:
+            cocotb.handle._hierarchy_index = HierarchyIndex.for_design(
+                index_file, cocotb.SIM_NAME, cocotb.SIM_VERSION, self._dut._name)
+
         # Auto discovery
         for module_name in self._modules:
             try:
@@ -168,7 +225,10 @@ class RegressionManager(object):
                         self.log.warning("Failed to initialize test %s" %
                                          thing.name, exc_info=True)
 
-                    if skip:
+                    if skip and self._shard is not None and self._shard[0] != 0:
+                        # Only the first shard reports the skipped tests
+                        continue
+                    elif skip:
                         self.log.info("Skipping test %s" % thing.name)
                         self.xunit.add_testcase(name=thing.name,
                                                 classname=module_name,
@@ -184,6 +244,12 @@ class RegressionManager(object):
 
         self._queue.sort(key=lambda test: test.sort_name())
 
+        if self._shard is not None:
+            index, count = self._shard
+            self._queue = _shard_tests(self._queue, index, count, self._test_times)
+            self.ntests = len(self._queue)
+            self.log.info("Running shard %d of %d" % (index + 1, count))
+
         for valid_tests in self._queue:
             self.log.info("Found test %s.%s" %
                           (valid_tests.module,
@@ -219,7 +285,10 @@ class RegressionManager(object):
         if len(self.test_results) > 0:
             self._log_test_summary()
         self._log_sim_summary()
+        if cocotb.handle._hierarchy_index is not None:
+            cocotb.handle._hierarchy_index.save()
         self.log.info("Shutting down...")
+        cocotb.scheduler.shutdown_processes()
         self.xunit.write()
         simulator.stop_simulator()
 
@@ -403,6 +472,7 @@ class RegressionManager(object):
         real_time   = time.time() - self.start_time
         sim_time_ns = get_sim_time('ns')
         ratio_time  = self._safe_divide(sim_time_ns, real_time)
+        registered, shared = simulator.get_value_change_stats()
 
         summary = ""
 
@@ -412,6 +482,7 @@ class RegressionManager(object):
         summary += "**                               SIM TIME : {0:<39}**\n".format('{0:.2f} NS'.format(sim_time_ns))
         summary += "**                              REAL TIME : {0:<39}**\n".format('{0:.2f} S'.format(real_time))
         summary += "**                        SIM / REAL TIME : {0:<39}**\n".format('{0:.2f} NS/S'.format(ratio_time))
+        summary += "**                 VALUE CHANGE CALLBACKS : {0:<39}**\n".format('{0} registered, {1} shared'.format(registered, shared))
         summary += "*************************************************************************************\n"
 
         self.log.info(summary)
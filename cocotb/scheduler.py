@@ -40,6 +40,12 @@ import sys
 import logging
 import threading
 
+try:
+    import queue
+except ImportError:
+    # Python 2
+    import Queue as queue
+
 # Debug mode controlled by environment variables
 if "COCOTB_ENABLE_PROFILING" in os.environ:
     import cProfile
@@ -57,12 +63,18 @@ else:
     _debug = False
 
 
+if "COCOTB_SIM" in os.environ:
+    import simulator
+else:
+    simulator = None
+
 import cocotb
 import cocotb.decorators
 from cocotb.triggers import (Trigger, GPITrigger, Timer, ReadOnly,
                              NextTimeStep, ReadWrite, Event, Join, NullTrigger)
 from cocotb.log import SimLog
 from cocotb.result import TestComplete, ReturnValue
+from cocotb.utils import lazy_property
 from cocotb import _py_compat
 
 # On python 3.7 onwards, `dict` is guaranteed to preserve insertion order.
@@ -99,18 +111,39 @@ class external_state(object):
 @cocotb.decorators.public
 class external_waiter(object):
 
-    def __init__(self):
+    def __init__(self, pool=None):
         self._outcome = None
         self.thread = None
         self.event = Event()
         self.state = external_state.INIT
         self.cond = threading.Condition()
-        self._log = SimLog("cocotb.external.thead.%s" % self.thread, id(self))
+        self.pool = pool
+        self._call = None
+
+    @lazy_property
+    def _log(self):
+        return SimLog("cocotb.external.thead.%s" % self.thread, id(self))
 
     @property
     def result(self):
         return self._outcome.get()
 
+    def _reset(self):
+        """Make the waiter ready to be used for another call."""
+        self._outcome = None
+        self.thread = None
+        self.event.clear()
+        self.state = external_state.INIT
+        self._call = None
+
+    def _run(self):
+        """Run the call in the current thread, which is a worker of the pool."""
+        self.thread = threading.current_thread()
+        func, args, kwargs = self._call
+        self._outcome = outcomes.capture(func, *args, **kwargs)
+        if _debug:
+            self._log.debug("Execution of external routine done %s" % threading.current_thread())
+
     def _propagate_state(self, new_state):
         with self.cond:
             if _debug:
@@ -130,9 +163,8 @@ class external_waiter(object):
         if self.state > external_state.INIT:
             return
 
-        if not self.thread.is_alive():
-            self._propagate_state(external_state.RUNNING)
-            self.thread.start()
+        self._propagate_state(external_state.RUNNING)
+        self.pool.submit(self)
 
     def thread_resume(self):
         self._propagate_state(external_state.RUNNING)
@@ -158,6 +190,85 @@ class external_waiter(object):
 
         return self.state
 
+class _ExternalThreadPool(object):
+    """Worker threads running the functions of :class:`~cocotb.external`,
+    and the :class:`external_waiter` objects used to hand them over.
+
+    Threads are started as they are needed, and up to *size* of them are
+    kept waiting for the next call once they are done. Another thread is
+    started whenever all of them are busy, as an external function that
+    calls a :class:`~cocotb.function` holds on to its thread until the
+    function returns.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._calls = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = 0
+        self._n_threads = 0
+        # only used from the main thread
+        self._free_waiters = []
+
+    def waiter(self, func, args, kwargs):
+        """Return an :class:`external_waiter` for a call of *func*."""
+        if self._free_waiters:
+            waiter = self._free_waiters.pop()
+        else:
+            waiter = external_waiter(self)
+        waiter._call = (func, args, kwargs)
+        return waiter
+
+    def release(self, waiter):
+        """Return a waiter whose call has completed to the pool."""
+        waiter._reset()
+        self._free_waiters.append(waiter)
+
+    def submit(self, waiter):
+        """Run the call of *waiter* on a worker thread."""
+        new_thread = None
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            else:
+                self._n_threads += 1
+                new_thread = "cocotb_external_%d" % self._n_threads
+        if new_thread is not None:
+            thread = threading.Thread(target=self._worker, name=new_thread)
+            # idle workers must not keep the simulator from exiting
+            thread.daemon = True
+            thread.start()
+        self._calls.put(waiter)
+
+    def _worker(self):
+        while True:
+            waiter = self._calls.get()
+            waiter._run()
+            # become idle before the main thread carries on, so that the
+            # next call can be run on this thread
+            with self._lock:
+                retire = self._idle >= self.size
+                if not retire:
+                    self._idle += 1
+            waiter.thread_done()
+            if retire:
+                return
+
+
+class _TriggerSet(object):
+    """The triggers a coroutine is waiting on after yielding a list of them,
+    a :class:`~cocotb.triggers.First` or a :class:`~cocotb.triggers.Combine`.
+
+    For ``Combine``, *combine* is set and the triggers that have already fired
+    are removed from *triggers*.
+    """
+    __slots__ = ('triggers', 'combine')
+
+    def __init__(self, triggers, combine=None):
+        self.triggers = triggers
+        self.combine = combine
+
+
 class Scheduler(object):
     """The main scheduler.
 
@@ -225,7 +336,9 @@ class Scheduler(object):
         # Use OrderedDict here for deterministic behavior (gh-934)
 
         # A dictionary of pending coroutines for each trigger,
-        # indexed by trigger
+        # indexed by trigger. Each value is itself an ordered dictionary used
+        # as an ordered set (all values are None), so that coroutines can be
+        # added and removed in constant time.
         self._trigger2coros = _ordered_dict()
 
         # A dictionary mapping coroutines to the trigger they are waiting for
@@ -237,10 +350,10 @@ class Scheduler(object):
         # A dictionary of pending writes
         self._writes = _ordered_dict()
 
-        self._pending_coros = []
-        self._pending_triggers = []
+        self._pending_coros = collections.deque()
+        self._pending_triggers = collections.deque()
         self._pending_threads = []
-        self._pending_events = []   # Events we need to call set on once we've unwound
+        self._pending_events = collections.deque()   # Events we need to call set on once we've unwound
 
         self._terminate = False
         self._test = None
@@ -248,9 +361,26 @@ class Scheduler(object):
 
         self._is_reacting = False
 
+        # The coroutine being advanced by `schedule`
+        self._current_coro = None
+
         self._write_coro_inst = None
         self._writes_pending = Event()
 
+        # Worker threads for cocotb.external
+        self._external_pool = _ExternalThreadPool(
+            int(os.getenv("COCOTB_EXTERNAL_THREADS", "4")))
+
+        # Worker processes for cocotb.external_process, started on first use
+        self._process_pool = None
+        # Calls running in the worker processes, with the Event to set once
+        # they complete
+        self._pending_processes = []
+
+        # Triggers reuse their callback record while they are primed with
+        # the same callback, so always pass the same bound method
+        self._react = self.react
+
     @cocotb.decorators.coroutine
     def _do_writes(self):
         """ An internal coroutine that performs pending writes """
@@ -261,10 +391,14 @@ class Scheduler(object):
 
             yield self._read_write
 
-            while self._writes:
-                handle, value = self._writes.popitem()
-                handle.setimmediatevalue(value)
+            # Classify all the writes first, then hand them to the simulator
+            # in one go. They are applied most recent first, as before.
+            writes, self._writes = self._writes, _ordered_dict()
             self._writes_pending.clear()
+            simulator.set_signal_vals([
+                (handle._handle,) + handle._prepare_write(value)
+                for handle, value in reversed(list(writes.items()))
+            ])
 
     def _check_termination(self):
         """
@@ -287,6 +421,9 @@ class Scheduler(object):
             self._timer1.prime(self._test_completed)
             self._trigger2coros = _ordered_dict()
             self._coro2trigger = _ordered_dict()
+            for future, event in self._pending_processes:
+                future.cancel()
+            self._pending_processes = []
             self._terminate = False
             self._writes = _ordered_dict()
             self._writes_pending.clear()
@@ -390,8 +527,12 @@ class Scheduler(object):
             # work through triggers one by one
             is_first = True
             self._pending_triggers.append(trigger)
+
+            # wake up coroutines whose calls to a worker process completed
+            if self._pending_processes and self._mode == Scheduler._MODE_NORMAL:
+                self._collect_processes()
             while self._pending_triggers:
-                trigger = self._pending_triggers.pop(0)
+                trigger = self._pending_triggers.popleft()
 
                 if not is_first and isinstance(trigger, GPITrigger):
                     self.log.warning(
@@ -440,9 +581,17 @@ class Scheduler(object):
                 trigger.unprime()
 
                 for coro in scheduling:
+                    waiting = self._coro2trigger.pop(coro, trigger)
+                    if waiting is not trigger:
+                        # the coroutine is waiting on more than one trigger
+                        fired = self._trigger_set_fired(coro, waiting, trigger)
+                        if fired is None:
+                            continue
+                    else:
+                        fired = trigger
                     if _debug:
                         self.log.debug("Scheduling coroutine %s" % (coro.__name__))
-                    self.schedule(coro, trigger=trigger)
+                    self.schedule(coro, trigger=fired)
                     if _debug:
                         self.log.debug("Scheduled coroutine %s" % (coro.__name__))
 
@@ -451,7 +600,7 @@ class Scheduler(object):
                     if _debug:
                         self.log.debug("Scheduling pending event %s" %
                                        (str(self._pending_events[0])))
-                    self._pending_events.pop(0).set()
+                    self._pending_events.popleft().set()
 
                 # remove our reference to the objects at the end of each loop,
                 # to try and avoid them being destroyed at a weird time (as
@@ -467,24 +616,46 @@ class Scheduler(object):
                                " to simulator")
 
 
-    def unschedule(self, coro):
-        """Unschedule a coroutine.  Unprime any pending triggers"""
-
-        # Unprime the trigger this coroutine is waiting on
+    def _remove_from_triggers(self, coro):
+        """Remove a scheduled coroutine from the triggers it is waiting on."""
         try:
             trigger = self._coro2trigger.pop(coro)
         except KeyError:
             # coroutine probably finished
             pass
         else:
-            if coro in self._trigger2coros.setdefault(trigger, []):
-                self._trigger2coros[trigger].remove(coro)
-            if not self._trigger2coros[trigger]:
-                trigger.unprime()
-                del self._trigger2coros[trigger]
+            if isinstance(trigger, _TriggerSet):
+                for t in trigger.triggers:
+                    self._remove_waiter(coro, t)
+            else:
+                self._remove_waiter(coro, trigger)
+
+    def unschedule(self, coro):
+        """Unschedule a coroutine.  Unprime any pending triggers"""
+
+        # Unprime the triggers this coroutine is waiting on
+        self._remove_from_triggers(coro)
 
         assert self._test is not None
 
+        if coro._inline is not None and coro is not self._current_coro:
+            # Killed while awaiting coroutines running within it, kill them
+            # too. If it is running, this is done by schedule() once it
+            # yields.
+            self._unwind_inline(coro)
+
+        host = coro._host
+        if (host is not None and not host._finished and
+                host is not self._current_coro):
+            # The coroutine is running within the coroutine that awaited it,
+            # wake that one up to unwind it
+            if _debug:
+                self.log.debug("Unwinding {} from {}".format(coro, host))
+            self._remove_from_triggers(host)
+            kill_trigger = NullTrigger(
+                outcome=outcomes.Error(cocotb.decorators._CoroutineKilled(coro)))
+            self._coroutine_yielded(host, kill_trigger)
+
         if coro is self._test:
             if _debug:
                 self.log.debug("Unscheduling test {}".format(coro))
@@ -509,6 +680,28 @@ class Scheduler(object):
                 outcome = outcomes.Error(e).without_frames(['unschedule', 'get'])
                 self._test._force_outcome(outcome)
 
+    def _unwind_inline(self, coro):
+        """Unwind the coroutines running within *coro*, which was killed."""
+        if _debug:
+            self.log.debug("Unwinding {} from {}".format(coro._inline, coro))
+        try:
+            coro._coro.throw(cocotb.decorators._CoroutineKilled(coro))
+        except BaseException:
+            # the killed coroutine doesn't report errors
+            pass
+
+    def _inline_completed(self, coro):
+        """Called when a coroutine run within the coroutine that awaited it
+        completes, to wake up anything joining it.
+
+        Unlike :meth:`unschedule`, errors are not reported here, they are
+        raised in the awaiting coroutine.
+        """
+        # nothing can be waiting on a Join that doesn't exist
+        join = Join._existing_instance(coro)
+        if join is not None and join in self._trigger2coros:
+            self.react(join)
+
     def save_write(self, handle, value):
         if self._mode == Scheduler._MODE_READONLY:
             raise Exception("Write to object {0} was scheduled during a read-only sync phase.".format(handle._name))
@@ -522,29 +715,64 @@ class Scheduler(object):
         self._writes[handle] = value
         self._writes_pending.set()
 
+    def _remove_waiter(self, coro, trigger):
+        """Stop *coro* waiting on *trigger*, unpriming it if nothing else is."""
+        trigger_coros = self._trigger2coros.get(trigger)
+        if trigger_coros is None:
+            return
+        trigger_coros.pop(coro, None)
+        if not trigger_coros:
+            trigger.unprime()
+            del self._trigger2coros[trigger]
+
+    def _trigger_set_fired(self, coro, waiting, trigger):
+        """Called when *trigger*, one of the set *coro* is waiting on, fires.
+
+        Returns the object whose ``_outcome`` *coro* should be resumed with,
+        or ``None`` if it is a ``Combine`` still waiting on other triggers.
+        """
+        if waiting.combine is not None:
+            remaining = [t for t in waiting.triggers if t is not trigger]
+            if remaining and not isinstance(trigger._outcome, outcomes.Error):
+                waiting.triggers = remaining
+                self._coro2trigger[coro] = waiting
+                return None
+            fired = trigger if remaining else waiting.combine
+        else:
+            fired = trigger
+
+        for t in waiting.triggers:
+            if t is not trigger:
+                self._remove_waiter(coro, t)
+        return fired
+
     def _coroutine_yielded(self, coro, trigger):
         """Prime the trigger and update our internal mappings."""
         self._coro2trigger[coro] = trigger
 
-        trigger_coros = self._trigger2coros.setdefault(trigger, [])
-        if coro is self._write_coro_inst:
+        trigger_coros = self._trigger2coros.setdefault(trigger, _ordered_dict())
+        if coro is self._write_coro_inst and trigger_coros:
             # Our internal write coroutine always runs before any user coroutines.
             # This preserves the behavior prior to the refactoring of writes to
-            # this coroutine.
-            trigger_coros.insert(0, coro)
+            # this coroutine. This is the only case where we need to rebuild
+            # the collection, and there is only ever one write coroutine.
+            new_coros = _ordered_dict()
+            new_coros[coro] = None
+            new_coros.update(trigger_coros)
+            self._trigger2coros[trigger] = trigger_coros = new_coros
         else:
             # Everything else joins the back of the queue
-            trigger_coros.append(coro)
+            trigger_coros[coro] = None
 
         if not trigger.primed:
 
-            if trigger_coros != [coro]:
+            if len(trigger_coros) != 1:
                 # should never happen
                 raise InternalError(
                     "More than one coroutine waiting on an unprimed trigger")
 
             try:
-                trigger.prime(self.react)
+                trigger.prime(self._react)
             except Exception as e:
                 # discard the trigger we associated, it will never fire
                 self._trigger2coros.pop(trigger)
@@ -552,10 +780,37 @@ class Scheduler(object):
                 # replace it with a new trigger that throws back the exception
                 error_trigger = NullTrigger(outcome=outcomes.Error(e))
                 self._coro2trigger[coro] = error_trigger
-                self._trigger2coros[error_trigger] = [coro]
+                self._trigger2coros[error_trigger] = _ordered_dict([(coro, None)])
 
                 # wake up the coroutines
-                error_trigger.prime(self.react)
+                error_trigger.prime(self._react)
+
+    def _coroutine_yielded_set(self, coro, waiting):
+        """Prime all the triggers of *waiting* and update our internal mappings.
+
+        The coroutine is added to the waiters of every trigger before any of
+        them is primed, as a trigger may fire as soon as it is primed.
+        """
+        self._coro2trigger[coro] = waiting
+        for trigger in waiting.triggers:
+            self._trigger2coros.setdefault(trigger, _ordered_dict())[coro] = None
+
+        for trigger in waiting.triggers:
+            if self._coro2trigger.get(coro) is not waiting:
+                # one of the triggers has fired already
+                return
+            if trigger.primed or trigger not in self._trigger2coros:
+                continue
+            try:
+                trigger.prime(self._react)
+            except Exception as e:
+                for t in waiting.triggers:
+                    self._remove_waiter(coro, t)
+
+                # resume the coroutine with the exception instead
+                error_trigger = NullTrigger(outcome=outcomes.Error(e))
+                self._coroutine_yielded(coro, error_trigger)
+                return
 
     def queue(self, coroutine):
         """Queue a coroutine for execution"""
@@ -599,35 +854,90 @@ class Scheduler(object):
         """Run the coroutine in a separate execution thread
         and return a yieldable object for the caller.
         """
-        # Create a thread
-        # Create a trigger that is called as a result of the thread finishing
-        # Create an Event object that the caller can yield on
-        # Event object set when the thread finishes execution, this blocks the
-        #   calling coroutine (but not the thread) until the external completes
-
-        def execute_external(func, _waiter):
-            _waiter._outcome = outcomes.capture(func, *args, **kwargs)
-            if _debug:
-                self.log.debug("Execution of external routine done %s" % threading.current_thread())
-            _waiter.thread_done()
+        # Take a waiter from the pool, it runs the call on a worker thread
+        # once the scheduler starts it
+        # The Event of the waiter is set when the call finishes, this blocks
+        #   the calling coroutine (but not the thread) until the external
+        #   completes
 
         @cocotb.coroutine
         def wrapper():
-            waiter = external_waiter()
-            thread = threading.Thread(group=None, target=execute_external,
-                                      name=func.__name__ + "_thread",
-                                      args=([func, waiter]), kwargs={})
-
-            waiter.thread = thread
+            waiter = self._external_pool.waiter(func, args, kwargs)
             self._pending_threads.append(waiter)
 
             yield waiter.event.wait()
 
-            ret = waiter.result  # raises if there was an exception
+            outcome = waiter._outcome
+            self._external_pool.release(waiter)
+            ret = outcome.get()  # raises if there was an exception
+            raise ReturnValue(ret)
+
+        return wrapper()
+
+    def run_in_process(self, func, *args, **kwargs):
+        """Run *func* in a worker process and return a yieldable object for
+        the caller.
+
+        *func* and its arguments and return value must be picklable. The
+        simulation is not blocked while it runs, the caller is resumed once
+        the scheduler finds that the call has completed.
+        """
+        @cocotb.coroutine
+        def wrapper():
+            future = self._get_process_pool().submit(func, *args, **kwargs)
+            event = Event()
+            self._pending_processes.append((future, event))
+
+            yield event.wait()
+
+            ret = future.result()  # raises if there was an exception
             raise ReturnValue(ret)
 
         return wrapper()
 
+    def _get_process_pool(self):
+        if self._process_pool is None:
+            # Not available on Python 2 without the `futures` backport
+            import concurrent.futures
+            import multiprocessing
+            # Workers started any other way import the test module, and
+            # with it cocotb and the simulator module, which only exists
+            # within the simulator
+            if "fork" not in multiprocessing.get_all_start_methods():
+                raise RuntimeError(
+                    "cocotb.external_process needs to fork worker processes, "
+                    "which is not supported on this platform")
+            kwargs = {}
+            if sys.version_info >= (3, 7):
+                kwargs["mp_context"] = multiprocessing.get_context("fork")
+            # else the pool always forks where it can
+
+            max_workers = os.getenv("COCOTB_EXTERNAL_PROCESSES")
+            if max_workers is not None:
+                max_workers = int(max_workers)
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers, **kwargs)
+        return self._process_pool
+
+    def _collect_processes(self):
+        """Set the events of the calls to worker processes that completed."""
+        pending = []
+        done = []
+        for future, event in self._pending_processes:
+            if future.done():
+                done.append(event)
+            else:
+                pending.append((future, event))
+        self._pending_processes = pending
+        for event in done:
+            event.set()
+
+    def shutdown_processes(self):
+        """Stop the worker processes of :class:`~cocotb.external_process`."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+
     def add(self, coroutine):
         """Add a new coroutine.
 
@@ -665,7 +975,7 @@ class Scheduler(object):
         return self.add(test_coro)
 
     # This collection of functions parses a trigger out of the object
-    # that was yielded by a coroutine, converting `list` -> `Waitable`,
+    # that was yielded by a coroutine, converting `list` -> `_TriggerSet`,
     # `Waitable` -> `RunningCoroutine`, `RunningCoroutine` -> `Trigger`.
     # Doing them as separate functions allows us to avoid repeating unencessary
     # `isinstance` checks.
@@ -689,12 +999,31 @@ class Scheduler(object):
         # type: (cocotb.triggers.Waitable) -> Trigger
         return self._trigger_from_unstarted_coro(result._wait())
 
-    def _trigger_from_list(self, result):
-        # type: (list) -> Trigger
-        return self._trigger_from_waitable(cocotb.triggers.First(*result))
+    def _trigger_set_from_list(self, result, combine=None):
+        # type: (list) -> _TriggerSet
+        triggers = []
+        for t in result:
+            if isinstance(t, Trigger):
+                triggers.append(t)
+            elif isinstance(t, cocotb.decorators.RunningCoroutine):
+                if not t.has_started():
+                    triggers.append(self._trigger_from_unstarted_coro(t))
+                else:
+                    triggers.append(self._trigger_from_started_coro(t))
+            else:
+                # nested `First` and `Combine` get a coroutine of their own
+                triggers.append(self._trigger_from_waitable(t))
+        return _TriggerSet(triggers, combine)
+
+    def _trigger_set_from_aggregate(self, result):
+        # type: (cocotb.triggers._AggregateWaitable) -> _TriggerSet
+        if isinstance(result, cocotb.triggers.Combine):
+            return self._trigger_set_from_list(result.triggers, result)
+        return self._trigger_set_from_list(result.triggers)
 
     def _trigger_from_any(self, result):
-        """Convert a yielded object into a Trigger instance"""
+        """Convert a yielded object into a Trigger instance, or a
+        :class:`_TriggerSet` if it waits on more than one trigger"""
         # note: the order of these can significantly impact performance
 
         if isinstance(result, Trigger):
@@ -707,7 +1036,11 @@ class Scheduler(object):
                 return self._trigger_from_started_coro(result)
 
         if isinstance(result, list):
-            return self._trigger_from_list(result)
+            cocotb.triggers._check_triggers(result)
+            return self._trigger_set_from_list(result)
+
+        if isinstance(result, cocotb.triggers._AggregateWaitable):
+            return self._trigger_set_from_aggregate(result)
 
         if isinstance(result, cocotb.triggers.Waitable):
             return self._trigger_from_waitable(result)
@@ -735,6 +1068,8 @@ class Scheduler(object):
             self.log.debug("Scheduling with {}".format(send_outcome))
 
         coro_completed = False
+        # scheduling a coroutine can fork and so schedule others
+        prev_coro, self._current_coro = self._current_coro, coroutine
         try:
             result = coroutine._advance(send_outcome)
             if _debug:
@@ -747,6 +1082,8 @@ class Scheduler(object):
                     coroutine, coroutine._outcome
                 ))
             coro_completed = True
+        finally:
+            self._current_coro = prev_coro
 
         # this can't go in the else above, as that causes unwanted exception
         # chaining
@@ -754,6 +1091,11 @@ class Scheduler(object):
             self.unschedule(coroutine)
             return
 
+        if coroutine._outcome is not None and coroutine._inline is not None:
+            # killed by a coroutine running within it
+            self._unwind_inline(coroutine)
+            return
+
         # Don't handle the result if we're shutting down
         if self._terminate:
             return
@@ -765,7 +1107,10 @@ class Scheduler(object):
             # it wasn't allowed to yield that
             result = NullTrigger(outcome=outcomes.Error(exc))
 
-        self._coroutine_yielded(coroutine, result)
+        if result.__class__ is _TriggerSet:
+            self._coroutine_yielded_set(coroutine, result)
+        else:
+            self._coroutine_yielded(coroutine, result)
 
         # We do not return from here until pending threads have completed, but only
         # from the main thread, this seems like it could be problematic in cases
@@ -786,7 +1131,7 @@ class Scheduler(object):
 
         # Handle any newly queued coroutines that need to be scheduled
         while self._pending_coros:
-            self.add(self._pending_coros.pop(0))
+            self.add(self._pending_coros.popleft())
 
     def finish_test(self, exc):
         self._test.abort(exc)
@@ -814,7 +1159,7 @@ class Scheduler(object):
         # reversing seems to fix gh-928, although the order is still somewhat
         # arbitrary.
         for trigger, waiting in items[::-1]:
-            for coro in waiting:
+            for coro in list(waiting):
                 if _debug:
                     self.log.debug("Killing %s" % str(coro))
                 coro.kill()
@@ -29,14 +29,74 @@
 
 """Common scoreboarding capability."""
 
+import collections
+import itertools
+import json
 import logging
 
-from cocotb.utils import hexdump, hexdiffs
+import cocotb
+from cocotb.triggers import Event
+from cocotb.utils import hexdump, hexdiffs, get_sim_time
 from cocotb.log import SimLog
 from cocotb.monitors import Monitor
 from cocotb.result import TestFailure, TestSuccess
 
 
+class _LazyFormat(object):
+    """Call *func* with *args* only when converted to a string, so that
+    arguments of log records which aren't emitted aren't formatted."""
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return self.func(*self.args)
+
+
+def _hexdump_str(transaction):
+    return hexdump(str(transaction))
+
+
+def _hexdiffs_str(exp, got):
+    return hexdiffs(str(exp), str(got))
+
+
+def _mismatch_json(mismatch):
+    record = mismatch._asdict()
+    record["got"] = repr(mismatch.got)
+    record["exp"] = repr(mismatch.exp)
+    return json.dumps(record) + "\n"
+
+
+def _format_words(transaction):
+    words = []
+    try:
+        for word in transaction:
+            words.append(str(word))
+    except Exception:
+        pass
+    return "\n".join(words)
+
+
+class Mismatch(collections.namedtuple("Mismatch",
+                                      "interface time reason got exp")):
+    """Record of a transaction which failed the checks of a
+    :class:`Scoreboard`.
+
+    Attributes:
+        interface (str): Name of the logger of the interface.
+        time (int): Simulation time in simulator time steps.
+        reason (str): ``"type"``, ``"value"`` or ``"unexpected"``.
+        got: The received transaction.
+        exp: The expected transaction, or ``None`` if none was expected.
+
+    .. versionadded:: 1.3
+    """
+    __slots__ = ()
+
+
 class Scoreboard(object):
     """Generic scoreboarding class.
 
@@ -57,14 +117,55 @@ class Scoreboard(object):
         fail_immediately (bool, optional): Raise :any:`TestFailure`
             immediately when something is wrong instead of just
             recording an error. Default is ``True``.
+        streaming (bool, optional): Queue the transactions received by the
+            monitors and check them in batches from a coroutine of the
+            scoreboard, instead of in the callback of the monitor.
+            Transactions are still checked in the order they were received.
+            Default is ``False``.
+        max_pending (int, optional): In streaming mode, the number of
+            transactions that can be queued. When the queue is full, the
+            callback of the monitor checks the queued transactions itself.
+            Default is ``1024``.
+        max_reports (int, optional): The number of mismatches logged in
+            detail for each interface. Further mismatches are only counted
+            and recorded. ``None`` logs all of them. Default is ``20``.
+        max_mismatches (int, optional): The number of mismatches kept in
+            :attr:`mismatches`. Further mismatches are only counted.
+            ``None`` keeps all of them. Default is ``1000``.
+        mismatch_file (str, optional): Write every mismatch to this file as
+            it happens, in the format of :meth:`write_mismatches`.
+
+    Attributes:
+        mismatches (list): A :class:`Mismatch` for the first
+            *max_mismatches* transactions which failed the checks, see
+            :meth:`write_mismatches`.
+
+    .. versionchanged:: 1.3
+        Added the *streaming*, *max_pending*, *max_reports*,
+        *max_mismatches* and *mismatch_file* arguments.
     """
     
-    def __init__(self, dut, reorder_depth=0, fail_immediately=True):  # FIXME: reorder_depth needed here?
+    def __init__(self, dut, reorder_depth=0, fail_immediately=True,  # FIXME: reorder_depth needed here?
+                 streaming=False, max_pending=1024, max_reports=20,
+                 max_mismatches=1000, mismatch_file=None):
         self.dut = dut
         self.log = SimLog("cocotb.scoreboard.%s" % self.dut._name)
         self.errors = 0
         self.expected = {}
         self._imm = fail_immediately
+        self._streaming = streaming
+        self._max_pending = max_pending
+        self._pending = collections.deque()
+        self._pending_event = Event()
+        self._drain_coro = None
+        self.max_reports = max_reports
+        self.max_mismatches = max_mismatches
+        self.mismatches = []
+        self._mismatch_counts = {}
+        self.mismatch_file = mismatch_file
+        self._mismatch_stream = None
+        if mismatch_file is not None:
+            self._mismatch_stream = open(mismatch_file, "w")
 
     @property
     def result(self):
@@ -74,6 +175,18 @@ class Scoreboard(object):
             :any:`TestFailure`: If not all expected output was received or 
             error were recorded during the test.
         """
+        # Check all the queued transactions and report on all of them,
+        # even if failing immediately
+        fail_immediately, self._imm = self._imm, False
+        try:
+            while self._pending:
+                try:
+                    self.flush()
+                except TestFailure:
+                    # Raised by a compare_fn
+                    self.errors += 1
+        finally:
+            self._imm = fail_immediately
         fail = False
         for monitor, expected_output in self.expected.items():
             if callable(expected_output):
@@ -85,19 +198,107 @@ class Scoreboard(object):
                 self.log.warn("Still expecting %d transactions on %s" %
                               (len(expected_output), str(monitor)))
                 for index, transaction in enumerate(expected_output):
-                    self.log.info("Expecting %d:\n%s" %
-                                  (index, hexdump(str(transaction))))
+                    self.log.info("Expecting %d:\n%s", index,
+                                  _LazyFormat(_hexdump_str, transaction))
                     if index > 5:
                         self.log.info("... and %d more to come" %
                                       (len(expected_output) - index - 1))
                         break
                 fail = True
+        for interface, count in self._mismatch_counts.items():
+            if self.max_reports is not None and count > self.max_reports:
+                self.log.warning("%d mismatches on %s, the first %d were "
+                                 "reported in detail" %
+                                 (count, interface, self.max_reports))
+        count = sum(self._mismatch_counts.values())
+        if count > len(self.mismatches):
+            self.log.warning("%d mismatches, the first %d were kept" %
+                             (count, len(self.mismatches)))
+        if self._mismatch_stream is not None:
+            self._mismatch_stream.close()
+            # Further mismatches are added to the file
+            self._mismatch_stream = None
         if fail:
             return TestFailure("Not all expected output was received")
         if self.errors:
             return TestFailure("Errors were recorded during the test")
         return TestSuccess()
 
+    def write_mismatches(self, filename):
+        """Write :attr:`mismatches` to *filename*, one JSON object per line.
+
+        The transactions are written as their :func:`repr`. Use the
+        *mismatch_file* argument to get more than *max_mismatches* of them.
+        """
+        with open(filename, "w") as f:
+            for mismatch in self.mismatches:
+                f.write(_mismatch_json(mismatch))
+
+    def _mismatch(self, log, reason, got, exp):
+        """Record a mismatch on the interface of *log*.
+
+        Returns:
+            bool: ``True`` if it should be reported in detail.
+        """
+        self.errors += 1
+        keep = (self.max_mismatches is None or
+                len(self.mismatches) < self.max_mismatches)
+        if keep or self.mismatch_file is not None:
+            mismatch = Mismatch(log.name, get_sim_time(), reason, got, exp)
+            if keep:
+                self.mismatches.append(mismatch)
+            if self.mismatch_file is not None:
+                if self._mismatch_stream is None:
+                    self._mismatch_stream = open(self.mismatch_file, "a")
+                self._mismatch_stream.write(_mismatch_json(mismatch))
+        count = self._mismatch_counts.get(log.name, 0) + 1
+        self._mismatch_counts[log.name] = count
+        if self.max_reports is None or count <= self.max_reports:
+            return True
+        if count == self.max_reports + 1:
+            log.warning("Not reporting further mismatches in detail")
+        return False
+
+    def flush(self):
+        """Check all the transactions still queued in streaming mode.
+
+        This is done by :attr:`result`, so it is only needed to look at
+        :attr:`errors` or the expected output during a test.
+
+        Raises:
+            :any:`TestFailure`: If a transaction was wrong when
+                :attr:`fail_immediately` is ``True``.
+        """
+        pending = self._pending
+        while pending:
+            check, transaction = pending.popleft()
+            check(transaction)
+
+    def _queue(self, check, transaction):
+        """Queue *transaction* to be checked by *check* in streaming mode."""
+        pending = self._pending
+        pending.append((check, transaction))
+        if len(pending) >= self._max_pending:
+            # Backpressure: the monitor has to wait for the queue to be checked
+            self.flush()
+            return
+        if not self._drain_coro:
+            self._drain_coro = cocotb.fork(self._drain())
+        if len(pending) == 1:
+            self._pending_event.set()
+
+    @cocotb.coroutine
+    def _drain(self):
+        """Check the queued transactions each time the queue is filled.
+
+        This runs once all the coroutines woken up together with the
+        monitors are done, so that their transactions are checked in one go.
+        """
+        while True:
+            yield self._pending_event.wait()
+            self._pending_event.clear()
+            self.flush()
+
     def compare(self, got, exp, log, strict_type=True):
         """Common function for comparing two transactions.
 
@@ -119,10 +320,9 @@ class Scoreboard(object):
 
         # Compare the types
         if strict_type and type(got) != type(exp):
-            self.errors += 1
-            log.error("Received transaction type is different than expected")
-            log.info("Received: %s but expected %s" %
-                     (str(type(got)), str(type(exp))))
+            if self._mismatch(log, "type", got, exp):
+                log.error("Received transaction type is different than expected")
+                log.info("Received: %s but expected %s", type(got), type(exp))
             if self._imm:
                 raise TestFailure("Received transaction of wrong type. "
                                   "Set strict_type=False to avoid this.")
@@ -133,43 +333,34 @@ class Scoreboard(object):
 
         # Compare directly
         if got != exp:
-            self.errors += 1
-
-            # Try our best to print out something useful
-            strgot, strexp = str(got), str(exp)
-
-            log.error("Received transaction differed from expected output")
-            if not strict_type:
-                log.info("Expected:\n" + hexdump(strexp))
-            else:
-                log.info("Expected:\n" + repr(exp))
-            if not isinstance(exp, str):
-                try:
-                    for word in exp:
-                        log.info(str(word))
-                except Exception:
-                    pass
-            if not strict_type:
-                log.info("Received:\n" + hexdump(strgot))
-            else:
-                log.info("Received:\n" + repr(got))
-            if not isinstance(got, str):
-                try:
-                    for word in got:
-                        log.info(str(word))
-                except Exception:
-                    pass
-            log.warning("Difference:\n%s" % hexdiffs(strexp, strgot))
+            if self._mismatch(log, "value", got, exp):
+                # Try our best to print out something useful, formatted
+                # only if the records are emitted
+                log.error("Received transaction differed from expected output")
+                if not strict_type:
+                    log.info("Expected:\n%s", _LazyFormat(hexdump, exp))
+                else:
+                    log.info("Expected:\n%r", exp)
+                if not isinstance(exp, str) and hasattr(exp, "__iter__"):
+                    log.info("%s", _LazyFormat(_format_words, exp))
+                if not strict_type:
+                    log.info("Received:\n%s", _LazyFormat(hexdump, got))
+                else:
+                    log.info("Received:\n%r", got)
+                if not isinstance(got, str) and hasattr(got, "__iter__"):
+                    log.info("%s", _LazyFormat(_format_words, got))
+                log.warning("Difference:\n%s",
+                            _LazyFormat(_hexdiffs_str, exp, got))
             if self._imm:
                 raise TestFailure("Received transaction differed from expected"
                                   "transaction")
-        else:
+        elif log.isEnabledFor(logging.DEBUG):
             # Don't want to fail the test
             # if we're passed something without __len__
             try:
                 log.debug("Received expected transaction %d bytes" %
                           (len(got)))
-                log.debug(repr(got))
+                log.debug("%r", got)
             except Exception:
                 pass
 
@@ -184,12 +375,15 @@ class Scoreboard(object):
         
         Args:
             monitor: The monitor object.
-            expected_output: Queue of expected outputs.
+            expected_output: Queue of expected outputs, or an
+                :class:`IndexedExpectedOutput` to match the received
+                transactions in any order.
             compare_fn (callable, optional): Function doing the actual comparison.
             reorder_depth (int, optional): Consider up to *reorder_depth* elements 
                 of the expected result list as passing matches.
                 Default is 0, meaning only the first element in the expected result list
                 is considered for a passing match.
+                Not used with an :class:`IndexedExpectedOutput`.
             strict_type (bool, optional): Require transaction type to match
                 exactly if ``True``, otherwise compare its string representation.
 
@@ -208,7 +402,7 @@ class Scoreboard(object):
 
         if compare_fn is not None:
             if callable(compare_fn):
-                monitor.add_callback(compare_fn)
+                self._add_callback(monitor, compare_fn)
                 return
             raise TypeError("Expected a callable compare function but got %s" %
                             str(type(compare_fn)))
@@ -229,6 +423,12 @@ class Scoreboard(object):
             if callable(expected_output):
                 exp = expected_output(transaction)
 
+            elif isinstance(expected_output, IndexedExpectedOutput):
+                if not expected_output:
+                    unexpected(transaction, log)
+                    return
+                exp = expected_output.pop(transaction)
+
             elif len(expected_output):  # we expect something
                 for i in range(min((reorder_depth + 1), len(expected_output))):
                     if expected_output[i] == transaction:
@@ -237,15 +437,113 @@ class Scoreboard(object):
                     i = 0
                 exp = expected_output.pop(i)
             else:
-                self.errors += 1
-                log.error("Received a transaction but wasn't expecting "
-                          "anything")
-                log.info("Got: %s" % (hexdump(str(transaction))))
-                if self._imm:
-                    raise TestFailure("Received a transaction but wasn't "
-                                      "expecting anything")
+                unexpected(transaction, log)
                 return
 
             self.compare(transaction, exp, log, strict_type=strict_type)
 
-        monitor.add_callback(check_received_transaction)
+        def unexpected(transaction, log):
+            if self._mismatch(log, "unexpected", transaction, None):
+                log.error("Received a transaction but wasn't expecting "
+                          "anything")
+                log.info("Got: %s", _LazyFormat(_hexdump_str, transaction))
+            if self._imm:
+                raise TestFailure("Received a transaction but wasn't "
+                                  "expecting anything")
+
+        self._add_callback(monitor, check_received_transaction)
+
+    def _add_callback(self, monitor, check):
+        """Have *check* called with the transactions received by *monitor*,
+        through the queue in streaming mode."""
+        if not self._streaming:
+            monitor.add_callback(check)
+            return
+
+        def queue_received_transaction(transaction):
+            """Called back by the monitor when a new transaction has been
+            received."""
+            self._queue(check, transaction)
+
+        monitor.add_callback(queue_received_transaction)
+
+
+class IndexedExpectedOutput(object):
+    """Expected output of an interface whose transactions can arrive in any
+    order.
+
+    Pass it to :meth:`Scoreboard.add_interface` instead of a list. Each
+    received transaction is matched with the oldest expected transaction
+    which has the same key, in constant time however many transactions are
+    expected. If there is none, it is compared with the oldest expected
+    transaction, so that the difference is reported.
+
+    Args:
+        transactions (iterable, optional): The expected transactions.
+        key (callable, optional): Function returning the key of a
+            transaction, for example its sequence number or address.
+            Transactions with the same key are compared by the scoreboard
+            once matched. Defaults to the transaction itself, which must then
+            be hashable.
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, transactions=(), key=None):
+        self._key = key
+        self._order = collections.OrderedDict()  # sequence number: (key, transaction)
+        self._index = {}  # key: deque of sequence numbers
+        self._count = itertools.count()
+        self.extend(transactions)
+
+    def append(self, transaction):
+        """Add *transaction* to the expected transactions."""
+        key = transaction if self._key is None else self._key(transaction)
+        seq = next(self._count)
+        self._order[seq] = (key, transaction)
+        try:
+            self._index[key].append(seq)
+        except KeyError:
+            self._index[key] = collections.deque((seq,))
+
+    def extend(self, transactions):
+        """Add all of *transactions* to the expected transactions."""
+        for transaction in transactions:
+            self.append(transaction)
+
+    def pop(self, transaction=None):
+        """Remove and return the expected transaction matching *transaction*.
+
+        This is the oldest one with the same key as *transaction*, or the
+        oldest one if none has the same key or *transaction* is ``None``.
+
+        Raises:
+            :any:`IndexError`: If no transaction is expected.
+        """
+        if transaction is not None:
+            key = transaction if self._key is None else self._key(transaction)
+            seqs = self._index.get(key)
+            if seqs is not None:
+                seq = seqs.popleft()
+                if not seqs:
+                    del self._index[key]
+                return self._order.pop(seq)[1]
+        if not self._order:
+            raise IndexError("pop from empty IndexedExpectedOutput")
+        seq, (key, exp) = self._order.popitem(last=False)
+        seqs = self._index[key]
+        seqs.popleft()
+        if not seqs:
+            del self._index[key]
+        return exp
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        """Iterate over the expected transactions, oldest first."""
+        for key, transaction in self._order.values():
+            yield transaction
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self))
@@ -205,8 +205,14 @@ typedef enum gpi_edge {
 } gpi_edge_e;
 
 // The callback registering functions
+// An edge count callback is called after count edges of the signal, a value
+// match callback on the first edge of edge_hdl at which the bits of gpi_hdl
+// that are 1 in the mask (a binary string, NULL for all bits) equal value
 gpi_sim_hdl gpi_register_timed_callback                  (int (*gpi_function)(const void *), void *gpi_cb_data, uint64_t time_ps);
 gpi_sim_hdl gpi_register_value_change_callback           (int (*gpi_function)(const void *), void *gpi_cb_data, gpi_sim_hdl gpi_hdl, unsigned int edge);
+gpi_sim_hdl gpi_register_edge_count_callback             (int (*gpi_function)(const void *), void *gpi_cb_data, gpi_sim_hdl gpi_hdl, unsigned int edge, uint32_t count);
+gpi_sim_hdl gpi_register_value_match_callback            (int (*gpi_function)(const void *), void *gpi_cb_data, gpi_sim_hdl edge_hdl, unsigned int edge,
+                                                          gpi_sim_hdl gpi_hdl, const char *value, const char *mask);
 gpi_sim_hdl gpi_register_readonly_callback               (int (*gpi_function)(const void *), void *gpi_cb_data);
 gpi_sim_hdl gpi_register_nexttime_callback               (int (*gpi_function)(const void *), void *gpi_cb_data);
 gpi_sim_hdl gpi_register_readwrite_callback              (int (*gpi_function)(const void *), void *gpi_cb_data);
@@ -215,6 +221,18 @@ gpi_sim_hdl gpi_register_readwrite_callback              (int (*gpi_function)(co
 // For implementers of GPI the provided macro GPI_RET(x) is provided
 void gpi_deregister_callback(gpi_sim_hdl gpi_hdl);
 
+// The edge callbacks of a signal share one simulator value change callback.
+// Get the number of simulator callbacks registered, and the number of edge
+// callbacks that were primed without registering one.
+void gpi_get_value_change_stats(uint64_t *registered, uint64_t *shared);
+
+// Drive a signal with a clock from within the simulator, the period and high
+// time are in simulator steps. The function (which may be NULL) is called once
+// after the given number of cycles, or never if cycles is 0.
+gpi_sim_hdl gpi_create_clock(int (*gpi_function)(const void *), void *gpi_cb_data, gpi_sim_hdl clk_signal,
+                             uint64_t period, uint64_t high_time, int start_high, uint64_t cycles);
+void gpi_stop_clock(gpi_sim_hdl clk_object);
+
 // Because the internal structures may be different for different implementations
 // of GPI we provide a convenience function to extract the callback data
 void *gpi_get_callback_data(gpi_sim_hdl gpi_hdl);
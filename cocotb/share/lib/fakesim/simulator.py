@@ -0,0 +1,769 @@
+# Copyright (c) cocotb contributors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL POTENTIAL VENTURES LTD BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+A pure-Python stand-in for the ``simulator`` extension module.
+
+This module implements the same functions and constants as the C extension,
+backed by a small event-driven simulation kernel instead of an HDL simulator:
+
+* timed callbacks are kept in a timing wheel of per-time-step buckets,
+* every time step runs the NextTimeStep callbacks, the timed callbacks, then
+  delta cycles of value-change and ReadWrite callbacks until nothing changes,
+  and finally the ReadOnly callbacks,
+* the design is an in-memory hierarchy of modules, signals and arrays built
+  by a Python function rather than elaborated from HDL.
+
+It is selected with ``SIM=fake``, which puts this directory first on the
+``PYTHONPATH`` so that ``import simulator`` finds this module, and runs the
+tests with ``python -m simulator``. The environment variable
+``FAKESIM_DESIGN`` names the function that builds the design, as
+``module:function`` (the function defaults to ``build``). It is called with
+the toplevel module, for example::
+
+    def build(top):
+        top.add_signal("clk")
+        top.add_signal("data", width=8, value=0)
+        top.add_module("inner").add_signal("valid")
+
+Nothing is simulated apart from the signal values written through this
+module, use :meth:`_Object.on_change` to model simple design behaviour.
+``FAKESIM_PRECISION`` sets the precision reported by :func:`get_precision`
+(``-12`` by default).
+"""
+
+from __future__ import print_function
+
+import heapq
+import importlib
+import os
+import sys
+import traceback
+import weakref
+
+__version__ = "1.0"
+
+# Object types, matching gpi_objtype_t
+UNKNOWN = 0
+MEMORY = 1
+MODULE = 2
+NET = 3
+PARAMETER = 4
+REG = 5
+NETARRAY = 6
+ENUM = 7
+STRUCTURE = 8
+REAL = 9
+INTEGER = 10
+STRING = 11
+GENARRAY = 12
+
+# Iterator selections, matching gpi_iterator_sel_t
+OBJECTS = 1
+DRIVERS = 2
+LOADS = 3
+
+# Edges, matching gpi_edge_e
+_RISING = 1
+_FALLING = 2
+_ANY_EDGE = _RISING | _FALLING
+
+_type_strings = {
+    UNKNOWN: "GPI_UNKNOWN",
+    MEMORY: "GPI_MEMORY",
+    MODULE: "GPI_MODULE",
+    NET: "GPI_NET",
+    PARAMETER: "GPI_PARAMETER",
+    REG: "GPI_REGISTER",
+    NETARRAY: "GPI_ARRAY",
+    ENUM: "GPI_ENUM",
+    STRUCTURE: "GPI_STRUCTURE",
+    REAL: "GPI_REAL",
+    INTEGER: "GPI_INTEGER",
+    STRING: "GPI_STRING",
+    GENARRAY: "GPI_GENARRAY",
+}
+
+_vector_types = frozenset([NET, REG])
+_scope_types = frozenset([MODULE, STRUCTURE, NETARRAY, GENARRAY])
+
+_builtin_next = next
+
+
+def _binstr(value, width):
+    """Return *value* as a binary string of *width* bits, two's complement"""
+    return format(value & ((1 << width) - 1), "0%db" % width)
+
+
+class _Object(int):
+    """An object of the in-memory design hierarchy.
+
+    Like the handles of the C module, objects are unique integers so they
+    can be hashed and compared by cocotb.
+
+    The ``add_*`` methods are used by the ``FAKESIM_DESIGN`` function to
+    build the design below the toplevel module.
+    """
+    _last_handle = 0
+
+    def __new__(cls, *args, **kwargs):
+        _Object._last_handle += 1
+        return int.__new__(cls, _Object._last_handle)
+
+    def __init__(self, name, type, width=0, value=None, const=False, def_name=""):
+        self.name = name
+        self.type = type
+        self.const = const
+        self.def_name = def_name
+        self.width = width
+        self.range = None
+        self.children = []
+        self.by_name = {}
+        self.by_index = {}
+        self._value = value
+        self.old_value = None
+        self.pending = False
+        self.callbacks = []
+        self.listeners = []
+
+    def __repr__(self):
+        return "<%s %s>" % (_type_strings[self.type], self.name)
+
+    def _add(self, obj, index=None):
+        self.children.append(obj)
+        self.by_name[obj.name] = obj
+        if index is not None:
+            self.by_index[index] = obj
+        return obj
+
+    def add_module(self, name, def_name=None):
+        """Add and return a sub-module called *name*."""
+        return self._add(_Object(name, MODULE, def_name=def_name or name))
+
+    def add_signal(self, name, width=1, kind=REG, value=None, const=False):
+        """Add and return a signal called *name*.
+
+        Args:
+            name (str): The name of the signal.
+            width (int): The number of bits of a ``REG`` or ``NET`` signal.
+            kind (int): One of ``REG``, ``NET``, ``INTEGER``, ``ENUM``,
+                ``REAL`` or ``STRING``.
+            value: The initial value, all ``x`` for vectors by default.
+            const (bool): Whether the signal is a constant.
+        """
+        if kind in _vector_types:
+            obj = _Object(name, kind, width, "x" * width, const)
+            obj.range = (width - 1, 0)
+        elif kind in (INTEGER, ENUM):
+            obj = _Object(name, kind, 32, 0, const)
+        elif kind == REAL:
+            obj = _Object(name, kind, 1, 0.0, const)
+        elif kind == STRING:
+            obj = _Object(name, kind, 0, "", const)
+        else:
+            raise ValueError("Unsupported signal type %r" % (kind,))
+        if value is not None:
+            obj._value = obj._convert(value)
+        return self._add(obj)
+
+    def add_array(self, name, left, right, width=1, kind=REG):
+        """Add and return an array called *name* of signals from *left* to *right*."""
+        array = self._add(_Object(name, NETARRAY, abs(left - right) + 1))
+        array.range = (left, right)
+        step = 1 if right >= left else -1
+        for index in range(left, right + step, step):
+            array._add(_Object("%s[%d]" % (name, index), kind, width,
+                               "x" * width), index)
+        return array
+
+    def on_change(self, function):
+        """Call ``function(self)`` in the delta cycle after every value change."""
+        self.listeners.append(function)
+
+    @property
+    def value(self):
+        """The value of the signal, a binary string for vectors."""
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        _kernel.write(self, self._convert(value))
+
+    def _convert(self, value):
+        if self.type in _vector_types and not isinstance(value, str):
+            return _binstr(value, self.width)
+        return value
+
+
+class _Callback(object):
+    """A registered callback, also used as its handle."""
+    __slots__ = ('function', 'args', 'active', 'signal', 'edge', 'count', 'match')
+
+    def __init__(self, function, args, signal=None, edge=0):
+        self.function = function
+        self.args = args
+        self.active = True
+        self.signal = signal
+        self.edge = edge
+        # Edges left to count for an edge count callback
+        self.count = 1
+        # (signal, value, mask) compared on each edge for a value match callback
+        self.match = None
+
+
+class _CallbackRecord(object):
+    """A callback record from :func:`create_callback`.
+
+    Like the C record it does not keep its owner alive.
+    """
+    __slots__ = ('function', 'owner')
+
+    def __init__(self, function, owner):
+        self.function = function
+        self.owner = weakref.ref(owner)
+
+
+def _new_callback(function, args, signal=None, edge=0):
+    if isinstance(function, _CallbackRecord):
+        return _Callback(function.function, (function.owner(),), signal, edge)
+    return _Callback(function, args, signal, edge)
+
+
+class _Clock(object):
+    """A clock driven by timed callbacks, see :func:`create_clock`."""
+    __slots__ = ('signal', 'period', 'high_time', 'phases_left', 'level',
+                 'timer', 'done')
+
+    def __init__(self, signal, period, high_time, start_high, cycles, done):
+        self.signal = signal
+        self.period = period
+        self.high_time = high_time
+        self.phases_left = 2 * cycles
+        self.level = 1 if start_high else 0
+        self.timer = None
+        self.done = done
+
+    def start(self):
+        _kernel.set_signal_val_long(self.signal, self.level)
+        self._schedule()
+
+    def stop(self):
+        if self.timer is not None:
+            self.timer.active = False
+            self.timer = None
+
+    def _schedule(self):
+        delay = self.high_time if self.level else self.period - self.high_time
+        self.timer = _kernel.register_timed_callback(delay, self._toggle)
+
+    def _toggle(self):
+        self.timer = None
+        if self.phases_left:
+            self.phases_left -= 1
+            if not self.phases_left:
+                # All cycles driven, the signal keeps its last value
+                if self.done is not None:
+                    self.done.function(*self.done.args)
+                return
+        self.level ^= 1
+        _kernel.set_signal_val_long(self.signal, self.level)
+        self._schedule()
+
+
+class _Kernel(object):
+    """The simulation kernel, its methods make up the module interface."""
+
+    def __init__(self, precision):
+        self.precision = precision
+        self.root = None
+        self.sim_event = None
+        self.time = 0
+        self.in_readonly = False
+        self.stopped = False
+        # Timing wheel: one bucket of callbacks per time step, and a heap of
+        # the time steps that have a bucket
+        self.wheel = {}
+        self.times = []
+        self.nextstep = []
+        self.readwrite = []
+        self.readonly = []
+        # Signals changed in the current delta cycle
+        self.changed = []
+        # Like the GPI, the edge callbacks of a signal share one value change
+        # callback, count the ones that would have been registered with a
+        # simulator and the ones that shared it
+        self.value_change_registered = 0
+        self.value_change_shared = 0
+        self.firing = None
+
+    # Simulation loop
+
+    def run(self):
+        """Run the simulation until it is stopped or runs out of events."""
+        while not self.stopped:
+            self._run_time_step()
+            if self.stopped or not self._advance():
+                break
+        if not self.stopped and self.sim_event is not None:
+            # Like a real simulator finishing with cocotb still waiting
+            self.sim_event(2, "Simulator shutdown prematurely")
+
+    def _advance(self):
+        """Move to the next time step with any callbacks, if there is one."""
+        while self.times:
+            time = heapq.heappop(self.times)
+            bucket = self.wheel.get(time)
+            if bucket is None:
+                continue
+            for cb in bucket:
+                if cb.active:
+                    self.time = time
+                    return True
+            del self.wheel[time]
+        if self.readwrite:
+            # Registered from the ReadOnly phase
+            self.time += 1
+            return True
+        return False
+
+    def _run_time_step(self):
+        time = self.time
+        if self.nextstep:
+            callbacks, self.nextstep = self.nextstep, []
+            self._fire(callbacks)
+        while not self.stopped:
+            bucket = self.wheel.pop(time, None)
+            if bucket is not None:
+                self._fire(bucket)
+            self._settle()
+            if self.readwrite:
+                callbacks, self.readwrite = self.readwrite, []
+                self._fire(callbacks)
+            elif time not in self.wheel:
+                break
+        self.in_readonly = True
+        while self.readonly and not self.stopped:
+            callbacks, self.readonly = self.readonly, []
+            self._fire(callbacks)
+            self._settle()
+        self.in_readonly = False
+
+    def _fire(self, callbacks):
+        for cb in callbacks:
+            if cb.active:
+                cb.active = False
+                self._call(cb.function, cb.args)
+                if self.stopped:
+                    return
+
+    def _call(self, function, args):
+        try:
+            function(*args)
+        except Exception:
+            # Any subsequent calls would go back to Python in an unknown
+            # state, so end the simulation like the C module does
+            print("ERROR: Failed to execute callback due to Python exception",
+                  file=sys.stderr)
+            traceback.print_exc()
+            self.stopped = True
+
+    def _settle(self):
+        """Run delta cycles until no signal values change."""
+        while self.changed and not self.stopped:
+            changed, self.changed = self.changed, []
+            for signal in changed:
+                signal.pending = False
+                if signal._value == signal.old_value:
+                    continue
+                for listener in signal.listeners:
+                    self._call(listener, (signal,))
+                if not signal.callbacks:
+                    continue
+                callbacks, signal.callbacks = signal.callbacks, []
+                binstr = None
+                self.firing = signal
+                for cb in callbacks:
+                    if not cb.active:
+                        continue
+                    if cb.edge != _ANY_EDGE:
+                        if binstr is None:
+                            binstr = self.get_signal_val_binstr(signal)
+                        if binstr != ("1" if cb.edge == _RISING else "0"):
+                            signal.callbacks.append(cb)
+                            continue
+                    if cb.match is not None and not self._matches(*cb.match):
+                        signal.callbacks.append(cb)
+                        continue
+                    if cb.count > 1:
+                        cb.count -= 1
+                        signal.callbacks.append(cb)
+                        continue
+                    cb.active = False
+                    self._call(cb.function, cb.args)
+                    if self.stopped:
+                        return
+                self.firing = None
+
+    def _matches(self, signal, value, mask):
+        """Compare the bits set in *mask* like the GPI, from the right."""
+        binstr = self.get_signal_val_binstr(signal).rjust(len(value), "0")
+        binstr = binstr[len(binstr) - len(value):]
+        return all(m != "1" or b == v for b, v, m in zip(binstr, value, mask))
+
+    def write(self, signal, value):
+        if value == signal._value:
+            return
+        if not signal.pending:
+            signal.pending = True
+            signal.old_value = signal._value
+            self.changed.append(signal)
+        signal._value = value
+
+    # Callbacks
+
+    def create_callback(self, function, owner):
+        if not callable(function):
+            raise TypeError("Attempt to create a callback record without passing a callable callback!")
+        return _CallbackRecord(function, owner)
+
+    def register_timed_callback(self, time, function, *args):
+        time += self.time
+        cb = _new_callback(function, args)
+        bucket = self.wheel.get(time)
+        if bucket is None:
+            self.wheel[time] = [cb]
+            heapq.heappush(self.times, time)
+        else:
+            bucket.append(cb)
+        return cb
+
+    def register_value_change_callback(self, signal, function, edge, *args):
+        cb = _new_callback(function, args, signal, edge)
+        if signal.callbacks or signal is self.firing:
+            self.value_change_shared += 1
+        else:
+            self.value_change_registered += 1
+        signal.callbacks.append(cb)
+        return cb
+
+    def register_edge_count_callback(self, signal, function, edge, count, *args):
+        if not 0 < count < 2**32:
+            raise ValueError("Edge count must be between 1 and 2**32-1")
+        cb = self.register_value_change_callback(signal, function, edge, *args)
+        cb.count = count
+        return cb
+
+    def register_value_match_callback(self, edge_signal, function, edge, signal,
+                                      value, mask, *args):
+        if len(value) != len(mask):
+            raise ValueError("Value and mask must have the same length")
+        cb = self.register_value_change_callback(edge_signal, function, edge, *args)
+        cb.match = (signal, value, mask)
+        return cb
+
+    def register_readonly_callback(self, function, *args):
+        cb = _new_callback(function, args)
+        self.readonly.append(cb)
+        return cb
+
+    def register_rwsynch_callback(self, function, *args):
+        cb = _new_callback(function, args)
+        self.readwrite.append(cb)
+        return cb
+
+    def register_nextstep_callback(self, function, *args):
+        cb = _new_callback(function, args)
+        self.nextstep.append(cb)
+        return cb
+
+    def deregister_callback(self, cb):
+        cb.active = False
+        if cb.signal is not None:
+            try:
+                cb.signal.callbacks.remove(cb)
+            except ValueError:
+                pass
+        return "OK!"
+
+    def create_clock(self, signal, period, high_time, start_high, cycles, function=None, *args):
+        if not 0 < high_time < period:
+            self.log_msg("cocotb.gpi", __file__, "create_clock", 0,
+                         "Clock high time %d must be between 0 and the period %d" % (high_time, period))
+            return 0
+        done = _Callback(function, args) if function is not None else None
+        clock = _Clock(signal, period, high_time, start_high, cycles, done)
+        clock.start()
+        return clock
+
+    def stop_clock(self, clock):
+        clock.stop()
+        return "OK!"
+
+    def get_value_change_stats(self):
+        return (self.value_change_registered, self.value_change_shared)
+
+    # Signal values
+
+    def get_signal_val_binstr(self, signal):
+        if signal.type in _vector_types:
+            return signal._value
+        if signal.type in (INTEGER, ENUM):
+            return _binstr(signal._value, 32)
+        raise TypeError("Cannot get the binary string value of %r" % (signal,))
+
+    def get_signal_val_str(self, signal):
+        if signal.type == STRING:
+            return signal._value
+        chars = []
+        value = self.get_signal_val_long(signal)
+        while value:
+            chars.append(chr(value & 0xff))
+            value >>= 8
+        return "".join(reversed(chars))
+
+    def get_signal_val_real(self, signal):
+        return float(signal._value)
+
+    def get_signal_val_long(self, signal):
+        if signal.type in _vector_types:
+            try:
+                return int(signal._value, 2)
+            except ValueError:
+                # Unresolved bits read as 0
+                return int("".join(c if c == "1" else "0" for c in signal._value), 2)
+        return int(signal._value)
+
+    def get_signal_vals(self, signals, format):
+        get = self._getters[format]
+        return tuple(get(self, signal) for signal in signals)
+
+    def set_signal_val_long(self, signal, value):
+        if signal.type in _vector_types:
+            self.write(signal, _binstr(value, signal.width))
+        elif signal.type == REAL:
+            self.write(signal, float(value))
+        else:
+            self.write(signal, int(value))
+        return "OK!"
+
+    def set_signal_val_str(self, signal, value):
+        if signal.type in _vector_types:
+            width = signal.width
+            if len(value) < width:
+                value = value.rjust(width, "0")
+            elif len(value) > width:
+                value = value[-width:]
+        self.write(signal, value)
+        return "OK!"
+
+    def set_signal_val_real(self, signal, value):
+        self.write(signal, float(value))
+        return "OK!"
+
+    def set_signal_vals(self, writes):
+        for signal, kind, value in writes:
+            self._setters[kind](self, signal, value)
+        return "OK!"
+
+    _getters = {
+        "binstr": get_signal_val_binstr,
+        "str": get_signal_val_str,
+        "real": get_signal_val_real,
+        "long": get_signal_val_long,
+    }
+
+    _setters = {
+        "long": set_signal_val_long,
+        "str": set_signal_val_str,
+        "real": set_signal_val_real,
+    }
+
+    # Hierarchy
+
+    def get_root_handle(self, name):
+        if name is None or name == self.root.name:
+            return self.root
+        return None
+
+    def get_handle_by_name(self, obj, name):
+        for part in name.split("."):
+            obj = obj.by_name.get(part)
+            if obj is None:
+                return None
+        return obj
+
+    def get_handle_by_index(self, obj, index):
+        return obj.by_index.get(index)
+
+    def get_handle_by_path(self, obj, path):
+        found = []
+        for part in path:
+            if isinstance(part, int):
+                obj = self.get_handle_by_index(obj, part)
+            else:
+                obj = self.get_handle_by_name(obj, part)
+            if obj is None:
+                break
+            found.append((obj,) + self.get_handle_info(obj))
+        return found
+
+    def get_name_string(self, obj):
+        return obj.name
+
+    def get_type(self, obj):
+        return obj.type
+
+    def get_type_string(self, obj):
+        return _type_strings[obj.type]
+
+    def get_const(self, obj):
+        return 1 if obj.const else 0
+
+    def get_handle_info(self, obj):
+        return obj.name, obj.type, 1 if obj.const else 0
+
+    def get_definition_name(self, obj):
+        return obj.def_name
+
+    def get_definition_file(self, obj):
+        return ""
+
+    def get_num_elems(self, obj):
+        if obj.type in _scope_types:
+            return len(obj.children)
+        return obj.width
+
+    def get_range(self, obj):
+        return obj.range
+
+    def iterate(self, obj, mode):
+        if mode != OBJECTS:
+            return None
+        return iter(list(obj.children))
+
+    def next(self, iterator):
+        if not iterator:
+            raise StopIteration
+        return _builtin_next(iterator)
+
+    # Simulator control
+
+    def get_sim_time(self):
+        return (self.time >> 32, self.time & 0xFFFFFFFF)
+
+    def get_precision(self):
+        return self.precision
+
+    def stop_simulator(self):
+        self.stopped = True
+        return "OK!"
+
+    def log_msg(self, name, path, funcname, lineno, msg):
+        print("%s: %s" % (name, msg), file=sys.stderr)
+        return "OK!"
+
+    def log_level(self, level):
+        return "OK!"
+
+
+_kernel = _Kernel(int(os.getenv("FAKESIM_PRECISION", "-12")))
+
+log_msg = _kernel.log_msg
+get_signal_val_long = _kernel.get_signal_val_long
+get_signal_val_str = _kernel.get_signal_val_str
+get_signal_val_binstr = _kernel.get_signal_val_binstr
+get_signal_val_real = _kernel.get_signal_val_real
+get_signal_vals = _kernel.get_signal_vals
+set_signal_val_long = _kernel.set_signal_val_long
+set_signal_val_str = _kernel.set_signal_val_str
+set_signal_val_real = _kernel.set_signal_val_real
+set_signal_vals = _kernel.set_signal_vals
+get_definition_name = _kernel.get_definition_name
+get_definition_file = _kernel.get_definition_file
+get_handle_by_name = _kernel.get_handle_by_name
+get_handle_by_index = _kernel.get_handle_by_index
+get_handle_by_path = _kernel.get_handle_by_path
+get_root_handle = _kernel.get_root_handle
+get_name_string = _kernel.get_name_string
+get_type_string = _kernel.get_type_string
+get_type = _kernel.get_type
+get_const = _kernel.get_const
+get_handle_info = _kernel.get_handle_info
+get_num_elems = _kernel.get_num_elems
+get_range = _kernel.get_range
+create_callback = _kernel.create_callback
+register_timed_callback = _kernel.register_timed_callback
+register_value_change_callback = _kernel.register_value_change_callback
+register_edge_count_callback = _kernel.register_edge_count_callback
+register_value_match_callback = _kernel.register_value_match_callback
+register_readonly_callback = _kernel.register_readonly_callback
+register_nextstep_callback = _kernel.register_nextstep_callback
+register_rwsynch_callback = _kernel.register_rwsynch_callback
+stop_simulator = _kernel.stop_simulator
+iterate = _kernel.iterate
+next = _kernel.next
+log_level = _kernel.log_level
+get_sim_time = _kernel.get_sim_time
+get_precision = _kernel.get_precision
+deregister_callback = _kernel.deregister_callback
+create_clock = _kernel.create_clock
+stop_clock = _kernel.stop_clock
+get_value_change_stats = _kernel.get_value_change_stats
+
+
+def main(argv):
+    """Build the design, start cocotb and run the simulation.
+
+    This does what the simulator and the embedding code do for the C module.
+    """
+    toplevel = os.getenv("TOPLEVEL")
+    _kernel.root = _Object(toplevel, MODULE, def_name=toplevel)
+
+    design = os.getenv("FAKESIM_DESIGN")
+    if design:
+        module_name, _, function_name = design.partition(":")
+        build = getattr(importlib.import_module(module_name), function_name or "build")
+        build(_kernel.root)
+
+    os.environ["COCOTB_SIM"] = "1"
+    import cocotb
+
+    cocotb.argv = list(argv)
+    cocotb.argc = len(argv)
+    cocotb.SIM_NAME = "fakesim"
+    cocotb.SIM_VERSION = __version__
+    cocotb.LANGUAGE = os.getenv("TOPLEVEL_LANG")
+    cocotb.log.info("Running on %s version %s" % (cocotb.SIM_NAME, cocotb.SIM_VERSION))
+
+    _kernel.sim_event = cocotb._sim_event
+    cocotb._initialise_testbench(toplevel)
+    _kernel.run()
+    return 0
+
+
+if __name__ == "__main__":
+    # Run from the module imported as "simulator", not from this copy
+    # imported as "__main__", so that cocotb sees the same kernel
+    import simulator
+    sys.exit(simulator.main(sys.argv))
@@ -206,3 +206,352 @@ int GpiValueCbHdl::run_callback()
 
     return 0;
 }
+
+GpiSignalObjHdl::~GpiSignalObjHdl()
+{
+    delete m_value_cb_mux;
+}
+
+GpiCbHdl *GpiSignalObjHdl::edge_cb(unsigned int edge)
+{
+    if (!m_value_cb_mux)
+        m_value_cb_mux = new GpiValueCbMux(this);
+
+    return m_value_cb_mux->edge_cb(edge);
+}
+
+GpiCbHdl *GpiSignalObjHdl::edge_count_cb(unsigned int edge, uint32_t count)
+{
+    if (!m_value_cb_mux)
+        m_value_cb_mux = new GpiValueCbMux(this);
+
+    return m_value_cb_mux->edge_count_cb(edge, count);
+}
+
+GpiCbHdl *GpiSignalObjHdl::edge_match_cb(unsigned int edge, GpiSignalObjHdl *signal,
+                                         const std::string &value, const std::string &mask)
+{
+    if (!m_value_cb_mux)
+        m_value_cb_mux = new GpiValueCbMux(this);
+
+    return m_value_cb_mux->edge_match_cb(edge, signal, value, mask);
+}
+
+int GpiEdgeCbHdl::arm_callback()
+{
+    if (m_state == GPI_PRIMED)
+        return 0;
+
+    if (m_mux->add_edge())
+        return -1;
+
+    m_state = GPI_PRIMED;
+    return 0;
+}
+
+int GpiEdgeCbHdl::cleanup_callback()
+{
+    gpi_cb_state_e old_state = m_state;
+
+    m_state = GPI_FREE;
+    if (old_state == GPI_PRIMED)
+        m_mux->remove_edge();
+    if (m_one_shot)
+        m_mux->remove_oneshot(this);        // May delete this
+
+    return 0;
+}
+
+void GpiEdgeCbHdl::set_match(GpiSignalObjHdl *signal, const std::string &value, const std::string &mask)
+{
+    m_match_signal = signal;
+    m_match_value = value;
+    m_match_mask = mask;
+}
+
+bool GpiEdgeCbHdl::matches()
+{
+    if (!m_match_signal)
+        return true;
+
+    std::string value = m_match_signal->get_signal_value_binstr();
+    size_t len = m_match_value.size();
+
+    /* Compare from the least significant bit, missing bits are 0 */
+    for (size_t i = 1; i <= len; i++) {
+        if (m_match_mask[len - i] != '1')
+            continue;
+
+        char bit = i <= value.size() ? value[value.size() - i] : '0';
+        if (bit != m_match_value[len - i])
+            return false;
+    }
+
+    return true;
+}
+
+uint64_t GpiValueCbMux::num_registered = 0;
+uint64_t GpiValueCbMux::num_shared = 0;
+
+GpiValueCbMux::~GpiValueCbMux()
+{
+    std::vector<GpiEdgeCbHdl*>::iterator it;
+
+    for (it = m_oneshot_cbs.begin(); it != m_oneshot_cbs.end(); it++)
+        delete *it;
+}
+
+static int handle_value_change(const void *mux)
+{
+    return static_cast<GpiValueCbMux*>(const_cast<void*>(mux))->run_edges();
+}
+
+GpiCbHdl *GpiValueCbMux::edge_cb(unsigned int edge)
+{
+    GpiEdgeCbHdl *cb = NULL;
+
+    switch (edge) {
+    case GPI_RISING:
+        cb = &m_rising_cb;
+        break;
+    case GPI_FALLING:
+        cb = &m_falling_cb;
+        break;
+    case GPI_RISING | GPI_FALLING:
+        cb = &m_either_cb;
+        break;
+    default:
+        return NULL;
+    }
+
+    if (cb->arm_callback())
+        return NULL;
+
+    return cb;
+}
+
+GpiCbHdl *GpiValueCbMux::add_oneshot(GpiEdgeCbHdl *cb)
+{
+    if (cb->arm_callback()) {
+        delete cb;
+        return NULL;
+    }
+
+    m_oneshot_cbs.push_back(cb);
+    return cb;
+}
+
+GpiCbHdl *GpiValueCbMux::edge_count_cb(unsigned int edge, uint32_t count)
+{
+    if (!edge || edge > (GPI_RISING | GPI_FALLING) || !count)
+        return NULL;
+
+    return add_oneshot(new GpiEdgeCbHdl(m_signal->m_impl, this, edge, count));
+}
+
+GpiCbHdl *GpiValueCbMux::edge_match_cb(unsigned int edge, GpiSignalObjHdl *signal,
+                                       const std::string &value, const std::string &mask)
+{
+    if (!edge || edge > (GPI_RISING | GPI_FALLING) || value.size() != mask.size())
+        return NULL;
+
+    GpiEdgeCbHdl *cb = new GpiEdgeCbHdl(m_signal->m_impl, this, edge, 1);
+    cb->set_match(signal, value, mask);
+
+    return add_oneshot(cb);
+}
+
+int GpiValueCbMux::add_edge()
+{
+    /* While the edge callbacks run the simulator callback stays registered,
+     * run_edges decides afterwards whether it is still needed */
+    if (m_in_callback || (m_sim_cb && m_sim_cb->get_call_state() == GPI_PRIMED)) {
+        num_shared++;
+    } else {
+        m_sim_cb = m_signal->value_change_cb(GPI_RISING | GPI_FALLING);
+        if (!m_sim_cb)
+            return -1;
+        m_sim_cb->set_user_data(handle_value_change, this);
+        num_registered++;
+    }
+
+    m_num_primed++;
+    return 0;
+}
+
+void GpiValueCbMux::remove_edge()
+{
+    m_num_primed--;
+
+    if (!m_num_primed && !m_in_callback && m_sim_cb)
+        m_signal->m_impl->deregister_callback(m_sim_cb);
+}
+
+void GpiValueCbMux::remove_oneshot(GpiEdgeCbHdl *cb)
+{
+    /* run_edges deletes the callbacks that are done once it has run them */
+    if (m_in_callback)
+        return;
+
+    std::vector<GpiEdgeCbHdl*>::iterator it;
+
+    for (it = m_oneshot_cbs.begin(); it != m_oneshot_cbs.end(); it++) {
+        if (*it == cb) {
+            m_oneshot_cbs.erase(it);
+            delete cb;
+            break;
+        }
+    }
+}
+
+static bool edge_matches(GpiEdgeCbHdl *cb, bool high, bool low)
+{
+    return !((cb->m_edge == GPI_RISING && !high) || (cb->m_edge == GPI_FALLING && !low));
+}
+
+int GpiValueCbMux::run_edges()
+{
+    GpiEdgeCbHdl *edges[] = {&m_rising_cb, &m_falling_cb, &m_either_cb};
+    bool primed[3];
+    bool high = false;
+    bool low = false;
+    size_t i;
+
+    /* Edge callbacks primed by the ones we run must wait for the next change */
+    for (i = 0; i < 3; i++)
+        primed[i] = edges[i]->get_call_state() == GPI_PRIMED;
+    size_t num_oneshot_cbs = m_oneshot_cbs.size();
+
+    if (primed[0] || primed[1] || num_oneshot_cbs) {
+        std::string value = m_signal->get_signal_value_binstr();
+        high = value == "1";
+        low = value == "0";
+    }
+
+    m_in_callback = true;
+
+    for (i = 0; i < 3; i++) {
+        GpiEdgeCbHdl *cb = edges[i];
+
+        /* It may have been removed by an earlier callback */
+        if (!primed[i] || cb->get_call_state() != GPI_PRIMED)
+            continue;
+        if (!edge_matches(cb, high, low))
+            continue;
+
+        cb->set_call_state(GPI_CALL);
+        m_num_primed--;
+        cb->run_callback();
+
+        if (cb->get_call_state() == GPI_CALL)
+            cb->set_call_state(GPI_FREE);
+    }
+
+    /* The vector may grow while the callbacks run, so index it */
+    for (i = 0; i < num_oneshot_cbs; i++) {
+        GpiEdgeCbHdl *cb = m_oneshot_cbs[i];
+
+        if (cb->get_call_state() != GPI_PRIMED || !edge_matches(cb, high, low))
+            continue;
+        if (!cb->matches() || --cb->m_count)
+            continue;
+
+        cb->set_call_state(GPI_CALL);
+        m_num_primed--;
+        cb->run_callback();
+        cb->set_call_state(GPI_FREE);
+    }
+
+    m_in_callback = false;
+
+    /* Delete the one-shot callbacks that were run or removed */
+    for (i = 0; i < m_oneshot_cbs.size(); ) {
+        if (m_oneshot_cbs[i]->get_call_state() == GPI_PRIMED) {
+            i++;
+        } else {
+            delete m_oneshot_cbs[i];
+            m_oneshot_cbs.erase(m_oneshot_cbs.begin() + i);
+        }
+    }
+
+    /* Keep the simulator callback registered for the edge callbacks still primed,
+     * the simulator removes it if it is not primed again */
+    if (m_num_primed)
+        m_sim_cb->set_call_state(GPI_PRIMED);
+
+    return 0;
+}
+
+static int handle_gpi_clock(const void *clock)
+{
+    GpiClockHdl *clk = static_cast<GpiClockHdl*>(const_cast<void*>(clock));
+    return clk->toggle();
+}
+
+int GpiClockHdl::start_clock(uint64_t period, uint64_t high_time, bool start_high, uint64_t cycles)
+{
+    if (!high_time || high_time >= period) {
+        LOG_ERROR("Clock high time %llu must be between 0 and the period %llu",
+                  (unsigned long long)high_time, (unsigned long long)period);
+        return -1;
+    }
+
+    m_period = period;
+    m_high_time = high_time;
+    m_phases_left = 2 * cycles;
+    m_value = start_high ? 1 : 0;
+    m_stopped = false;
+
+    m_clk->set_signal_value(m_value);
+    return schedule_toggle();
+}
+
+int GpiClockHdl::stop_clock()
+{
+    m_stopped = true;
+    return m_timer ? 1 : 0;
+}
+
+int GpiClockHdl::schedule_toggle()
+{
+    uint64_t delay = m_value ? m_high_time : m_period - m_high_time;
+
+    m_timer = m_clk->m_impl->register_timed_callback(delay);
+    if (!m_timer) {
+        LOG_ERROR("Failed to register a timed callback for clock %s", m_clk->get_name_str());
+        return -1;
+    }
+
+    m_timer->set_user_data(handle_gpi_clock, this);
+    return 0;
+}
+
+int GpiClockHdl::toggle()
+{
+    m_timer = NULL;
+
+    if (m_stopped) {
+        /* gpi_stop_clock was called while this toggle was pending */
+        delete this;
+        return 0;
+    }
+
+    if (m_phases_left && !--m_phases_left) {
+        /* All cycles driven, the signal keeps its last value. The user function
+           may stop the clock and so free this object, don't touch it after. */
+        if (gpi_function)
+            gpi_function(m_cb_data);
+        return 0;
+    }
+
+    m_value = !m_value;
+    m_clk->set_signal_value(m_value);
+    return schedule_toggle();
+}
+
+int GpiClockHdl::set_user_data(int (*gpi_function)(const void*), const void *data)
+{
+    this->gpi_function = gpi_function;
+    this->m_cb_data = data;
+    return 0;
+}
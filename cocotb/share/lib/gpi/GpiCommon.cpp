@@ -541,7 +541,7 @@ gpi_sim_hdl gpi_register_value_change_callback(int (*gpi_function)(const void *)
     GpiSignalObjHdl *signal_hdl = sim_to_hdl<GpiSignalObjHdl*>(sig_hdl);
 
     /* Do something based on int & GPI_RISING | GPI_FALLING */
-    GpiCbHdl *gpi_hdl = signal_hdl->value_change_cb(edge);
+    GpiCbHdl *gpi_hdl = signal_hdl->edge_cb(edge);
     if (!gpi_hdl) {
         LOG_ERROR("Failed to register a value change callback");
         return NULL;
@@ -551,6 +551,48 @@ gpi_sim_hdl gpi_register_value_change_callback(int (*gpi_function)(const void *)
     return (gpi_sim_hdl)gpi_hdl;
 }
 
+gpi_sim_hdl gpi_register_edge_count_callback(int (*gpi_function)(const void *),
+                                             void *gpi_cb_data,
+                                             gpi_sim_hdl sig_hdl,
+                                             unsigned int edge,
+                                             uint32_t count)
+{
+    GpiSignalObjHdl *signal_hdl = sim_to_hdl<GpiSignalObjHdl*>(sig_hdl);
+
+    GpiCbHdl *gpi_hdl = signal_hdl->edge_count_cb(edge, count);
+    if (!gpi_hdl) {
+        LOG_ERROR("Failed to register an edge count callback");
+        return NULL;
+    }
+
+    gpi_hdl->set_user_data(gpi_function, gpi_cb_data);
+    return (gpi_sim_hdl)gpi_hdl;
+}
+
+gpi_sim_hdl gpi_register_value_match_callback(int (*gpi_function)(const void *),
+                                              void *gpi_cb_data,
+                                              gpi_sim_hdl edge_hdl,
+                                              unsigned int edge,
+                                              gpi_sim_hdl sig_hdl,
+                                              const char *value,
+                                              const char *mask)
+{
+    GpiSignalObjHdl *edge_signal_hdl = sim_to_hdl<GpiSignalObjHdl*>(edge_hdl);
+    GpiSignalObjHdl *signal_hdl = sim_to_hdl<GpiSignalObjHdl*>(sig_hdl);
+
+    std::string match_value = value;
+    std::string match_mask = mask ? mask : std::string(match_value.size(), '1');
+
+    GpiCbHdl *gpi_hdl = edge_signal_hdl->edge_match_cb(edge, signal_hdl, match_value, match_mask);
+    if (!gpi_hdl) {
+        LOG_ERROR("Failed to register a value match callback");
+        return NULL;
+    }
+
+    gpi_hdl->set_user_data(gpi_function, gpi_cb_data);
+    return (gpi_sim_hdl)gpi_hdl;
+}
+
 /* It should not matter which implementation we use for this so just pick the first
    one */
 gpi_sim_hdl gpi_register_timed_callback(int (*gpi_function)(const void *),
@@ -611,19 +653,34 @@ gpi_sim_hdl gpi_register_readwrite_callback(int (*gpi_function)(const void *),
     return (gpi_sim_hdl)gpi_hdl;
 }
 
-gpi_sim_hdl gpi_create_clock(gpi_sim_hdl clk_signal, const int period)
+gpi_sim_hdl gpi_create_clock(int (*gpi_function)(const void *),
+                             void *gpi_cb_data,
+                             gpi_sim_hdl clk_signal,
+                             uint64_t period,
+                             uint64_t high_time,
+                             int start_high,
+                             uint64_t cycles)
 {
-    GpiObjHdl *clk_hdl = sim_to_hdl<GpiObjHdl*>(clk_signal);
+    GpiSignalObjHdl *clk_hdl = sim_to_hdl<GpiSignalObjHdl*>(clk_signal);
     GpiClockHdl *clock = new GpiClockHdl(clk_hdl);
-    clock->start_clock(period);
+
+    if (gpi_function)
+        clock->set_user_data(gpi_function, gpi_cb_data);
+
+    if (clock->start_clock(period, high_time, start_high, cycles)) {
+        LOG_ERROR("Failed to start a clock on %s", clk_hdl->get_name_str());
+        delete clock;
+        return NULL;
+    }
+
     return (gpi_sim_hdl)clock;
 }
 
 void gpi_stop_clock(gpi_sim_hdl clk_object)
 {
     GpiClockHdl *clock = sim_to_hdl<GpiClockHdl*>(clk_object);
-    clock->stop_clock();
-    delete(clock);
+    if (!clock->stop_clock())
+        delete(clock);
 }
 
 void gpi_deregister_callback(gpi_sim_hdl hdl)
@@ -632,6 +689,18 @@ void gpi_deregister_callback(gpi_sim_hdl hdl)
     cb_hdl->m_impl->deregister_callback(cb_hdl);
 }
 
+void *gpi_get_callback_data(gpi_sim_hdl hdl)
+{
+    GpiCbHdl *cb_hdl = sim_to_hdl<GpiCbHdl*>(hdl);
+    return const_cast<void*>(cb_hdl->get_user_data());
+}
+
+void gpi_get_value_change_stats(uint64_t *registered, uint64_t *shared)
+{
+    *registered = GpiValueCbMux::num_registered;
+    *shared = GpiValueCbMux::num_shared;
+}
+
 const char* GpiImplInterface::get_name_c() {
     return m_name.c_str();
 }
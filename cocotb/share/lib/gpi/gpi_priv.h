@@ -47,6 +47,7 @@ class GpiCbHdl;
 class GpiImplInterface;
 class GpiIterator;
 class GpiCbHdl;
+class GpiValueCbMux;
 
 template<class To>
 inline To sim_to_hdl(gpi_sim_hdl input)
@@ -166,8 +167,9 @@ class GpiSignalObjHdl : public GpiObjHdl {
 public:
     GpiSignalObjHdl(GpiImplInterface *impl, void *hdl, gpi_objtype_t objtype, bool is_const) : 
                                                          GpiObjHdl(impl, hdl, objtype, is_const),
-                                                         m_length(0) { }
-    virtual ~GpiSignalObjHdl() { }
+                                                         m_length(0),
+                                                         m_value_cb_mux(NULL) { }
+    virtual ~GpiSignalObjHdl();
     // Provide public access to the implementation (composition vs inheritance)
     virtual const char* get_signal_value_binstr() = 0;
     virtual const char* get_signal_value_str() = 0;
@@ -183,6 +185,17 @@ public:
     // but the explicit ones are probably better
 
     virtual GpiCbHdl *value_change_cb(unsigned int edge) = 0;
+
+    // Edge callback sharing the one simulator value change callback of the signal
+    GpiCbHdl *edge_cb(unsigned int edge);
+    // Same for a callback run after the given number of edges
+    GpiCbHdl *edge_count_cb(unsigned int edge, uint32_t count);
+    // Same for a callback run on the first edge at which another signal matches a value
+    GpiCbHdl *edge_match_cb(unsigned int edge, GpiSignalObjHdl *signal,
+                            const std::string &value, const std::string &mask);
+
+private:
+    GpiValueCbMux *m_value_cb_mux;          // Created on the first edge callback
 };
 
 
@@ -227,14 +240,125 @@ protected:
     GpiSignalObjHdl *m_signal;
 };
 
-/* We would then have */
+/* GPI edge callback handle */
+// A callback on the rising, falling or either edge of a signal that is not
+// registered with the simulator itself. It is primed and removed through the
+// GpiValueCbMux of the signal.
+// An edge count callback only runs once the given number of edges have been
+// seen, and an edge match callback only on an edge at which another signal
+// has a given value. Both are checked without calling up, used once and then
+// deleted by the GpiValueCbMux.
+class GpiEdgeCbHdl : public GpiCbHdl {
+public:
+    GpiEdgeCbHdl(GpiImplInterface *impl, GpiValueCbMux *mux, unsigned int edge,
+                 uint32_t count = 0) : GpiCbHdl(impl),
+                                       m_edge(edge),
+                                       m_count(count),
+                                       m_one_shot(count != 0),
+                                       m_mux(mux),
+                                       m_match_signal(NULL) { }
+    virtual ~GpiEdgeCbHdl() { }
+    virtual int arm_callback();
+    virtual int cleanup_callback();
+
+    // Only run on an edge at which the bits of signal set in mask equal value
+    void set_match(GpiSignalObjHdl *signal, const std::string &value, const std::string &mask);
+    bool matches();
+
+    unsigned int m_edge;
+    uint32_t m_count;                       // Edges left to count
+    bool m_one_shot;                        // Is an edge count or edge match callback
+
+private:
+    GpiValueCbMux *m_mux;
+    GpiSignalObjHdl *m_match_signal;        // NULL if not matching a value
+    std::string m_match_value;              // Binary strings of the same length
+    std::string m_match_mask;
+};
+
+/* GPI value change multiplexer */
+// Holds the single simulator value change callback of a signal, which is
+// only registered while at least one of the edge callbacks is primed. When
+// the signal changes the value is read once and the primed edge callbacks
+// that match it are run, so waiting on the rising, falling and either edge
+// of a clock costs one simulator callback instead of three.
+class GpiValueCbMux {
+public:
+    GpiValueCbMux(GpiSignalObjHdl *signal) : m_signal(signal),
+                                             m_sim_cb(NULL),
+                                             m_num_primed(0),
+                                             m_in_callback(false),
+                                             m_rising_cb(signal->m_impl, this, GPI_RISING),
+                                             m_falling_cb(signal->m_impl, this, GPI_FALLING),
+                                             m_either_cb(signal->m_impl, this, GPI_RISING | GPI_FALLING) { }
+    ~GpiValueCbMux();
+
+    GpiCbHdl *edge_cb(unsigned int edge);
+    GpiCbHdl *edge_count_cb(unsigned int edge, uint32_t count);
+    GpiCbHdl *edge_match_cb(unsigned int edge, GpiSignalObjHdl *signal,
+                            const std::string &value, const std::string &mask);
+    int add_edge();
+    void remove_edge();
+    void remove_oneshot(GpiEdgeCbHdl *cb);
+    int run_edges();
+
+    // Simulator value change callbacks registered, and edge callbacks
+    // primed while one was already registered
+    static uint64_t num_registered;
+    static uint64_t num_shared;
+
+private:
+    GpiSignalObjHdl *m_signal;
+    GpiCbHdl *m_sim_cb;                     // Simulator value change callback
+    int m_num_primed;                       // Edge callbacks primed
+    bool m_in_callback;                     // Running the edge callbacks
+    GpiEdgeCbHdl m_rising_cb;
+    GpiEdgeCbHdl m_falling_cb;
+    GpiEdgeCbHdl m_either_cb;
+    std::vector<GpiEdgeCbHdl*> m_oneshot_cbs;  // Edge count and edge match callbacks
+
+    GpiCbHdl *add_oneshot(GpiEdgeCbHdl *cb);
+};
+
+/* GPI Clock handle */
+// Drives a signal with a clock entirely from within the simulator by
+// re-registering timed callbacks, so nothing above the GPI is called on
+// every edge. An optional user function is called once the requested
+// number of cycles has been driven.
 class GpiClockHdl {
 public:
-    GpiClockHdl(GpiObjHdl *clk) { }
-    GpiClockHdl(const char *clk) { }
+    GpiClockHdl(GpiSignalObjHdl *clk) : m_clk(clk),
+                                        m_timer(NULL),
+                                        m_period(0),
+                                        m_high_time(0),
+                                        m_phases_left(0),
+                                        m_value(0),
+                                        m_stopped(false),
+                                        gpi_function(NULL),
+                                        m_cb_data(NULL) { }
     ~GpiClockHdl() { }
-    int start_clock(const int period_ps) { return 0; } ; /* Do things with the GpiSignalObjHdl */
-    int stop_clock() { return 0; }
+
+    // A cycles value of 0 lets the clock run until stop_clock is called
+    int start_clock(uint64_t period, uint64_t high_time, bool start_high, uint64_t cycles);
+    // Returns 1 if a toggle is still pending, in which case the handle frees
+    // itself when it fires, 0 if the handle can be deleted straight away
+    int stop_clock();
+    int toggle();                           // Entry point from the timed callback
+
+    int set_user_data(int (*gpi_function)(const void*), const void *data);
+
+private:
+    int schedule_toggle();
+
+    GpiSignalObjHdl *m_clk;
+    GpiCbHdl *m_timer;                      // Pending toggle, NULL if none
+    uint64_t m_period;
+    uint64_t m_high_time;
+    uint64_t m_phases_left;                 // Half periods left to drive, 0 if free running
+    long m_value;
+    bool m_stopped;
+    int (*gpi_function)(const void *);      // Called when all cycles have been driven
+    const void *m_cb_data;
 };
 
 class GpiIterator : public GpiHdl {
@@ -147,8 +147,16 @@ int handle_gpi_callback(void *user_data)
         goto out;
     }
 
-    // Call the callback
-    PyObject *pValue = PyObject_Call(callback_data_p->function, callback_data_p->args, callback_data_p->kwargs);
+    // Call the callback, a callback record is called with its owner which
+    // must be kept alive until the call returns
+    PyObject *owner = callback_data_p->owner;
+    PyObject *pValue;
+    if (owner) {
+        Py_INCREF(owner);
+        pValue = PyObject_CallFunctionObjArgs(callback_data_p->function, owner, NULL);
+    } else {
+        pValue = PyObject_Call(callback_data_p->function, callback_data_p->args, callback_data_p->kwargs);
+    }
 
     // If the return value is NULL a Python exception has occurred
     // The best thing to do here is shutdown as any subsequent
@@ -166,14 +174,14 @@ int handle_gpi_callback(void *user_data)
         gpi_sim_end();
         sim_ending = 1;
         ret = 0;
-        goto out;
+        goto release;
     }
 
     // Free up our mess
     Py_DECREF(pValue);
 
-    // Callbacks may have been re-enabled
-    if (callback_data_p->id_value == COCOTB_INACTIVE_ID) {
+    // Callbacks may have been re-enabled, callback records are reused
+    if (!owner && callback_data_p->id_value == COCOTB_INACTIVE_ID) {
         Py_DECREF(callback_data_p->function);
         Py_DECREF(callback_data_p->args);
 
@@ -181,6 +189,10 @@ int handle_gpi_callback(void *user_data)
         free(callback_data_p);
     }
 
+release:
+    // May delete the owner and its callback record
+    Py_XDECREF(owner);
+
 out:
     DROP_GIL(gstate);
 
@@ -213,37 +225,42 @@ static PyObject *log_msg(PyObject *self, PyObject *args)
 }
 
 
-// Register a callback for read-only state of sim
-// First argument is the function to call
-// Remaining arguments are keyword arguments to be passed to the callback
-static PyObject *register_readonly_callback(PyObject *self, PyObject *args)
+
+// Free a callback record once the trigger owning it is deleted
+static void free_callback_record(PyObject *capsule)
 {
-    FENTER
+    p_callback_data callback_data_p = (p_callback_data)PyCapsule_GetPointer(capsule, CALLBACK_RECORD_NAME);
 
-    PyObject *fArgs;
-    PyObject *function;
-    gpi_sim_hdl hdl;
+    if (callback_data_p == NULL) {
+        return;
+    }
 
-    p_callback_data callback_data_p;
+    if (callback_data_p->id_value == COCOTB_ACTIVE_ID) {
+        gpi_deregister_callback(callback_data_p->cb_hdl);
+    }
 
-    Py_ssize_t numargs = PyTuple_Size(args);
+    Py_DECREF(callback_data_p->function);
+    free(callback_data_p);
+}
 
-    if (numargs < 1) {
-        PyErr_SetString(PyExc_TypeError, "Attempt to register ReadOnly callback without enough arguments!\n");
-        return NULL;
-    }
 
-    // Extract the callback function
-    function = PyTuple_GetItem(args, 0);
-    if (!PyCallable_Check(function)) {
-        PyErr_SetString(PyExc_TypeError, "Attempt to register ReadOnly without supplying a callback!\n");
+// Create a callback record calling a function with the object owning it
+// First argument is the function to call
+// Second argument is the owner, which must keep the record for as long as it
+// is registered. The record does not hold a reference to the owner, so is
+// freed along with it.
+static PyObject *create_callback(PyObject *self, PyObject *args)
+{
+    PyObject *function;
+    PyObject *owner;
+    p_callback_data callback_data_p;
+
+    if (!PyArg_ParseTuple(args, "OO", &function, &owner)) {
         return NULL;
     }
-    Py_INCREF(function);
 
-    // Remaining args for function
-    fArgs = PyTuple_GetSlice(args, 1, numargs);   // New reference
-    if (fArgs == NULL) {
+    if (!PyCallable_Check(function)) {
+        PyErr_SetString(PyExc_TypeError, "Attempt to create a callback record without passing a callable callback!\n");
         return NULL;
     }
 
@@ -252,68 +269,145 @@ static PyObject *register_readonly_callback(PyObject *self, PyObject *args)
         return PyErr_NoMemory();
     }
 
-    // Set up the user data (no more Python API calls after this!)
-    callback_data_p->_saved_thread_state = PyThreadState_Get();
-    callback_data_p->id_value = COCOTB_ACTIVE_ID;
+    callback_data_p->_saved_thread_state = NULL;
+    callback_data_p->id_value = COCOTB_INACTIVE_ID;
     callback_data_p->function = function;
-    callback_data_p->args = fArgs;
+    callback_data_p->args = NULL;
     callback_data_p->kwargs = NULL;
+    callback_data_p->owner = owner;
+    callback_data_p->cb_hdl = NULL;
 
-    hdl = gpi_register_readonly_callback((gpi_function_t)handle_gpi_callback, callback_data_p);
-
-    PyObject *rv = PyLong_FromVoidPtr(hdl);
-    FEXIT
+    PyObject *rv = PyCapsule_New(callback_data_p, CALLBACK_RECORD_NAME, free_callback_record);
+    if (rv == NULL) {
+        free(callback_data_p);
+        return NULL;
+    }
 
+    Py_INCREF(function);
     return rv;
 }
 
 
-static PyObject *register_rwsynch_callback(PyObject *self, PyObject *args)
+// Get the callback data to register for function
+// This is either a callback record from create_callback, which is reused, or
+// the function to call with the arguments from args_index on, which are copied
+// into new callback data that is freed once the callback has fired.
+static p_callback_data get_callback_data(PyObject *function, PyObject *args, Py_ssize_t args_index,
+                                         const char *kind)
 {
-    FENTER
+    p_callback_data callback_data_p;
 
-    PyObject *fArgs;
-    PyObject *function;
-    gpi_sim_hdl hdl;
+    if (PyCapsule_CheckExact(function)) {
+        callback_data_p = (p_callback_data)PyCapsule_GetPointer(function, CALLBACK_RECORD_NAME);
+        if (callback_data_p == NULL) {
+            return NULL;
+        }
+        if (callback_data_p->id_value == COCOTB_ACTIVE_ID) {
+            PyErr_Format(PyExc_RuntimeError, "Attempt to register %s with a callback record that is already registered", kind);
+            return NULL;
+        }
+    } else {
+        if (!PyCallable_Check(function)) {
+            PyErr_Format(PyExc_TypeError, "Attempt to register %s without passing a callable callback!\n", kind);
+            return NULL;
+        }
+
+        // Remaining args for function
+        PyObject *fArgs = PyTuple_GetSlice(args, args_index, PyTuple_Size(args));   // New reference
+        if (fArgs == NULL) {
+            return NULL;
+        }
+
+        callback_data_p = (p_callback_data)malloc(sizeof(s_callback_data));
+        if (callback_data_p == NULL) {
+            Py_DECREF(fArgs);
+            PyErr_NoMemory();
+            return NULL;
+        }
+
+        Py_INCREF(function);
+        callback_data_p->function = function;
+        callback_data_p->args = fArgs;
+        callback_data_p->kwargs = NULL;
+        callback_data_p->owner = NULL;
+    }
+
+    // Set up the user data (no more Python API calls after this!)
+    callback_data_p->_saved_thread_state = PyThreadState_Get();
+    callback_data_p->id_value = COCOTB_ACTIVE_ID;
+    return callback_data_p;
+}
+
+
+// Record the GPI handle of a registered callback, or undo get_callback_data if
+// the registration failed
+static PyObject *registered_callback(p_callback_data callback_data_p, gpi_sim_hdl hdl)
+{
+    callback_data_p->cb_hdl = hdl;
+
+    if (hdl == NULL) {
+        callback_data_p->id_value = COCOTB_INACTIVE_ID;
+        if (!callback_data_p->owner) {
+            Py_DECREF(callback_data_p->function);
+            Py_DECREF(callback_data_p->args);
+            free(callback_data_p);
+        }
+    }
+
+    return PyLong_FromVoidPtr(hdl);
+}
+
+// Register a callback for read-only state of sim
+// First argument is the function to call
+// Remaining arguments are keyword arguments to be passed to the callback
+static PyObject *register_readonly_callback(PyObject *self, PyObject *args)
+{
+    FENTER
 
     p_callback_data callback_data_p;
 
     Py_ssize_t numargs = PyTuple_Size(args);
 
     if (numargs < 1) {
-        PyErr_SetString(PyExc_TypeError, "Attempt to register ReadWrite callback without enough arguments!\n");
+        PyErr_SetString(PyExc_TypeError, "Attempt to register ReadOnly callback without enough arguments!\n");
         return NULL;
     }
 
-    // Extract the callback function
-    function = PyTuple_GetItem(args, 0);
-    if (!PyCallable_Check(function)) {
-        PyErr_SetString(PyExc_TypeError, "Attempt to register ReadWrite without supplying a callback!\n");
+    callback_data_p = get_callback_data(PyTuple_GetItem(args, 0), args, 1, "ReadOnly");
+    if (callback_data_p == NULL) {
         return NULL;
     }
-    Py_INCREF(function);
 
-    // Remaining args for function
-    fArgs = PyTuple_GetSlice(args, 1, numargs);   // New reference
-    if (fArgs == NULL) {
+    gpi_sim_hdl hdl = gpi_register_readonly_callback((gpi_function_t)handle_gpi_callback, callback_data_p);
+
+    PyObject *rv = registered_callback(callback_data_p, hdl);
+    FEXIT
+
+    return rv;
+}
+
+
+static PyObject *register_rwsynch_callback(PyObject *self, PyObject *args)
+{
+    FENTER
+
+    p_callback_data callback_data_p;
+
+    Py_ssize_t numargs = PyTuple_Size(args);
+
+    if (numargs < 1) {
+        PyErr_SetString(PyExc_TypeError, "Attempt to register ReadWrite callback without enough arguments!\n");
         return NULL;
     }
 
-    callback_data_p = (p_callback_data)malloc(sizeof(s_callback_data));
+    callback_data_p = get_callback_data(PyTuple_GetItem(args, 0), args, 1, "ReadWrite");
     if (callback_data_p == NULL) {
-        return PyErr_NoMemory();
+        return NULL;
     }
 
-    // Set up the user data (no more Python API calls after this!)
-    callback_data_p->_saved_thread_state = PyThreadState_Get();
-    callback_data_p->id_value = COCOTB_ACTIVE_ID;
-    callback_data_p->function = function;
-    callback_data_p->args = fArgs;
-    callback_data_p->kwargs = NULL;
-
-    hdl = gpi_register_readwrite_callback((gpi_function_t)handle_gpi_callback, callback_data_p);
+    gpi_sim_hdl hdl = gpi_register_readwrite_callback((gpi_function_t)handle_gpi_callback, callback_data_p);
 
-    PyObject *rv = PyLong_FromVoidPtr(hdl);
+    PyObject *rv = registered_callback(callback_data_p, hdl);
     FEXIT
 
     return rv;
@@ -324,10 +418,6 @@ static PyObject *register_nextstep_callback(PyObject *self, PyObject *args)
 {
     FENTER
 
-    PyObject *fArgs;
-    PyObject *function;
-    gpi_sim_hdl hdl;
-
     p_callback_data callback_data_p;
 
     Py_ssize_t numargs = PyTuple_Size(args);
@@ -337,35 +427,14 @@ static PyObject *register_nextstep_callback(PyObject *self, PyObject *args)
         return NULL;
     }
 
-    // Extract the callback function
-    function = PyTuple_GetItem(args, 0);
-    if (!PyCallable_Check(function)) {
-        PyErr_SetString(PyExc_TypeError, "Attempt to register NextStep without supplying a callback!\n");
-        return NULL;
-    }
-    Py_INCREF(function);
-
-    // Remaining args for function
-    fArgs = PyTuple_GetSlice(args, 1, numargs);   // New reference
-    if (fArgs == NULL) {
-        return NULL;
-    }
-
-    callback_data_p = (p_callback_data)malloc(sizeof(s_callback_data));
+    callback_data_p = get_callback_data(PyTuple_GetItem(args, 0), args, 1, "NextStep");
     if (callback_data_p == NULL) {
-        return PyErr_NoMemory();
+        return NULL;
     }
 
-    // Set up the user data (no more Python API calls after this!)
-    callback_data_p->_saved_thread_state = PyThreadState_Get();
-    callback_data_p->id_value = COCOTB_ACTIVE_ID;
-    callback_data_p->function = function;
-    callback_data_p->args = fArgs;
-    callback_data_p->kwargs = NULL;
-
-    hdl = gpi_register_nexttime_callback((gpi_function_t)handle_gpi_callback, callback_data_p);
+    gpi_sim_hdl hdl = gpi_register_nexttime_callback((gpi_function_t)handle_gpi_callback, callback_data_p);
 
-    PyObject *rv = PyLong_FromVoidPtr(hdl);
+    PyObject *rv = registered_callback(callback_data_p, hdl);
     FEXIT
 
     return rv;
@@ -380,9 +449,6 @@ static PyObject *register_timed_callback(PyObject *self, PyObject *args)
 {
     FENTER
 
-    PyObject *fArgs;
-    PyObject *function;
-    gpi_sim_hdl hdl;
     uint64_t time_ps;
 
     p_callback_data callback_data_p;
@@ -398,36 +464,15 @@ static PyObject *register_timed_callback(PyObject *self, PyObject *args)
     PyObject *pTime = PyTuple_GetItem(args, 0);
     time_ps = PyLong_AsLongLong(pTime);
 
-    // Extract the callback function
-    function = PyTuple_GetItem(args, 1);
-    if (!PyCallable_Check(function)) {
-        PyErr_SetString(PyExc_TypeError, "Attempt to register timed callback without passing a callable callback!\n");
+    callback_data_p = get_callback_data(PyTuple_GetItem(args, 1), args, 2, "timed callback");
+    if (callback_data_p == NULL) {
         return NULL;
     }
-    Py_INCREF(function);
 
-    // Remaining args for function
-    fArgs = PyTuple_GetSlice(args, 2, numargs);   // New reference
-    if (fArgs == NULL) {
-        return NULL;
-    }
-
-    callback_data_p = (p_callback_data)malloc(sizeof(s_callback_data));
-    if (callback_data_p == NULL) {
-        return PyErr_NoMemory();
-    }
-
-    // Set up the user data (no more Python API calls after this!)
-    callback_data_p->_saved_thread_state = PyThreadState_Get();
-    callback_data_p->id_value = COCOTB_ACTIVE_ID;
-    callback_data_p->function = function;
-    callback_data_p->args = fArgs;
-    callback_data_p->kwargs = NULL;
-
-    hdl = gpi_register_timed_callback((gpi_function_t)handle_gpi_callback, callback_data_p, time_ps);
+    gpi_sim_hdl hdl = gpi_register_timed_callback((gpi_function_t)handle_gpi_callback, callback_data_p, time_ps);
 
     // Check success
-    PyObject *rv = PyLong_FromVoidPtr(hdl);
+    PyObject *rv = registered_callback(callback_data_p, hdl);
     FEXIT
 
     return rv;
@@ -437,15 +482,13 @@ static PyObject *register_timed_callback(PyObject *self, PyObject *args)
 // Register signal change callback
 // First argument should be the signal handle
 // Second argument is the function to call
+// Third argument is the edge
 // Remaining arguments and keyword arguments are to be passed to the callback
 static PyObject *register_value_change_callback(PyObject *self, PyObject *args) //, PyObject *keywds)
 {
     FENTER
 
-    PyObject *fArgs;
-    PyObject *function;
     gpi_sim_hdl sig_hdl;
-    gpi_sim_hdl hdl;
     unsigned int edge;
 
     p_callback_data callback_data_p;
@@ -462,44 +505,135 @@ static PyObject *register_value_change_callback(PyObject *self, PyObject *args)
         return NULL;
     }
 
-    // Extract the callback function
-    function = PyTuple_GetItem(args, 1);
-    if (!PyCallable_Check(function)) {
-        PyErr_SetString(PyExc_TypeError, "Attempt to register value change callback without passing a callable callback!\n");
+    PyObject *pedge = PyTuple_GetItem(args, 2);
+    edge = (unsigned int)PyLong_AsLong(pedge);
+
+    callback_data_p = get_callback_data(PyTuple_GetItem(args, 1), args, 3, "value change callback");
+    if (callback_data_p == NULL) {
         return NULL;
     }
-    Py_INCREF(function);
 
-    PyObject *pedge = PyTuple_GetItem(args, 2);
-    edge = (unsigned int)PyLong_AsLong(pedge);
+    gpi_sim_hdl hdl = gpi_register_value_change_callback((gpi_function_t)handle_gpi_callback,
+                                                         callback_data_p,
+                                                         sig_hdl,
+                                                         edge);
+
+    // Check success
+    PyObject *rv = registered_callback(callback_data_p, hdl);
+    FEXIT
+
+    return rv;
+}
 
-    // Remaining args for function
-    fArgs = PyTuple_GetSlice(args, 3, numargs);   // New reference
-    if (fArgs == NULL) {
+
+// Register a callback run after a number of edges of a signal
+// First argument should be the signal handle
+// Second argument is the function to call
+// Third argument is the edge and the fourth the number of edges to count
+// Remaining arguments are to be passed to the callback
+static PyObject *register_edge_count_callback(PyObject *self, PyObject *args)
+{
+    FENTER
+
+    gpi_sim_hdl sig_hdl;
+    unsigned int edge;
+    unsigned long count;
+
+    p_callback_data callback_data_p;
+
+    Py_ssize_t numargs = PyTuple_Size(args);
+
+    if (numargs < 4) {
+        PyErr_SetString(PyExc_TypeError, "Attempt to register edge count callback without enough arguments!\n");
         return NULL;
     }
 
+    PyObject *pSihHdl = PyTuple_GetItem(args, 0);
+    if (!gpi_sim_hdl_converter(pSihHdl, &sig_hdl)) {
+        return NULL;
+    }
 
-    callback_data_p = (p_callback_data)malloc(sizeof(s_callback_data));
+    edge = (unsigned int)PyLong_AsLong(PyTuple_GetItem(args, 2));
+    count = PyLong_AsUnsignedLong(PyTuple_GetItem(args, 3));
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+    if (count == 0 || count > UINT32_MAX) {
+        PyErr_SetString(PyExc_ValueError, "Edge count must be between 1 and 2**32-1");
+        return NULL;
+    }
+
+    callback_data_p = get_callback_data(PyTuple_GetItem(args, 1), args, 4, "edge count callback");
     if (callback_data_p == NULL) {
-        return PyErr_NoMemory();
+        return NULL;
     }
 
-    // Set up the user data (no more Python API calls after this!)
-    // Causes segfault?
-    callback_data_p->_saved_thread_state = PyThreadState_Get();//PyThreadState_Get();
-    callback_data_p->id_value = COCOTB_ACTIVE_ID;
-    callback_data_p->function = function;
-    callback_data_p->args = fArgs;
-    callback_data_p->kwargs = NULL;
+    gpi_sim_hdl hdl = gpi_register_edge_count_callback((gpi_function_t)handle_gpi_callback,
+                                                       callback_data_p,
+                                                       sig_hdl,
+                                                       edge,
+                                                       (uint32_t)count);
+
+    // Check success
+    PyObject *rv = registered_callback(callback_data_p, hdl);
+    FEXIT
+
+    return rv;
+}
 
-    hdl = gpi_register_value_change_callback((gpi_function_t)handle_gpi_callback,
-                                             callback_data_p,
-                                             sig_hdl,
-                                             edge);
+
+static PyObject *register_value_match_callback(PyObject *self, PyObject *args)
+{
+    FENTER
+
+    gpi_sim_hdl edge_hdl;
+    gpi_sim_hdl sig_hdl;
+    unsigned int edge;
+    const char *value;
+    const char *mask;
+
+    p_callback_data callback_data_p;
+
+    Py_ssize_t numargs = PyTuple_Size(args);
+
+    if (numargs < 6) {
+        PyErr_SetString(PyExc_TypeError, "Attempt to register value match callback without enough arguments!\n");
+        return NULL;
+    }
+
+    if (!gpi_sim_hdl_converter(PyTuple_GetItem(args, 0), &edge_hdl) ||
+        !gpi_sim_hdl_converter(PyTuple_GetItem(args, 3), &sig_hdl)) {
+        return NULL;
+    }
+
+    edge = (unsigned int)PyLong_AsLong(PyTuple_GetItem(args, 2));
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+    if (!PyArg_Parse(PyTuple_GetItem(args, 4), "s", &value) ||
+        !PyArg_Parse(PyTuple_GetItem(args, 5), "s", &mask)) {
+        return NULL;
+    }
+    if (strlen(value) != strlen(mask)) {
+        PyErr_SetString(PyExc_ValueError, "Value and mask must have the same length");
+        return NULL;
+    }
+
+    callback_data_p = get_callback_data(PyTuple_GetItem(args, 1), args, 6, "value match callback");
+    if (callback_data_p == NULL) {
+        return NULL;
+    }
+
+    gpi_sim_hdl hdl = gpi_register_value_match_callback((gpi_function_t)handle_gpi_callback,
+                                                        callback_data_p,
+                                                        edge_hdl,
+                                                        edge,
+                                                        sig_hdl,
+                                                        value,
+                                                        mask);
 
     // Check success
-    PyObject *rv = PyLong_FromVoidPtr(hdl);
+    PyObject *rv = registered_callback(callback_data_p, hdl);
     FEXIT
 
     return rv;
@@ -621,6 +755,78 @@ static PyObject *get_signal_val_long(PyObject *self, PyObject *args)
     return retval;
 }
 
+// Read the values of a sequence of handles with a single call
+// First argument should be the sequence of handles
+// Second argument is the format of the values, one of "binstr", "str",
+// "real" or "long", as returned by the get_signal_val_* functions
+static PyObject *get_signal_vals(PyObject *self, PyObject *args)
+{
+    PyObject *handles;
+    PyObject *seq;
+    PyObject *retval;
+    const char *format;
+    Py_ssize_t i, numhdls;
+    gpi_sim_hdl hdl;
+
+    if (!PyArg_ParseTuple(args, "Os", &handles, &format)) {
+        return NULL;
+    }
+
+    if (strcmp(format, "binstr") && strcmp(format, "str") &&
+        strcmp(format, "real") && strcmp(format, "long")) {
+        PyErr_Format(PyExc_ValueError, "Unknown value format %s", format);
+        return NULL;
+    }
+
+    seq = PySequence_Fast(handles, "Expected a sequence of handles");   // New reference
+    if (seq == NULL) {
+        return NULL;
+    }
+
+    numhdls = PySequence_Fast_GET_SIZE(seq);
+    retval = PyTuple_New(numhdls);
+    if (retval == NULL) {
+        Py_DECREF(seq);
+        return NULL;
+    }
+
+    for (i = 0; i < numhdls; i++) {
+        PyObject *value;
+
+        if (!gpi_sim_hdl_converter(PySequence_Fast_GET_ITEM(seq, i), &hdl)) {
+            Py_DECREF(retval);
+            Py_DECREF(seq);
+            return NULL;
+        }
+
+        switch (format[0]) {
+            case 'b':
+                value = Py_BuildValue("s", gpi_get_signal_value_binstr(hdl));
+                break;
+            case 's':
+                value = Py_BuildValue("s", gpi_get_signal_value_str(hdl));
+                break;
+            case 'r':
+                value = Py_BuildValue("d", gpi_get_signal_value_real(hdl));
+                break;
+            default:
+                value = Py_BuildValue("l", gpi_get_signal_value_long(hdl));
+                break;
+        }
+
+        if (value == NULL) {
+            Py_DECREF(retval);
+            Py_DECREF(seq);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(retval, i, value);   // Steals the reference
+    }
+
+    Py_DECREF(seq);
+    return retval;
+}
+
+
 
 static PyObject *set_signal_val_str(PyObject *self, PyObject *args)
 {
@@ -670,6 +876,72 @@ static PyObject *set_signal_val_long(PyObject *self, PyObject *args)
     return res;
 }
 
+// Set the values of several signals with a single call
+// The argument should be a sequence of (handle, kind, value) tuples, where
+// kind is one of "long", "real" or "str" and selects the set_signal_val_*
+// function the value is written with
+static PyObject *set_signal_vals(PyObject *self, PyObject *args)
+{
+    PyObject *writes;
+    PyObject *seq;
+    PyObject *res;
+    Py_ssize_t i, numwrites;
+
+    if (!PyArg_ParseTuple(args, "O", &writes)) {
+        return NULL;
+    }
+
+    seq = PySequence_Fast(writes, "Expected a sequence of writes");   // New reference
+    if (seq == NULL) {
+        return NULL;
+    }
+
+    numwrites = PySequence_Fast_GET_SIZE(seq);
+    for (i = 0; i < numwrites; i++) {
+        gpi_sim_hdl hdl;
+        const char *kind;
+        PyObject *value;
+        long long_value;
+        double real_value;
+        const char *str_value;
+
+        if (!PyArg_ParseTuple(PySequence_Fast_GET_ITEM(seq, i), "O&sO",
+                              gpi_sim_hdl_converter, &hdl, &kind, &value)) {
+            Py_DECREF(seq);
+            return NULL;
+        }
+
+        if (!strcmp(kind, "long")) {
+            if (!PyArg_Parse(value, "l", &long_value)) {
+                Py_DECREF(seq);
+                return NULL;
+            }
+            gpi_set_signal_value_long(hdl, long_value);
+        } else if (!strcmp(kind, "real")) {
+            if (!PyArg_Parse(value, "d", &real_value)) {
+                Py_DECREF(seq);
+                return NULL;
+            }
+            gpi_set_signal_value_real(hdl, real_value);
+        } else if (!strcmp(kind, "str")) {
+            if (!PyArg_Parse(value, "s", &str_value)) {
+                Py_DECREF(seq);
+                return NULL;
+            }
+            gpi_set_signal_value_str(hdl, str_value);
+        } else {
+            PyErr_Format(PyExc_ValueError, "Unknown write kind %s", kind);
+            Py_DECREF(seq);
+            return NULL;
+        }
+    }
+
+    Py_DECREF(seq);
+    res = Py_BuildValue("s", "OK!");
+
+    return res;
+}
+
 static PyObject *get_definition_name(PyObject *self, PyObject *args)
 {
     const char* result;
@@ -738,6 +1010,70 @@ static PyObject *get_handle_by_index(PyObject *self, PyObject *args)
     return value;
 }
 
+static PyObject *get_handle_by_path(PyObject *self, PyObject *args)
+{
+    gpi_sim_hdl hdl;
+    PyObject *path;
+
+    if (!PyArg_ParseTuple(args, "O&O", gpi_sim_hdl_converter, &hdl, &path)) {
+        return NULL;
+    }
+
+    PyObject *parts = PySequence_Fast(path, "Path must be a sequence of names and indices");
+    if (parts == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t num_parts = PySequence_Fast_GET_SIZE(parts);
+    PyObject *found = PyList_New(0);
+    if (found == NULL) {
+        Py_DECREF(parts);
+        return NULL;
+    }
+
+    // Walk down the path, returning the objects found up to the first missing one
+    for (Py_ssize_t i = 0; i < num_parts; i++) {
+        PyObject *part = PySequence_Fast_GET_ITEM(parts, i);
+
+        if (PyUnicode_Check(part) || PyBytes_Check(part)) {
+            const char *name;
+            if (!PyArg_Parse(part, "s", &name)) {
+                goto error;
+            }
+            hdl = gpi_get_handle_by_name(hdl, name);
+        } else {
+            long index = PyLong_AsLong(part);
+            if (index == -1 && PyErr_Occurred()) {
+                goto error;
+            }
+            hdl = gpi_get_handle_by_index(hdl, (int32_t)index);
+        }
+
+        if (hdl == NULL) {
+            break;
+        }
+
+        PyObject *info = Py_BuildValue("(Nsii)",
+                                       PyLong_FromVoidPtr(hdl),
+                                       gpi_get_signal_name_str(hdl),
+                                       (int)gpi_get_object_type(hdl),
+                                       gpi_is_constant(hdl));
+        if (info == NULL || PyList_Append(found, info) < 0) {
+            Py_XDECREF(info);
+            goto error;
+        }
+        Py_DECREF(info);
+    }
+
+    Py_DECREF(parts);
+    return found;
+
+error:
+    Py_DECREF(parts);
+    Py_DECREF(found);
+    return NULL;
+}
+
 static PyObject *get_root_handle(PyObject *self, PyObject *args)
 {
     const char *name;
@@ -808,6 +1144,20 @@ static PyObject *get_const(PyObject *self, PyObject *args)
     return pyresult;
 }
 
+static PyObject *get_handle_info(PyObject *self, PyObject *args)
+{
+    gpi_sim_hdl hdl;
+
+    if (!PyArg_ParseTuple(args, "O&", gpi_sim_hdl_converter, &hdl)) {
+        return NULL;
+    }
+
+    return Py_BuildValue("(sii)",
+                         gpi_get_signal_name_str(hdl),
+                         (int)gpi_get_object_type(hdl),
+                         gpi_is_constant(hdl));
+}
+
 static PyObject *get_type_string(PyObject *self, PyObject *args)
 {
     const char *result;
@@ -901,6 +1251,127 @@ static PyObject *stop_simulator(PyObject *self, PyObject *args)
 }
 
 
+// Start a clock driven from within the simulator
+// First argument should be the signal handle
+// Then the period and high time in simulator steps, whether to start high and
+// the number of cycles to drive (0 for a free running clock)
+// Optionally a function to call once all the cycles have been driven, followed
+// by the arguments to pass to it
+static PyObject *create_clock(PyObject *self, PyObject *args)
+{
+    FENTER
+
+    PyObject *fArgs = NULL;
+    PyObject *function = NULL;
+    gpi_sim_hdl sig_hdl;
+    gpi_sim_hdl hdl;
+    uint64_t period;
+    uint64_t high_time;
+    int start_high;
+    uint64_t cycles;
+
+    p_callback_data callback_data_p = NULL;
+
+    Py_ssize_t numargs = PyTuple_Size(args);
+
+    if (numargs < 5) {
+        PyErr_SetString(PyExc_TypeError, "Attempt to create a clock without enough arguments!\n");
+        return NULL;
+    }
+
+    PyObject *pSihHdl = PyTuple_GetItem(args, 0);
+    if (!gpi_sim_hdl_converter(pSihHdl, &sig_hdl)) {
+        return NULL;
+    }
+
+    period = PyLong_AsUnsignedLongLong(PyTuple_GetItem(args, 1));
+    high_time = PyLong_AsUnsignedLongLong(PyTuple_GetItem(args, 2));
+    start_high = PyObject_IsTrue(PyTuple_GetItem(args, 3));
+    cycles = PyLong_AsUnsignedLongLong(PyTuple_GetItem(args, 4));
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+
+    if (numargs > 5) {
+        // Extract the callback function
+        function = PyTuple_GetItem(args, 5);
+        if (!PyCallable_Check(function)) {
+            PyErr_SetString(PyExc_TypeError, "Attempt to create a clock without passing a callable callback!\n");
+            return NULL;
+        }
+        Py_INCREF(function);
+
+        // Remaining args for function
+        fArgs = PyTuple_GetSlice(args, 6, numargs);   // New reference
+        if (fArgs == NULL) {
+            Py_DECREF(function);
+            return NULL;
+        }
+
+        callback_data_p = (p_callback_data)malloc(sizeof(s_callback_data));
+        if (callback_data_p == NULL) {
+            Py_DECREF(fArgs);
+            Py_DECREF(function);
+            return PyErr_NoMemory();
+        }
+
+        // Set up the user data (no more Python API calls after this!)
+        callback_data_p->_saved_thread_state = PyThreadState_Get();
+        callback_data_p->id_value = COCOTB_ACTIVE_ID;
+        callback_data_p->function = function;
+        callback_data_p->args = fArgs;
+        callback_data_p->kwargs = NULL;
+        callback_data_p->owner = NULL;
+        callback_data_p->cb_hdl = NULL;
+    }
+
+    hdl = gpi_create_clock(function ? (gpi_function_t)handle_gpi_callback : NULL, callback_data_p,
+                           sig_hdl, period, high_time, start_high, cycles);
+    if (hdl == NULL) {
+        if (callback_data_p) {
+            Py_DECREF(fArgs);
+            Py_DECREF(function);
+            free(callback_data_p);
+        }
+        PyErr_SetString(PyExc_RuntimeError, "Unable to create a clock");
+        return NULL;
+    }
+
+    PyObject *rv = PyLong_FromVoidPtr(hdl);
+    FEXIT
+
+    return rv;
+}
+
+
+static PyObject *stop_clock(PyObject *self, PyObject *args)
+{
+    gpi_sim_hdl hdl;
+    PyObject *value;
+
+    FENTER
+
+    if (!PyArg_ParseTuple(args, "O&", gpi_sim_hdl_converter, &hdl)) {
+        return NULL;
+    }
+
+    gpi_stop_clock(hdl);
+
+    value = Py_BuildValue("s", "OK!");
+
+    FEXIT
+    return value;
+}
+
+static PyObject *get_value_change_stats(PyObject *self, PyObject *args)
+{
+    uint64_t registered, shared;
+
+    gpi_get_value_change_stats(&registered, &shared);
+
+    return Py_BuildValue("(KK)", (unsigned long long)registered, (unsigned long long)shared);
+}
+
 static PyObject *deregister_callback(PyObject *self, PyObject *args)
 {
     gpi_sim_hdl hdl;
@@ -912,6 +1383,12 @@ static PyObject *deregister_callback(PyObject *self, PyObject *args)
         return NULL;
     }
 
+    // A callback record can be registered again once it has been removed
+    p_callback_data callback_data_p = (p_callback_data)gpi_get_callback_data(hdl);
+    if (callback_data_p && callback_data_p->owner && callback_data_p->cb_hdl == hdl) {
+        callback_data_p->id_value = COCOTB_INACTIVE_ID;
+    }
+
     gpi_deregister_callback(hdl);
 
     value = Py_BuildValue("s", "OK!");
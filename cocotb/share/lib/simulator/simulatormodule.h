@@ -49,9 +49,12 @@ typedef struct t_callback_data {
     PyObject *function;                 // Function to call when the callback fires
     PyObject *args;                     // The arguments to call the function with
     PyObject *kwargs;                   // Keyword arguments to call the function with
-    gpi_sim_hdl cb_hdl;
+    PyObject *owner;                    // Owner of a callback record, the function is called with it
+    gpi_sim_hdl cb_hdl;                 // Handle of the registered callback
 } s_callback_data, *p_callback_data;
 
+#define CALLBACK_RECORD_NAME "simulator.callback_record"   // Capsule name of callback records
+
 static PyObject *error_out(PyObject *m);
 static PyObject *log_msg(PyObject *self, PyObject *args);
 
@@ -61,22 +64,29 @@ static PyObject *get_signal_val_long(PyObject *self, PyObject *args);
 static PyObject *get_signal_val_real(PyObject *self, PyObject *args);
 static PyObject *get_signal_val_str(PyObject *self, PyObject *args);
 static PyObject *get_signal_val_binstr(PyObject *self, PyObject *args);
+static PyObject *get_signal_vals(PyObject *self, PyObject *args);
 static PyObject *set_signal_val_long(PyObject *self, PyObject *args);
 static PyObject *set_signal_val_real(PyObject *self, PyObject *args);
 static PyObject *set_signal_val_str(PyObject *self, PyObject *args);
+static PyObject *set_signal_vals(PyObject *self, PyObject *args);
 static PyObject *get_definition_name(PyObject *self, PyObject *args);
 static PyObject *get_definition_file(PyObject *self, PyObject *args);
 static PyObject *get_handle_by_name(PyObject *self, PyObject *args);
 static PyObject *get_handle_by_index(PyObject *self, PyObject *args);
+static PyObject *get_handle_by_path(PyObject *self, PyObject *args);
 static PyObject *get_root_handle(PyObject *self, PyObject *args);
 static PyObject *get_name_string(PyObject *self, PyObject *args);
 static PyObject *get_type(PyObject *self, PyObject *args);
 static PyObject *get_const(PyObject *self, PyObject *args);
 static PyObject *get_type_string(PyObject *self, PyObject *args);
+static PyObject *get_handle_info(PyObject *self, PyObject *args);
 static PyObject *get_num_elems(PyObject *self, PyObject *args);
 static PyObject *get_range(PyObject *self, PyObject *args);
+static PyObject *create_callback(PyObject *self, PyObject *args);
 static PyObject *register_timed_callback(PyObject *self, PyObject *args);
 static PyObject *register_value_change_callback(PyObject *self, PyObject *args);
+static PyObject *register_edge_count_callback(PyObject *self, PyObject *args);
+static PyObject *register_value_match_callback(PyObject *self, PyObject *args);
 static PyObject *register_readonly_callback(PyObject *self, PyObject *args);
 static PyObject *register_nextstep_callback(PyObject *self, PyObject *args);
 static PyObject *register_rwsynch_callback(PyObject *self, PyObject *args);
@@ -88,6 +98,9 @@ static PyObject *next(PyObject *self, PyObject *args);
 static PyObject *get_sim_time(PyObject *self, PyObject *args);
 static PyObject *get_precision(PyObject *self, PyObject *args);
 static PyObject *deregister_callback(PyObject *self, PyObject *args);
+static PyObject *create_clock(PyObject *self, PyObject *args);
+static PyObject *stop_clock(PyObject *self, PyObject *args);
+static PyObject *get_value_change_stats(PyObject *self, PyObject *args);
 
 static PyObject *log_level(PyObject *self, PyObject *args);
 
@@ -97,22 +110,29 @@ static PyMethodDef SimulatorMethods[] = {
     {"get_signal_val_str", get_signal_val_str, METH_VARARGS, "Get the value of a signal as an ASCII string"},
     {"get_signal_val_binstr", get_signal_val_binstr, METH_VARARGS, "Get the value of a signal as a binary string"},
     {"get_signal_val_real", get_signal_val_real, METH_VARARGS, "Get the value of a signal as a double precision float"},
+    {"get_signal_vals", get_signal_vals, METH_VARARGS, "Get the values of a sequence of signals in the given format as a tuple"},
     {"set_signal_val_long", set_signal_val_long, METH_VARARGS, "Set the value of a signal using a long"},
     {"set_signal_val_str", set_signal_val_str, METH_VARARGS, "Set the value of a signal using a binary string"},
     {"set_signal_val_real", set_signal_val_real, METH_VARARGS, "Set the value of a signal using a double precision float"},
+    {"set_signal_vals", set_signal_vals, METH_VARARGS, "Set the values of a sequence of signals from (handle, kind, value) tuples"},
     {"get_definition_name", get_definition_name, METH_VARARGS, "Get the name of a GPI object's definition"},
     {"get_definition_file", get_definition_file, METH_VARARGS, "Get the file that sources the object's definition"},
     {"get_handle_by_name", get_handle_by_name, METH_VARARGS, "Get handle of a named object"},
     {"get_handle_by_index", get_handle_by_index, METH_VARARGS, "Get handle of a object at an index in a parent"},
+    {"get_handle_by_path", get_handle_by_path, METH_VARARGS, "Walk a path of names and indices, returning the handle, name, type and constant flag of each object found"},
     {"get_root_handle", get_root_handle, METH_VARARGS, "Get the root handle"},
     {"get_name_string", get_name_string, METH_VARARGS, "Get the name of an object as a string"},
     {"get_type_string", get_type_string, METH_VARARGS, "Get the type of an object as a string"},
     {"get_type", get_type, METH_VARARGS, "Get the type of an object, mapped to a GPI enumeration"},
     {"get_const", get_const, METH_VARARGS, "Get a flag indicating whether the object is a constant"},
+    {"get_handle_info", get_handle_info, METH_VARARGS, "Get the name, type and constant flag of an object in one call"},
     {"get_num_elems", get_num_elems, METH_VARARGS, "Get the number of elements contained in the handle"},
     {"get_range", get_range, METH_VARARGS, "Get the range of elements (tuple) contained in the handle, returns None if not indexable"},
+    {"create_callback", create_callback, METH_VARARGS, "Create a reusable callback record to register in place of a function"},
     {"register_timed_callback", register_timed_callback, METH_VARARGS, "Register a timed callback"},
     {"register_value_change_callback", register_value_change_callback, METH_VARARGS, "Register a signal change callback"},
+    {"register_edge_count_callback", register_edge_count_callback, METH_VARARGS, "Register a callback after a number of edges of a signal"},
+    {"register_value_match_callback", register_value_match_callback, METH_VARARGS, "Register a callback on the first edge of a signal at which another signal matches a value"},
     {"register_readonly_callback", register_readonly_callback, METH_VARARGS, "Register a callback for the read-only section"},
     {"register_nextstep_callback", register_nextstep_callback, METH_VARARGS, "Register a callback for the NextSimTime callback"},
     {"register_rwsynch_callback", register_rwsynch_callback, METH_VARARGS, "Register a callback for the read-write section"},
@@ -125,6 +145,9 @@ static PyMethodDef SimulatorMethods[] = {
     {"get_sim_time", get_sim_time, METH_VARARGS, "Get the current simulation time as an int tuple"},
     {"get_precision", get_precision, METH_VARARGS, "Get the precision of the simulator"},
     {"deregister_callback", deregister_callback, METH_VARARGS, "De-register a callback"},
+    {"create_clock", create_clock, METH_VARARGS, "Start a clock driven from within the simulator"},
+    {"stop_clock", stop_clock, METH_VARARGS, "Stop a clock started with create_clock"},
+    {"get_value_change_stats", get_value_change_stats, METH_VARARGS, "Get the number of value change callbacks registered with the simulator and shared between edge triggers"},
     
     {"error_out", (PyCFunction)error_out, METH_NOARGS, NULL},
     
@@ -46,7 +46,6 @@ from cocotb.utils import (
 from cocotb import decorators
 from cocotb import outcomes
 from cocotb import _py_compat
-import cocotb
 
 
 class TriggerException(Exception):
@@ -132,6 +131,7 @@ class PythonTrigger(Trigger):
 
     For example: notification of coroutine completion.
     """
+    __slots__ = ()
 
 
 class GPITrigger(Trigger):
@@ -139,16 +139,25 @@ class GPITrigger(Trigger):
 
     Consumes simulation time.
     """
-    __slots__ = ('cbhdl',)
+    __slots__ = ('cbhdl', '_cb_function', '_cb_record')
 
     def __init__(self):
         Trigger.__init__(self)
-
-        # Required to ensure documentation can build
-        # if simulator is not None:
-        #    self.cbhdl = simulator.create_callback(self)
-        # else:
         self.cbhdl = 0
+        self._cb_function = None
+        self._cb_record = None
+
+    def _callback_record(self, callback):
+        """Return a callback record calling *callback* with this trigger.
+
+        The record is created by the simulator module and registered in
+        place of the callback, so priming the trigger again with the same
+        callback does not allocate anything.
+        """
+        if callback is not self._cb_function:
+            self._cb_record = simulator.create_callback(callback, self)
+            self._cb_function = callback
+        return self._cb_record
 
     def unprime(self):
         """Disable a primed trigger, can be re-primed."""
@@ -160,15 +169,33 @@ class GPITrigger(Trigger):
 
 class Timer(GPITrigger):
     """Fires after the specified simulation time period has elapsed."""
+    __slots__ = ('sim_steps',)
+
+    # The simulation steps of the last delays waited for, by
+    # (time_ps, units), as the same few delays are typically used in a loop
+    _steps_cache = {}
+    _steps_cache_size = 256
+
     def __init__(self, time_ps, units=None):
         GPITrigger.__init__(self)
-        self.sim_steps = get_sim_steps(time_ps, units)
+        cache = Timer._steps_cache
+        key = (time_ps, units)
+        try:
+            self.sim_steps = cache[key]
+        except KeyError:
+            self.sim_steps = steps = get_sim_steps(time_ps, units)
+            if len(cache) >= Timer._steps_cache_size:
+                cache.clear()
+            cache[key] = steps
+        except TypeError:
+            # An unhashable time
+            self.sim_steps = get_sim_steps(time_ps, units)
 
     def prime(self, callback):
         """Register for a timed callback"""
         if self.cbhdl == 0:
             self.cbhdl = simulator.register_timed_callback(self.sim_steps,
-                                                           callback, self)
+                                                           self._callback_record(callback))
             if self.cbhdl == 0:
                 raise TriggerException("Unable set up %s Trigger" % (str(self)))
         GPITrigger.prime(self, callback)
@@ -202,7 +229,7 @@ class ReadOnly(_py_compat.with_metaclass(_ParameterizedSingletonAndABC, GPITrigg
 
     def prime(self, callback):
         if self.cbhdl == 0:
-            self.cbhdl = simulator.register_readonly_callback(callback, self)
+            self.cbhdl = simulator.register_readonly_callback(self._callback_record(callback))
             if self.cbhdl == 0:
                 raise TriggerException("Unable set up %s Trigger" % (str(self)))
         GPITrigger.prime(self, callback)
@@ -224,9 +251,7 @@ class ReadWrite(_py_compat.with_metaclass(_ParameterizedSingletonAndABC, GPITrig
 
     def prime(self, callback):
         if self.cbhdl == 0:
-            # import pdb
-            # pdb.set_trace()
-            self.cbhdl = simulator.register_rwsynch_callback(callback, self)
+            self.cbhdl = simulator.register_rwsynch_callback(self._callback_record(callback))
             if self.cbhdl == 0:
                 raise TriggerException("Unable set up %s Trigger" % (str(self)))
         GPITrigger.prime(self, callback)
@@ -248,7 +273,7 @@ class NextTimeStep(_py_compat.with_metaclass(_ParameterizedSingletonAndABC, GPIT
 
     def prime(self, callback):
         if self.cbhdl == 0:
-            self.cbhdl = simulator.register_nextstep_callback(callback, self)
+            self.cbhdl = simulator.register_nextstep_callback(self._callback_record(callback))
             if self.cbhdl == 0:
                 raise TriggerException("Unable set up %s Trigger" % (str(self)))
         GPITrigger.prime(self, callback)
@@ -279,7 +304,7 @@ class _EdgeBase(_py_compat.with_metaclass(_ParameterizedSingletonAndABC, GPITrig
         """Register notification of a value change via a callback"""
         if self.cbhdl == 0:
             self.cbhdl = simulator.register_value_change_callback(
-                self.signal._handle, callback, type(self)._edge_type, self
+                self.signal._handle, self._callback_record(callback), type(self)._edge_type
             )
             if self.cbhdl == 0:
                 raise TriggerException("Unable set up %s Trigger" % (str(self)))
@@ -307,6 +332,73 @@ class Edge(_EdgeBase):
     _edge_type = 3
 
 
+def _match_binstr(value, width):
+    """Return *value*, an integer or a binary string, as a binary string."""
+    if isinstance(value, _py_compat.integer_types):
+        if value < 0:
+            raise ValueError("Cannot match a negative value")
+        return bin(value)[2:].zfill(width)
+    binstr = getattr(value, "binstr", value)
+    if not binstr or binstr.strip("01xXzZuUwWlLhH-"):
+        raise ValueError("%r is not a binary string" % (value,))
+    return binstr
+
+
+class ValueMatch(GPITrigger):
+    """Fires on the first *on* edge at which *signal* matches *value*.
+
+    The value of *signal* is compared when the edge occurs, by the C code,
+    so Python is only resumed once the condition holds. Only the bits set in
+    *mask* are compared.
+
+    Args:
+        signal: The signal to compare.
+        value: An integer, a binary string or a :class:`~cocotb.binary.BinaryValue`.
+        mask: The bits to compare, as an integer or a binary string.
+            Defaults to all the bits of *value*.
+        on: A :class:`RisingEdge`, :class:`FallingEdge` or :class:`Edge`
+            trigger. Defaults to ``Edge(signal)``, any change of *signal*.
+
+    .. versionadded:: 1.3
+    """
+    __slots__ = ('signal', 'on', 'value', 'mask')
+
+    def __init__(self, signal, value, mask=None, on=None):
+        GPITrigger.__init__(self)
+        if on is None:
+            on = Edge(signal)
+        elif not isinstance(on, _EdgeBase):
+            raise TypeError("ValueMatch must be on an edge trigger, not %r" % (on,))
+        self.signal = signal
+        self.on = on
+
+        value = _match_binstr(value, len(signal))
+        if mask is None:
+            mask = "1" * len(value)
+        else:
+            mask = _match_binstr(mask, len(value))
+            if mask.strip("01"):
+                raise ValueError("A mask can only contain 0 and 1")
+        width = max(len(value), len(mask))
+        self.value = value.rjust(width, "0")
+        self.mask = mask.rjust(width, "0")
+
+    def prime(self, callback):
+        if self.cbhdl == 0:
+            self.cbhdl = simulator.register_value_match_callback(
+                self.on.signal._handle, self._callback_record(callback),
+                type(self.on)._edge_type, self.signal._handle,
+                self.value, self.mask
+            )
+            if self.cbhdl == 0:
+                raise TriggerException("Unable set up %s Trigger" % (str(self)))
+        GPITrigger.prime(self, callback)
+
+    def __str__(self):
+        return self.__class__.__name__ + "(%s == %s, %s)" % (
+            self.signal._name, self.value, self.on)
+
+
 class _Event(PythonTrigger):
     """Unique instance used by the Event object.
 
@@ -315,6 +407,7 @@ class _Event(PythonTrigger):
 
     FIXME: This will leak - need to use peers to ensure everything is removed
     """
+    __slots__ = ('parent', '_callback')
 
     def __init__(self, parent):
         PythonTrigger.__init__(self)
@@ -388,6 +481,7 @@ class _Lock(PythonTrigger):
 
     FIXME: This will leak - need to use peers to ensure everything is removed.
     """
+    __slots__ = ('parent', '_callback')
 
     def __init__(self, parent):
         PythonTrigger.__init__(self)
@@ -468,9 +562,10 @@ class NullTrigger(Trigger):
 
     Primarily for internal scheduler use.
     """
+    __slots__ = ('name', '__outcome')
+
     def __init__(self, name="", outcome=None):
         super(NullTrigger, self).__init__()
-        self._callback = None
         self.name = name
         self.__outcome = outcome
 
@@ -590,34 +685,42 @@ class Waitable(object):
 class _AggregateWaitable(Waitable):
     """
     Base class for Waitables that take mutiple triggers in their constructor
+
+    These are handled by the scheduler directly, which primes all of the
+    triggers on behalf of the waiting coroutine.
     """
     __slots__ = ('triggers',)
 
     def __init__(self, *triggers):
         self.triggers = tuple(triggers)
+        _check_triggers(self.triggers)
 
-        # Do some basic type-checking up front, rather than waiting until we
-        # yield them.
-        allowed_types = (Trigger, Waitable, decorators.RunningCoroutine)
-        for trigger in self.triggers:
-            if not isinstance(trigger, allowed_types):
-                raise TypeError(
-                    "All triggers must be instances of Trigger! Got: {}"
-                    .format(type(trigger).__name__)
-                )
+    @decorators.coroutine
+    def _wait(self):
+        # the scheduler waits on the triggers itself
+        ret = yield self
+        raise ReturnValue(ret)
+
+    if sys.version_info >= (3, 3):
+        _py_compat.exec_(textwrap.dedent("""
+        def __await__(self):
+            # hand the waitable back to the scheduler trampoline
+            return (yield self)
+        """))
 
 
-@decorators.coroutine
-def _wait_callback(trigger, callback):
+def _check_triggers(triggers):
     """
-    Wait for a trigger, and call `callback` with the outcome of the yield.
+    Do some basic type-checking up front, rather than waiting until the
+    triggers are waited on.
     """
-    try:
-        ret = outcomes.Value((yield trigger))
-    except BaseException as exc:
-        # hide this from the traceback
-        ret = outcomes.Error(exc).without_frames(['_wait_callback'])
-    callback(ret)
+    allowed_types = (Trigger, Waitable, decorators.RunningCoroutine)
+    for trigger in triggers:
+        if not isinstance(trigger, allowed_types):
+            raise TypeError(
+                "All triggers must be instances of Trigger! Got: {}"
+                .format(type(trigger).__name__)
+            )
 
 
 class Combine(_AggregateWaitable):
@@ -625,28 +728,15 @@ class Combine(_AggregateWaitable):
     Fires when all of *triggers* have fired.
 
     Like most triggers, this simply returns itself.
+    If one of *triggers* produces an exception, such as a :class:`Join` on a
+    coroutine that failed, it is raised as soon as that trigger fires.
     """
     __slots__ = ()
 
-    @decorators.coroutine
-    def _wait(self):
-        waiters = []
-        e = Event()
-        triggers = list(self.triggers)
-
-        # start a parallel task for each trigger
-        for t in triggers:
-            # t=t is needed for the closure to bind correctly
-            def on_done(ret, t=t):
-                triggers.remove(t)
-                if not triggers:
-                    e.set()
-                ret.get()  # re-raise any exception
-            waiters.append(cocotb.fork(_wait_callback(t, on_done)))
-
-        # wait for the last waiter to complete
-        yield e.wait()
-        raise ReturnValue(self)
+    @property
+    def _outcome(self):
+        # what the scheduler resumes the waiting coroutine with
+        return outcomes.Value(self)
 
 
 class First(_AggregateWaitable):
@@ -671,46 +761,40 @@ class First(_AggregateWaitable):
     """
     __slots__ = ()
 
-    @decorators.coroutine
-    def _wait(self):
-        waiters = []
-        e = Event()
-        triggers = list(self.triggers)
-        completed = []
-        # start a parallel task for each trigger
-        for t in triggers:
-            def on_done(ret):
-                completed.append(ret)
-                e.set()
-            waiters.append(cocotb.fork(_wait_callback(t, on_done)))
-
-        # wait for a waiter to complete
-        yield e.wait()
-
-        # kill all the other waiters
-        # TODO: Should this kill the coroutines behind any Join triggers?
-        # Right now it does not.
-        for w in waiters:
-            w.kill()
-
-        # These lines are the way they are to make tracebacks readable:
-        #  - The comment helps the user nderstand why they are seeing the
-        #    traceback, even if it is obvious top cocotb maintainers.
-        #  - Raising ReturnValue on a separate line avoids confusion about what
-        #    is actually raising the error, because seeing
-        #    `raise Exception(foo())` in a traceback when in fact `foo()` itself
-        #    raises is confusing. We can recombine once we drop python 2 support
-        #  - Using `NullTrigger` here instead of `result = completed[0].get()`
-        #    means we avoid inserting an `outcome.get` frame in the traceback
-        first_trigger = NullTrigger(outcome=completed[0])
-        result = yield first_trigger  # the first of multiple triggers that fired
-        raise ReturnValue(result)
+
+class _EdgeCount(GPITrigger):
+    """Fires after *count* edges of *signal*, counted below the GPI."""
+    __slots__ = ('signal', 'edge_type', 'count')
+
+    def __init__(self, signal, edge_type, count):
+        GPITrigger.__init__(self)
+        self.signal = signal
+        self.edge_type = edge_type
+        self.count = count
+
+    def prime(self, callback):
+        if self.cbhdl == 0:
+            self.cbhdl = simulator.register_edge_count_callback(
+                self.signal._handle, self._callback_record(callback),
+                self.edge_type, self.count
+            )
+            if self.cbhdl == 0:
+                raise TriggerException("Unable set up %s Trigger" % (str(self)))
+        GPITrigger.prime(self, callback)
+
+    def __str__(self):
+        return self.__class__.__name__ + "(%s, %d)" % (self.signal._name, self.count)
 
 
 class ClockCycles(Waitable):
     """
     Fires after *num_cycles* transitions of *signal* from ``0`` to ``1``.
+
+    The edges are counted below the GPI, so Python is only called when the
+    last one has been seen.
     """
+    __slots__ = ('signal', 'num_cycles', '_type')
+
     def __init__(self, signal, num_cycles, rising=True):
         """
         :param rising: If true, the default, count rising edges. Otherwise,
@@ -725,7 +809,6 @@ class ClockCycles(Waitable):
 
     @decorators.coroutine
     def _wait(self):
-        trigger = self._type(self.signal)
-        for _ in range(self.num_cycles):
-            yield trigger
+        if self.num_cycles > 0:
+            yield _EdgeCount(self.signal, self._type._edge_type, self.num_cycles)
         raise ReturnValue(self)
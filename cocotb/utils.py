@@ -97,7 +97,11 @@ def get_time_from_sim_steps(steps, units):
     Returns:
         The simulation time in the specified units.
     """
-    return _ldexp10(steps, _LOG_SIM_PRECISION - _get_log_time_scale(units))
+    try:
+        exp = _units_to_steps_exp[units]
+    except KeyError:
+        exp = _get_log_time_scale(units) - _LOG_SIM_PRECISION
+    return _ldexp10(steps, -exp)
 
 
 def get_sim_steps(time, units=None):
@@ -117,7 +121,11 @@ def get_sim_steps(time, units=None):
     """
     result = time
     if units is not None:
-        result = _ldexp10(result, _get_log_time_scale(units) - _LOG_SIM_PRECISION)
+        try:
+            exp = _units_to_steps_exp[units]
+        except KeyError:
+            exp = _get_log_time_scale(units) - _LOG_SIM_PRECISION
+        result = _ldexp10(result, exp)
 
     result_rounded = math.floor(result)
 
@@ -139,19 +147,26 @@ def _get_log_time_scale(units):
     Returns:
         The the ``log10()`` of the scale factor for the time unit.
     """
-    scale = {
-        'fs' :    -15,
-        'ps' :    -12,
-        'ns' :     -9,
-        'us' :     -6,
-        'ms' :     -3,
-        'sec':      0}
-
     units_lwr = units.lower()
-    if units_lwr not in scale:
+    if units_lwr not in _log_time_scale:
         raise ValueError("Invalid unit ({0}) provided".format(units))
     else:
-        return scale[units_lwr]
+        return _log_time_scale[units_lwr]
+
+
+_log_time_scale = {
+    'fs' :    -15,
+    'ps' :    -12,
+    'ns' :     -9,
+    'us' :     -6,
+    'ms' :     -3,
+    'sec':      0}
+
+# The exponent converting each unit to simulator steps, computed once as the
+# precision can't change
+_units_to_steps_exp = {
+    units: scale - _LOG_SIM_PRECISION for units, scale in _log_time_scale.items()
+}
 
 # Ctypes helper functions
 
@@ -442,6 +457,12 @@ class ParametrizedSingleton(type):
             cls.__instances[key] = self
             return self
 
+    def _existing_instance(cls, *args, **kwargs):
+        """Return the instance for the construction arguments if there is one,
+        or ``None``, without constructing it.
+        """
+        return cls.__instances.get(cls.__singleton_key__(*args, **kwargs))
+
 
 def reject_remaining_kwargs(name, kwargs):
     """
@@ -0,0 +1,57 @@
+"""Benchmark BinaryValue conversions.
+
+BinaryValue sits between the simulator and every driver and monitor, so its
+conversions run on almost every signal access. These benchmarks do not use
+the simulator at all, they are wrapped in a test only so they run as part of
+the benchmark suite.
+"""
+
+import timeit
+
+import cocotb
+from cocotb.binary import BinaryValue
+from cocotb.triggers import Timer
+
+from benchmark import record
+
+WIDTHS = (8, 64, 512, 1024)
+NUMBER = 10000
+
+
+def measure(name, stmt, width):
+    elapsed = min(timeit.repeat(stmt, repeat=3, number=NUMBER))
+    record(name, 1e9 * elapsed / NUMBER, "ns", bits=width)
+
+
+@cocotb.test()
+def bench_binary_value(dut):
+    """Measure BinaryValue conversions at several widths"""
+    for width in WIDTHS:
+        binstr = ("10" * width)[:width]
+        integer = int(binstr, 2)
+        data = BinaryValue(binstr, n_bits=width).to_bytes()
+        buff = BinaryValue(binstr, n_bits=width).buff
+        val = BinaryValue(n_bits=width, bigEndian=False)
+
+        def from_binstr():
+            val.binstr = binstr
+            return val.integer
+
+        def from_integer():
+            val.integer = integer
+            return val.binstr
+
+        def from_buff():
+            val.buff = buff
+            return val.buff
+
+        def from_bytes():
+            val.from_bytes(data)
+            return val.to_bytes()
+
+        measure("binstr_to_int_time", from_binstr, width)
+        measure("int_to_binstr_time", from_integer, width)
+        measure("buff_round_trip_time", from_buff, width)
+        measure("bytes_round_trip_time", from_bytes, width)
+
+    yield Timer(1)
@@ -0,0 +1,51 @@
+"""Benchmark the discovery of the design hierarchy.
+
+Every scope of the design is discovered, as iterating over a handle or tab
+completion do, so that a handle is created for every object. With SIM=fake
+the design includes a generated hierarchy of
+``BENCHMARK_DISCOVERY_SIGNALS`` signals (100000 by default), see
+:mod:`fake_design`.
+"""
+
+import cocotb
+from cocotb.handle import RegionObject
+from cocotb.triggers import Timer
+
+from benchmark import record, timer
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2, only the time is measured
+    tracemalloc = None
+
+
+def discover(handle):
+    """Discover the hierarchy below *handle*, returning the number of handles."""
+    count = 0
+    for child in handle:
+        count += 1
+        if isinstance(child, RegionObject):
+            count += discover(child)
+    return count
+
+
+@cocotb.test()
+def bench_discovery(dut):
+    """Measure the time and memory taken to discover the whole design"""
+    if tracemalloc is not None:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+
+    start = timer()
+    count = discover(dut)
+    elapsed = timer() - start
+
+    record("discovery_time", elapsed, "s", handles=count)
+    record("discovery_time_per_handle", 1e6 * elapsed / count, "us", handles=count)
+    if tracemalloc is not None:
+        memory = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        record("discovery_memory_per_handle", memory / count, "B", handles=count)
+
+    yield Timer(1)
@@ -0,0 +1,190 @@
+"""Benchmark the scheduler hot paths.
+
+Each benchmark repeats one scheduler operation many times and records the
+average cost of a single operation. Where the operation has to be driven by
+simulation time, the cost of an equivalent loop that only waits on the same
+trigger is measured first and subtracted.
+"""
+
+import sys
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.result import ReturnValue
+from cocotb.triggers import (ClockCycles, Combine, Event, First, NullTrigger,
+                             RisingEdge, Timer)
+
+from benchmark import record, timer
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2, memory is not measured
+    tracemalloc = None
+
+ITERATIONS = 1000
+FAN_OUT = (1, 10, 100, 1000)
+
+
+@cocotb.coroutine
+def nop():
+    yield NullTrigger()
+
+
+@cocotb.coroutine
+def wait_timer(steps):
+    yield Timer(steps)
+
+
+@cocotb.coroutine
+def wait_event(ev, counter):
+    yield ev.wait()
+    counter[0] += 1
+
+
+@cocotb.coroutine
+def baseline(steps=1):
+    """Return the time taken by ``ITERATIONS`` waits on ``Timer(steps)``"""
+    start = timer()
+    for _ in range(ITERATIONS):
+        yield Timer(steps)
+    raise ReturnValue(timer() - start)
+
+
+@cocotb.test()
+def bench_fork_join(dut):
+    """Measure the cost of forking a coroutine and joining it"""
+    start = timer()
+    for _ in range(ITERATIONS):
+        yield cocotb.fork(nop()).join()
+    record("fork_join_per_second", ITERATIONS / (timer() - start), "1/s")
+
+    start = timer()
+    tasks = [cocotb.fork(nop()) for _ in range(ITERATIONS)]
+    for task in tasks:
+        yield task.join()
+    record("fork_join_per_second", ITERATIONS / (timer() - start), "1/s",
+           concurrent=ITERATIONS)
+
+
+@cocotb.test(skip=tracemalloc is None)
+def bench_fork_memory(dut):
+    """Measure the memory taken by each forked coroutine while it waits"""
+    n_tasks = 10 * ITERATIONS
+    ev = Event()
+    counter = [0]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [cocotb.fork(wait_event(ev, counter)) for _ in range(n_tasks)]
+    yield Timer(1)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    record("fork_memory_per_coroutine", memory / n_tasks, "B", coroutines=n_tasks)
+
+    ev.set()
+    yield Timer(1)
+    assert counter[0] == n_tasks
+    del tasks
+
+
+@cocotb.test()
+def bench_event_fan_out(dut):
+    """Measure the cost of waking every waiter of an Event"""
+    for n_waiters in FAN_OUT:
+        ev = Event()
+        counter = [0]
+        for _ in range(n_waiters):
+            cocotb.fork(wait_event(ev, counter))
+        yield Timer(1)
+
+        start = timer()
+        ev.set()
+        yield NullTrigger()
+        elapsed = timer() - start
+
+        assert counter[0] == n_waiters
+        record("event_set_time", 1e9 * elapsed / n_waiters, "ns",
+               waiters=n_waiters)
+
+
+@cocotb.test()
+def bench_first_combine(dut):
+    """Measure the overhead of waiting through First and Combine"""
+    base = yield baseline()
+
+    start = timer()
+    for _ in range(ITERATIONS):
+        yield First(Timer(1), Timer(2))
+    record("first_time", 1e9 * (timer() - start - base) / ITERATIONS, "ns",
+           triggers=2)
+
+    start = timer()
+    for _ in range(ITERATIONS):
+        yield Combine(Timer(1), Timer(1))
+    record("combine_time", 1e9 * (timer() - start - base) / ITERATIONS, "ns",
+           triggers=2)
+
+    start = timer()
+    for _ in range(ITERATIONS):
+        yield First(wait_timer(1), wait_timer(2))
+    record("first_time", 1e9 * (timer() - start - base) / ITERATIONS, "ns",
+           coroutines=2)
+
+    # a timeout on an event, as in Monitor.wait_for_recv
+    ev = Event()
+    start = timer()
+    for _ in range(ITERATIONS):
+        yield [ev.wait(), Timer(1)]
+    record("first_time", 1e9 * (timer() - start - base) / ITERATIONS, "ns",
+           triggers=2, timeout=True)
+
+
+@cocotb.test()
+def bench_write_flush(dut):
+    """Measure the cost of flushing the writes cached in one time step"""
+    signals = [dut.stream_in_data, dut.stream_in_valid, dut.stream_in_data_wide]
+    base = yield baseline()
+
+    start = timer()
+    for i in range(ITERATIONS):
+        for signal in signals:
+            signal <= i & 1
+        yield Timer(1)
+    record("write_flush_time", 1e9 * (timer() - start - base) / ITERATIONS,
+           "ns", signals=len(signals))
+
+
+@cocotb.test()
+def bench_clock_cycles(dut):
+    """Measure waiting for many clock cycles, against a loop over the edges"""
+    clk = cocotb.fork(Clock(dut.clk, 2).start())
+    yield RisingEdge(dut.clk)
+
+    start = timer()
+    for _ in range(ITERATIONS):
+        yield RisingEdge(dut.clk)
+    record("edge_loop_time", 1e9 * (timer() - start) / ITERATIONS, "ns")
+
+    start = timer()
+    yield ClockCycles(dut.clk, ITERATIONS)
+    record("clock_cycles_time", 1e9 * (timer() - start) / ITERATIONS, "ns")
+    clk.kill()
+
+
+
+def return_one():
+    return 1
+
+
+@cocotb.test()
+def bench_external(dut):
+    """Measure the cost of calling a function through cocotb.external"""
+    clk = cocotb.fork(Clock(dut.clk, 2).start())
+    start = timer()
+    for _ in range(ITERATIONS):
+        yield cocotb.external(return_one)()
+    record("external_time", 1e9 * (timer() - start) / ITERATIONS, "ns")
+    clk.kill()
+
+if sys.version_info[:2] >= (3, 5):
+    from bench_scheduler_35 import *
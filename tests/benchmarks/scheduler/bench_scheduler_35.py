@@ -0,0 +1,28 @@
+"""Scheduler benchmarks that use syntax introduced in Python 3.5."""
+
+import cocotb
+from cocotb.triggers import NullTrigger
+
+from benchmark import record, timer
+
+ITERATIONS = 1000
+DEPTHS = (1, 5, 10)
+
+
+@cocotb.coroutine
+async def nested(depth):
+    """Await *depth* levels of decorated coroutines, then a trigger"""
+    if depth:
+        return await nested(depth - 1)
+    await NullTrigger()
+
+
+@cocotb.test()
+async def bench_nested_await(dut):
+    """Measure the cost of awaiting a stack of decorated coroutines"""
+    for depth in DEPTHS:
+        start = timer()
+        for _ in range(ITERATIONS):
+            await nested(depth)
+        record("nested_await_time", 1e9 * (timer() - start) / ITERATIONS,
+               "ns", depth=depth)
@@ -0,0 +1,54 @@
+"""Benchmark the cost of waking many coroutines waiting on the same trigger.
+
+The scheduler keeps the coroutines waiting on each trigger in an ordered set,
+so the cost of waking, re-scheduling and killing a waiter must not depend on
+how many other coroutines wait on the same trigger. The per-waiter numbers
+reported below should stay flat as the number of waiters grows.
+"""
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, Timer
+
+from benchmark import record, timer
+
+WAITER_COUNTS = (10, 100, 1000, 10000)
+EDGES = 20
+
+
+@cocotb.coroutine
+def waiter(clk, counter):
+    while True:
+        yield RisingEdge(clk)
+        counter[0] += 1
+
+
+@cocotb.test()
+def bench_many_waiters(dut):
+    """Measure per-edge scheduling cost with a growing number of waiters"""
+    cocotb.fork(Clock(dut.clk, 10, units="ns").start())
+    yield RisingEdge(dut.clk)
+
+    start = timer()
+    for _ in range(EDGES):
+        yield RisingEdge(dut.clk)
+    record("edges_per_second", EDGES / (timer() - start), "1/s", waiters=1)
+
+    for n_waiters in WAITER_COUNTS:
+        counter = [0]
+        waiters = [cocotb.fork(waiter(dut.clk, counter)) for _ in range(n_waiters)]
+
+        start = timer()
+        for _ in range(EDGES):
+            yield RisingEdge(dut.clk)
+        edge_time = timer() - start
+
+        start = timer()
+        for w in waiters:
+            w.kill()
+        kill_time = timer() - start
+
+        record("edges_per_second", EDGES / edge_time, "1/s", waiters=n_waiters + 1)
+        record("wakeup_time", 1e9 * edge_time / max(counter[0], 1), "ns", waiters=n_waiters)
+        record("kill_time", 1e9 * kill_time / n_waiters, "ns", waiters=n_waiters)
+        yield Timer(1)
@@ -0,0 +1,39 @@
+"""Helpers shared by the scheduler benchmarks.
+
+Results are collected with :func:`record` and written as JSON to the file
+named by the ``BENCHMARK_RESULTS`` environment variable
+(``benchmark_results.json`` by default) after every measurement, so a run
+that is cut short still leaves the results gathered so far.
+"""
+
+import json
+import os
+import platform
+import time
+
+import cocotb
+
+# Highest resolution wall clock available
+timer = getattr(time, "perf_counter", time.time)
+
+_results = {
+    "cocotb_version": cocotb.__version__,
+    "python_version": platform.python_version(),
+    "simulator": os.getenv("SIM"),
+    "results": [],
+}
+
+
+def record(name, value, unit, **params):
+    """Record the measurement *value* (in *unit*) of the benchmark *name*.
+
+    Any keyword arguments are stored as the parameters of the measurement.
+    """
+    _results["results"].append({
+        "name": name,
+        "value": value,
+        "unit": unit,
+        "params": params,
+    })
+    with open(os.getenv("BENCHMARK_RESULTS", "benchmark_results.json"), "w") as f:
+        json.dump(_results, f, indent=2, sort_keys=True)
@@ -0,0 +1,20 @@
+"""The part of sample_module used by the benchmarks, for SIM=fake."""
+
+import os
+
+# Size of the generated hierarchy discovered by bench_discovery
+DISCOVERY_SIGNALS = int(os.getenv("BENCHMARK_DISCOVERY_SIGNALS", "100000"))
+SIGNALS_PER_BLOCK = 100
+
+
+def build(top):
+    top.add_signal("clk")
+    top.add_signal("stream_in_valid")
+    top.add_signal("stream_in_data", width=8)
+    top.add_signal("stream_in_data_wide", width=64)
+
+    tree = top.add_module("discovery_tree")
+    for i in range(DISCOVERY_SIGNALS // SIGNALS_PER_BLOCK):
+        block = tree.add_module("block%d" % i, def_name="block")
+        for j in range(SIGNALS_PER_BLOCK):
+            block.add_signal("sig%d" % j, width=8)
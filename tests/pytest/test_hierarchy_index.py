@@ -0,0 +1,74 @@
+# Copyright (c) cocotb contributors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL POTENTIAL VENTURES LTD BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests for reusing the hierarchy index between simulation runs."""
+
+import pytest
+
+from cocotb.hierarchy_index import HierarchyIndex
+
+
+@pytest.fixture
+def design(tmpdir, monkeypatch):
+    """A design built from a single source file"""
+    source = tmpdir.join("top.v")
+    source.write("module top; endmodule\n")
+    monkeypatch.setenv("COCOTB_HDL_SOURCES", str(source))
+    monkeypatch.setenv("COCOTB_HDL_COMPILE_ARGS", "")
+    monkeypatch.chdir(tmpdir)
+    return source
+
+
+def load():
+    return HierarchyIndex.for_design("index.json", "fakesim", "1.0", "top")
+
+
+def save_scope():
+    index = load()
+    index.record_children("top", [("clk", 1, False)])
+    index.save()
+
+
+def test_index_reused(design, tmpdir):
+    save_scope()
+    # the files written by the simulation run don't matter
+    tmpdir.mkdir("sim_build").join("sim.log").write("log\n")
+    tmpdir.join("results.xml").write("<testsuites/>\n")
+    assert load().children("top") == [["clk", 1, False]]
+
+
+def test_index_not_reused_for_changed_design(design, monkeypatch):
+    save_scope()
+    monkeypatch.setenv("COCOTB_HDL_COMPILE_ARGS", "-DWIDTH=8")
+    assert load().children("top") is None
+
+    save_scope()
+    design.write("module top(input clk); endmodule\n")
+    assert load().children("top") is None
+
+
+def test_index_not_reused_without_sources(design, monkeypatch):
+    save_scope()
+    monkeypatch.delenv("COCOTB_HDL_SOURCES")
+    assert load().children("top") is None
@@ -0,0 +1,99 @@
+# Copyright (c) cocotb contributors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL POTENTIAL VENTURES LTD BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests for splitting a regression into shards."""
+
+import json
+import os
+
+from cocotb.regression import _shard_tests, _load_test_times
+
+
+class FakeTest(object):
+    """Stands in for a test, with what the sharding looks at"""
+
+    def __init__(self, module, funcname):
+        self.module = module
+        self.funcname = funcname
+
+    def sort_name(self):
+        return "%s.%s" % (self.module, self.funcname)
+
+    def __repr__(self):
+        return self.sort_name()
+
+
+def make_tests(n):
+    return [FakeTest("test_mod", "test_%d" % i) for i in range(n)]
+
+
+def all_shards(tests, count, test_times=None):
+    return [_shard_tests(tests, i, count, test_times) for i in range(count)]
+
+
+def test_shards_complete_and_disjoint():
+    tests = make_tests(23)
+    for count in (1, 2, 5, 23, 30):
+        shards = all_shards(tests, count)
+        assert sum(len(shard) for shard in shards) == len(tests)
+        assert set(t for shard in shards for t in shard) == set(tests)
+
+
+def test_shards_keep_test_order():
+    tests = make_tests(10)
+    for shard in all_shards(tests, 3):
+        assert shard == [t for t in tests if t in shard]
+
+
+def test_shards_balance_times():
+    tests = make_tests(8)
+    test_times = {"test_mod.test_%d" % i: float(i + 1) for i in range(8)}
+    loads = [sum(test_times[t.sort_name()] for t in shard)
+             for shard in all_shards(tests, 2, test_times)]
+    assert loads == [18.0, 18.0]
+
+    # a single long test gets a shard of its own
+    test_times["test_mod.test_7"] = 100.0
+    shards = all_shards(tests, 2, test_times)
+    assert [t.funcname for t in shards[0]] == ["test_7"]
+
+
+def test_shards_unknown_tests_get_average_time():
+    tests = make_tests(4)
+    test_times = {"test_mod.test_0": 3.0, "test_mod.test_1": 1.0}
+    shards = all_shards(tests, 2, test_times)
+    # test_2 and test_3 count as 2.0 each
+    loads = [sum(test_times.get(t.sort_name(), 2.0) for t in shard)
+             for shard in shards]
+    assert sorted(loads) == [4.0, 4.0]
+
+
+def test_load_test_times(tmpdir):
+    filename = str(tmpdir.join("times.json"))
+    assert _load_test_times(filename) == {}
+
+    with open(filename, "w") as f:
+        json.dump({"test_mod.test_0": 1.5}, f)
+    assert _load_test_times(filename) == {"test_mod.test_0": 1.5}
+    os.remove(filename)
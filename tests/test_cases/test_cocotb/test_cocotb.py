@@ -29,6 +29,7 @@
 
 import contextlib
 import logging
+import os
 import re
 import sys
 import textwrap
@@ -46,7 +47,8 @@ Also used as regression test of cocotb capabilities
 import cocotb
 from cocotb.triggers import (Timer, Join, RisingEdge, FallingEdge, Edge,
                              ReadOnly, ReadWrite, ClockCycles, NextTimeStep,
-                             NullTrigger, Combine, Event, First, Trigger)
+                             NullTrigger, Combine, Event, First, Trigger,
+                             ValueMatch)
 from cocotb.clock import Clock
 from cocotb.result import (
     ReturnValue, TestFailure, TestError, TestSuccess, raise_error, create_error
@@ -54,6 +56,8 @@ from cocotb.result import (
 from cocotb.utils import get_sim_time
 
 from cocotb.binary import BinaryValue
+from cocotb.monitors import Monitor
+from cocotb.scoreboard import Scoreboard, IndexedExpectedOutput
 from cocotb import _py_compat
 
 
@@ -277,6 +281,33 @@ def test_clock_with_units(dut):
 
     clk_gen.kill()
 
+@cocotb.test()
+def test_clock_gpi_impl(dut):
+    """Test a clock driven from within the simulator"""
+    clk_gen = cocotb.fork(Clock(dut.clk, 10, units='ns', impl="gpi").start())
+
+    yield RisingEdge(dut.clk)
+    start_time_ns = get_sim_time(units='ns')
+    for _ in range(3):
+        yield RisingEdge(dut.clk)
+    edge_time_ns = get_sim_time(units='ns')
+    if not isclose(edge_time_ns, start_time_ns + 30.0):
+        raise TestFailure("Expected three periods of 10 ns")
+
+    clk_gen.kill()
+    timer = Timer(100, units='ns')
+    result = yield [timer, RisingEdge(dut.clk)]
+    if result is not timer:
+        raise TestFailure("Killed clock is still running")
+
+    # A finite number of cycles completes the coroutine
+    start_time_ns = get_sim_time(units='ns')
+    yield Clock(dut.clk, 10, units='ns', impl="gpi").start(cycles=5)
+    edge_time_ns = get_sim_time(units='ns')
+    if not isclose(edge_time_ns, start_time_ns + 50.0):
+        raise TestFailure("Expected five periods of 10 ns")
+
+
 @cocotb.test(expect_fail=False)
 def test_timer_with_units(dut):
     time_fs = get_sim_time(units='fs')
@@ -331,6 +362,29 @@ def test_timer_with_rational_units(dut):
     assert get_sim_time(units='fs') == time_fs + 1000000.0, "Expected a delay of 1 ns"
 
 
+@cocotb.test()
+def test_timer_reuse(dut):
+    """ Test that timers with the same delay are independent """
+    @cocotb.coroutine
+    def wait_timer(delay):
+        yield Timer(delay, units='ns')
+
+    # concurrent waits with the same delay get their own timers
+    time_ns = get_sim_time(units='ns')
+    waiter = cocotb.fork(wait_timer(10))
+    yield Timer(5, units='ns')
+    yield wait_timer(10)
+    yield waiter.join()
+    assert get_sim_time(units='ns') == time_ns + 15, "Expected a delay of 15 ns"
+
+    # a timer that is held on to is not shared
+    timer = Timer(1, units='ns')
+    assert Timer(1, units='ns') is not timer
+    yield timer
+    yield timer
+    assert get_sim_time(units='ns') == time_ns + 17, "Expected a delay of 17 ns"
+
+
 @cocotb.test(expect_fail=False)
 def test_anternal_clock(dut):
     """Test ability to yield on an external non cocotb coroutine decorated
@@ -615,6 +669,42 @@ def test_either_edge(dut):
         raise TestError("Value should be 0")
 
 
+@cocotb.coroutine
+def count_edges(trigger, counter):
+    while True:
+        yield trigger
+        counter[0] += 1
+
+
+@cocotb.test()
+def test_shared_edges(dut):
+    """Test that edge triggers on the same signal share a value change callback"""
+    import simulator
+    dut.clk <= 0
+    yield Timer(10)
+    counts = [[0], [0], [0]]
+    triggers = [RisingEdge(dut.clk), FallingEdge(dut.clk), Edge(dut.clk)]
+    counters = [cocotb.fork(count_edges(t, c)) for t, c in zip(triggers, counts)]
+    registered, shared = simulator.get_value_change_stats()
+
+    for _ in range(5):
+        yield Timer(10)
+        dut.clk <= 1
+        yield Timer(10)
+        dut.clk <= 0
+    yield Timer(10)
+
+    for c in counters:
+        c.kill()
+    if [c[0] for c in counts] != [5, 5, 10]:
+        raise TestFailure("Expected 5 rising, 5 falling and 10 edges, got %s" % counts)
+    new_registered, new_shared = simulator.get_value_change_stats()
+    dut._log.info("Value change callbacks registered: %d, shared: %d" %
+                  (new_registered - registered, new_shared - shared))
+    if new_shared - shared < 10:
+        raise TestFailure("Edge triggers did not share value change callbacks")
+
+
 @cocotb.coroutine
 def do_clock(dut, limit, period):
     """Simple clock with a limit"""
@@ -695,6 +785,76 @@ def test_clock_cycles(dut):
 
     dut._log.info("After 10 edges")
 
+
+@cocotb.test()
+def test_clock_cycles_count(dut):
+    """Test that ClockCycles fires on the last of the edges it counts"""
+    clk = dut.clk
+    clk_gen = cocotb.fork(Clock(clk, 100).start())
+    yield RisingEdge(clk)
+
+    for rising, edge, level in ((True, RisingEdge, 1), (False, FallingEdge, 0)):
+        edges = [0]
+        counter = cocotb.fork(count_edges(edge(clk), edges))
+        trigger = ClockCycles(clk, 7, rising=rising)
+        result = yield trigger
+        counter.kill()
+        if result is not trigger:
+            raise TestFailure("ClockCycles returned %r" % (result,))
+        if edges[0] != 7 or clk.value.integer != level:
+            raise TestFailure("ClockCycles fired after %d edges with the clock at %s" %
+                              (edges[0], clk.value))
+
+    # Waiting for no cycles returns straight away
+    start = get_sim_time()
+    yield ClockCycles(clk, 0)
+    if get_sim_time() != start:
+        raise TestFailure("ClockCycles(clk, 0) waited")
+    clk_gen.kill()
+
+@cocotb.coroutine
+def count_on_falling_edges(clk, signal):
+    value = 0
+    while True:
+        yield FallingEdge(clk)
+        value = (value + 1) % 256
+        signal <= value
+
+
+@cocotb.test()
+def test_value_match(dut):
+    """Test that ValueMatch fires on the first edge at which the value matches"""
+    clk = dut.clk
+    data = dut.stream_in_data
+    data <= 0
+    clk_gen = cocotb.fork(Clock(clk, 100).start())
+    counter = cocotb.fork(count_on_falling_edges(clk, data))
+
+    yield ValueMatch(data, 13)
+    if data.value.integer != 13:
+        raise TestFailure("ValueMatch(data, 13) fired with data at %s" % data.value)
+
+    # Only the low nibble is compared, on the rising edges of the clock
+    trigger = ValueMatch(data, "0101", mask=0xf, on=RisingEdge(clk))
+    for expected in (21, 37):
+        result = yield trigger
+        if result is not trigger:
+            raise TestFailure("ValueMatch returned %r" % (result,))
+        if data.value.integer != expected or clk.value.integer != 1:
+            raise TestFailure("ValueMatch fired with data at %s and the clock at %s" %
+                              (data.value, clk.value))
+
+    for args in ((data, -1), (data, "012"), (data, 1, "1x"), (data, 1, None, Timer(1))):
+        try:
+            ValueMatch(*args)
+        except (ValueError, TypeError):
+            pass
+        else:
+            raise TestFailure("ValueMatch%r did not raise" % (args,))
+
+    counter.kill()
+    clk_gen.kill()
+
 @cocotb.test()
 def test_binary_value(dut):
     """
@@ -1028,8 +1188,6 @@ def test_exceptions_first(dut):
         yield running_coro
       File ".*test_cocotb\.py", line \d+, in raise_soon
         yield cocotb\.triggers\.First\(raise_inner\(\)\)
-      File ".*triggers\.py", line \d+, in _wait
-        result = yield first_trigger  # the first of multiple triggers that fired
       File ".*test_cocotb\.py", line \d+, in raise_inner
         raise ValueError\('It is soon now'\)
     ValueError: It is soon now""").strip()
@@ -1099,6 +1257,25 @@ def test_combine(dut):
     yield Combine(*(cr.join() for cr in crs))
 
 
+@cocotb.test()
+def test_combine_raises(dut):
+    """ Test that Combine raises the exception of a coroutine that failed """
+    @cocotb.coroutine
+    def raise_soon():
+        yield Timer(10)
+        raise ValueError("It is soon now")
+
+    start = get_sim_time()
+    try:
+        yield Combine(raise_soon(), Timer(1000))
+    except ValueError:
+        pass
+    else:
+        raise TestFailure("Exception was not raised")
+    if get_sim_time() - start >= 1000:
+        raise TestFailure("Combine waited for the other trigger")
+
+
 @cocotb.test()
 def test_clock_cycles_forked(dut):
     """ Test that ClockCycles can be used in forked coroutines """
@@ -1277,5 +1454,190 @@ def test_bad_attr(dut):
         assert False, "Expected AttributeError"
 
 
+@cocotb.test()
+def test_read_many(dut):
+    """Test reading several signals with a single call"""
+    dut.stream_in_data.setimmediatevalue(0x5a)
+    dut.stream_in_data_wide.setimmediatevalue(0x123456789abcdef)
+    dut.stream_in_valid.setimmediatevalue(1)
+    yield Timer(1)
+
+    handles = [dut.stream_in_data, dut.stream_in_data_wide,
+               dut.stream_in_valid, dut.stream_in_int]
+    values = cocotb.handle.read_many(handles)
+    if len(values) != len(handles):
+        raise TestFailure("Expected %d values, got %d" % (len(handles), len(values)))
+    for hdl, value in zip(handles, values):
+        if value != hdl.value:
+            raise TestFailure("read_many() returned %r for %s, expected %r" % (
+                value, hdl._name, hdl.value))
+
+
+class ManualMonitor(Monitor):
+    """Monitor whose transactions are passed to ``_recv`` by the test"""
+    name = "manual"
+
+    @cocotb.coroutine
+    def _monitor_recv(self):
+        yield NullTrigger()
+
+
+@cocotb.test()
+def test_scoreboard_streaming(dut):
+    """Test that streamed transactions are checked in order, after the
+    monitor callback"""
+    monitor = ManualMonitor()
+    scoreboard = Scoreboard(dut, fail_immediately=False, streaming=True,
+                            max_pending=4)
+    expected = [1, 2, 3]
+    scoreboard.add_interface(monitor, expected)
+    yield Timer(1)
+
+    monitor._recv(1)
+    monitor._recv(2)
+    if expected != [1, 2, 3]:
+        raise TestFailure("Transactions were checked in the monitor callback")
+    yield NullTrigger()
+    if expected != [3]:
+        raise TestFailure("Queued transactions were not checked")
+
+    # a full queue is checked by the monitor callback
+    expected.extend(range(4, 8))
+    for i in range(3, 7):
+        monitor._recv(i)
+    if expected != [7]:
+        raise TestFailure("Full queue was not checked")
+
+    monitor._recv(8)
+    result = scoreboard.result
+    if not isinstance(result, TestFailure) or scoreboard.errors != 1:
+        raise TestFailure("Queued transaction was not checked by result")
+
+
+@cocotb.test()
+def test_scoreboard_streaming_result(dut):
+    """Test that result checks all the queued transactions when failing
+    immediately"""
+    monitor = ManualMonitor()
+    scoreboard = Scoreboard(dut, streaming=True)
+    expected = [1, 2, 3, 4]
+    scoreboard.add_interface(monitor, expected)
+    yield Timer(1)
+
+    for i in (1, 5, 3, 6):
+        monitor._recv(i)
+    result = scoreboard.result
+    if not isinstance(result, TestFailure) or scoreboard.errors != 2:
+        raise TestFailure("Queued transactions were not all checked")
+    if expected or scoreboard._imm is not True:
+        raise TestFailure("Scoreboard was left in the wrong state")
+
+
+@cocotb.test()
+def test_scoreboard_indexed(dut):
+    """Test matching transactions out of order with an IndexedExpectedOutput"""
+    monitor = ManualMonitor()
+    scoreboard = Scoreboard(dut, fail_immediately=False)
+    expected = IndexedExpectedOutput([(1, "a"), (2, "b"), (1, "a"), (3, "c")],
+                                     key=lambda t: t[0])
+    scoreboard.add_interface(monitor, expected)
+    yield Timer(1)
+
+    monitor._recv((3, "c"))
+    monitor._recv((1, "a"))
+    if list(expected) != [(2, "b"), (1, "a")]:
+        raise TestFailure("Wrong transactions matched: %r" % expected)
+    # same key, different transaction
+    monitor._recv((1, "x"))
+    if scoreboard.errors != 1 or list(expected) != [(2, "b")]:
+        raise TestFailure("Mismatch with the same key was not reported")
+    # no transaction with this key, compared with the oldest one
+    monitor._recv((4, "d"))
+    if scoreboard.errors != 2 or expected:
+        raise TestFailure("Mismatch without a key was not reported")
+
+    expected.append((5, "e"))
+    if not isinstance(scoreboard.result, TestFailure):
+        raise TestFailure("Leftover transaction was not reported")
+
+
+class CountingTransaction(object):
+    """Transaction which counts how often it is formatted"""
+    formatted = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        CountingTransaction.formatted += 1
+        return "CountingTransaction(%r)" % self.value
+
+    __str__ = __repr__
+
+
+@cocotb.test()
+def test_scoreboard_mismatch_reports(dut):
+    """Test that only max_reports mismatches are formatted, and
+    max_mismatches are kept"""
+    monitor = ManualMonitor()
+    scoreboard = Scoreboard(dut, fail_immediately=False, max_reports=2,
+                            max_mismatches=15)
+    expected = [CountingTransaction(i) for i in range(10)]
+    scoreboard.add_interface(monitor, expected)
+    yield Timer(1)
+
+    for i in range(10):
+        monitor._recv(CountingTransaction(-i - 1))
+    if scoreboard.errors != 10 or len(scoreboard.mismatches) != 10:
+        raise TestFailure("Mismatches were not all recorded")
+    formatted = CountingTransaction.formatted
+    for i in range(10):
+        monitor._recv(CountingTransaction(i))
+    if CountingTransaction.formatted != formatted:
+        raise TestFailure("Mismatches were formatted beyond max_reports")
+    if scoreboard.errors != 20 or len(scoreboard.mismatches) != 15:
+        raise TestFailure("Mismatches were kept beyond max_mismatches")
+
+    mismatch = scoreboard.mismatches[-1]
+    if mismatch.reason != "unexpected" or mismatch.exp is not None:
+        raise TestFailure("Wrong mismatch recorded: %r" % (mismatch,))
+
+    filename = "test_scoreboard_mismatches.json"
+    scoreboard.write_mismatches(filename)
+    with open(filename) as f:
+        lines = f.readlines()
+    os.remove(filename)
+    if len(lines) != 15 or "CountingTransaction(-4)" not in lines[3]:
+        raise TestFailure("Mismatches were not written: %r" % lines[:4])
+
+
+@cocotb.test()
+def test_scoreboard_mismatch_file(dut):
+    """Test that all mismatches are written to the mismatch_file"""
+    monitor = ManualMonitor()
+    filename = "test_scoreboard_mismatch_file.json"
+    scoreboard = Scoreboard(dut, fail_immediately=False, max_mismatches=2,
+                            mismatch_file=filename)
+    scoreboard.add_interface(monitor, [CountingTransaction(0)])
+    yield Timer(1)
+
+    for i in range(5):
+        monitor._recv(CountingTransaction(i + 1))
+    scoreboard.result
+    with open(filename) as f:
+        lines = f.readlines()
+    os.remove(filename)
+    if len(lines) != 5 or "CountingTransaction(5)" not in lines[4]:
+        raise TestFailure("Mismatches were not written: %r" % lines)
+    if len(scoreboard.mismatches) != 2:
+        raise TestFailure("Mismatches were kept beyond max_mismatches")
+
+
 if sys.version_info[:2] >= (3, 5):
     from test_cocotb_35 import *
@@ -5,7 +5,7 @@ This is likely to mean this file only tests `async def` functions.
 """
 
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.triggers import Timer, Event, Join
 from cocotb.outcomes import Value, Error
 from cocotb.result import TestFailure
 
@@ -116,3 +116,86 @@ async def test_await_causes_start(dut):
     assert not coro.has_started()
     await coro
     assert coro.has_started()
+
+
+@cocotb.test()
+async def test_await_can_be_joined(dut):
+    """ Test that a coroutine run by await can be joined by another one """
+    coro = produce.async_annotated(Value(2))
+
+    @cocotb.coroutine
+    async def join_coro():
+        return await Join(coro)
+
+    joiner = cocotb.fork(join_coro())
+    v = await coro
+    assert v == 2
+    assert coro.retval == 2
+    assert (await joiner) == 2
+
+
+@cocotb.test()
+async def test_await_kill(dut):
+    """ Test that a coroutine run by await can be killed while it waits """
+    unwound = []
+
+    @cocotb.coroutine
+    async def wait_inner():
+        try:
+            await Event().wait()
+        finally:
+            unwound.append(True)
+
+    @cocotb.coroutine
+    async def wait_forever():
+        await wait_inner()
+        assert False, "should have been killed"
+
+    coro = wait_forever()
+
+    @cocotb.coroutine
+    async def kill_soon():
+        await Timer(10)
+        coro.kill()
+
+    cocotb.fork(kill_soon())
+    v = await coro
+    assert v is None
+    assert coro.retval is None
+    assert unwound == [True]
+
+
+@cocotb.test()
+async def test_await_kill_host(dut):
+    """ Test that killing a coroutine kills the coroutine it awaits """
+    unwound = []
+
+    @cocotb.coroutine
+    async def wait_inner():
+        try:
+            await Event().wait()
+        finally:
+            unwound.append(True)
+
+    inner = wait_inner()
+
+    @cocotb.coroutine
+    async def wait_forever():
+        await inner
+        assert False, "should have been killed"
+
+    host = cocotb.fork(wait_forever())
+    await Timer(10)
+    assert inner.has_started()
+
+    @cocotb.coroutine
+    async def kill_soon():
+        await Timer(10)
+        host.kill()
+
+    cocotb.fork(kill_soon())
+    v = await Join(inner)
+    assert v is None
+    assert not inner
+    assert not host
+    assert unwound == [True]
@@ -32,6 +32,7 @@ import textwrap
 from cocotb.triggers import Timer
 from cocotb.result import TestError, TestFailure
 from cocotb.handle import IntegerObject, ConstantObject, HierarchyObject, StringObject
+from cocotb.hierarchy_index import HierarchyIndex
 
 
 @cocotb.test()
@@ -384,6 +385,33 @@ def access_internal_register_array(dut):
     if (dut.register_array[1].value != 4):
         raise TestFailure("Failed to set internal register array value")
 
+@cocotb.test(skip=cocotb.LANGUAGE in ["vhdl"])
+def lookup_path(dut):
+    """Test looking up an object by its path"""
+    yield Timer(0)
+    top = HierarchyObject(dut._handle, None)
+    element = top._lookup("register_array[1]")
+    if element._path != top._path + ".register_array[1]":
+        raise TestFailure("Looked up %r at the wrong path" % element)
+    if "register_array" in top._sub_handles:
+        raise TestFailure("The array was created before it was used")
+    if top.register_array[1] is not element or top._lookup("register_array[1]") is not element:
+        raise TestFailure("The array does not hold the element looked up")
+
+    element.setimmediatevalue(4)
+    if dut.register_array[1].value != 4:
+        raise TestFailure("Failed to set the register array element looked up")
+
+    for path, error in (("register_array[7]", AttributeError),
+                        ("no_such_object.clk", AttributeError),
+                        ("register_array..x", ValueError)):
+        try:
+            top._lookup(path)
+        except error:
+            pass
+        else:
+            raise TestFailure("Looking up %s did not raise %s" % (path, error.__name__))
+
 @cocotb.test(skip=True)
 def skip_a_test(dut):
     """This test shouldn't execute"""
@@ -443,3 +471,37 @@ def custom_type(dut):
     if expected_top != count:
         raise TestFailure("Expected %d found %d for cosLut" % (expected_top, count))
 
+
+@cocotb.test()
+def hierarchy_index(dut):
+    """Test that handles created from the hierarchy index resolve on first use"""
+    yield Timer(0)
+    filename = os.path.abspath("test_hierarchy_index.json")
+    key = {"toplevel": dut._name}
+    saved_index = cocotb.handle._hierarchy_index
+    cocotb.handle._hierarchy_index = HierarchyIndex(filename, key)
+    try:
+        # A new toplevel handle stands for the one of a new simulation run
+        names = sorted(thing._name for thing in HierarchyObject(dut._handle, None))
+        cocotb.handle._hierarchy_index.save()
+        cocotb.handle._hierarchy_index = HierarchyIndex.load(filename, key)
+
+        top = HierarchyObject(dut._handle, None)
+        if sorted(thing._name for thing in top) != names:
+            raise TestFailure("Discovery from the index differs from the simulator")
+
+        signal = top.stream_in_data
+        if "_index_parent" not in signal.__dict__:
+            raise TestFailure("%r was resolved before it was used" % signal)
+        if None in cocotb.handle._handle2obj:
+            raise TestFailure("A handle from the index was registered before it was resolved")
+        if type(signal) is not type(dut.stream_in_data):
+            raise TestFailure("%r from the index has the wrong type" % signal)
+
+        dut.stream_in_data.setimmediatevalue(5)
+        if signal.value.integer != 5 or "_index_parent" in signal.__dict__:
+            raise TestFailure("%r was not resolved when it was read" % signal)
+    finally:
+        cocotb.handle._hierarchy_index = saved_index
+        if os.path.exists(filename):
+            os.remove(filename)
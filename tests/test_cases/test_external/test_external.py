@@ -127,6 +127,56 @@ def test_multiple_externals(dut):
     assert value == 2
 
 
+@cocotb.test()
+def test_externals_reuse_threads(dut):
+    """Test that consecutive externals run on the same worker thread"""
+    clk_gen = cocotb.fork(Clock(dut.clk, 100).start())
+
+    thread1 = yield external(threading.current_thread)()
+    thread2 = yield external(threading.current_thread)()
+    assert thread1 is not threading.current_thread()
+    assert thread1 is thread2
+
+
+try:
+    import concurrent.futures
+except ImportError:
+    # Python 2 without the `futures` backport
+    concurrent = None
+
+
+@cocotb.external_process
+def double_in_process(value):
+    return 2 * value
+
+
+@cocotb.external_process
+def raise_in_process():
+    raise ValueError("raised in a worker process")
+
+
+@cocotb.test(skip=concurrent is None)
+def test_external_process(dut):
+    """Test calling a function in a worker process"""
+    clk_gen = cocotb.fork(Clock(dut.clk, 100).start())
+
+    value = yield double_in_process(21)
+    assert value == 42
+
+    # calls from several coroutines run in parallel
+    tasks = [cocotb.fork(double_in_process(i)) for i in range(4)]
+    for i, task in enumerate(tasks):
+        value = yield task.join()
+        assert value == 2 * i
+
+    try:
+        yield raise_in_process()
+    except ValueError:
+        pass
+    else:
+        raise TestFailure("Exception was not raised")
+
+
 @cocotb.test()
 def test_external_from_readonly(dut):
     clk_gen = cocotb.fork(Clock(dut.clk, 100).start())